@@ -0,0 +1,153 @@
+# core/analytics.py
+
+from datetime import timedelta
+
+from django.core.cache import cache
+from django.db.models import Case, CharField, Count, Q, Value, When
+from django.db.models.functions import TruncMonth
+from django.utils import timezone
+
+from .models import AnalyticsSnapshot, Application, Branch, CompanyProfile, InterviewSchedule, StudentProfile
+from .routers import analytics_reads
+
+# (label, min, max) - the bounds are inclusive, matching the original per-range filters
+CGPA_RANGES = [
+    ('6.0-6.9', 6.0, 6.99),
+    ('7.0-7.9', 7.0, 7.99),
+    ('8.0-8.9', 8.0, 8.99),
+    ('9.0-10.0', 9.0, 10.0),
+]
+
+INTERVIEW_STATUSES = ['Shortlisted', 'Interview', 'Offered']
+
+# Held by the one request recomputing a stale snapshot while the others show the stale one.
+# It expires on its own after REFRESH_LOCK_TIMEOUT seconds if that request dies.
+REFRESH_LOCK_KEY = 'core:analytics:refreshing'
+REFRESH_LOCK_TIMEOUT = 5 * 60
+
+
+def compute_analytics():
+    """
+    Gathers every figure shown on the TPO analytics page with a handful of grouped
+    aggregate queries. Returns a JSON-serializable dict (see AnalyticsSnapshot).
+    """
+    # 1. Placement rate by branch - every branch present in the data, not a fixed list
+    branch_short = {}
+    for code, name in Branch.objects.values_list('code', 'name'):
+        branch_short[name] = code
+    branch_stats = list(
+        StudentProfile.objects.values('branch').annotate(
+            total=Count('pk'),
+            placed=Count('pk', filter=Q(is_placed=True)),
+        ).order_by('-total', 'branch')
+    )
+
+    # 2. Top companies by jobs posted
+    top_companies = list(
+        CompanyProfile.objects.annotate(job_count=Count('jobs'))
+        .filter(job_count__gt=0)
+        .order_by('-job_count')
+        .values_list('name', 'job_count')[:10]
+    )
+
+    # 3. Application status distribution (also feeds the conversion funnel)
+    status_counts = dict(
+        Application.objects.values('status').annotate(count=Count('pk')).values_list('status', 'count')
+    )
+
+    # 4. Monthly application trends (last 6 months)
+    monthly_applications = (
+        Application.objects
+        .filter(applied_at__gte=timezone.now() - timedelta(days=180))
+        .annotate(month=TruncMonth('applied_at'))
+        .values('month')
+        .annotate(count=Count('pk'))
+        .order_by('month')
+    )
+
+    # 5. CGPA distribution of placed vs non-placed students, bucketed in the database
+    cgpa_buckets = {
+        row['bucket']: row
+        for row in StudentProfile.objects.annotate(
+            bucket=Case(
+                *[When(cgpa__gte=low, cgpa__lte=high, then=Value(label)) for label, low, high in CGPA_RANGES],
+                output_field=CharField(),
+            )
+        ).filter(bucket__isnull=False).values('bucket').annotate(
+            placed=Count('pk', filter=Q(is_placed=True)),
+            not_placed=Count('pk', filter=Q(is_placed=False)),
+        )
+    }
+
+    # 6. Summary counts that cannot be derived from the figures above
+    totals = CompanyProfile.objects.aggregate(
+        total_companies=Count('pk', filter=Q(is_approved=True), distinct=True),
+        total_jobs=Count('jobs', filter=Q(jobs__is_approved=True)),
+    )
+
+    total_students = sum(row['total'] for row in branch_stats)
+    placed_students = sum(row['placed'] for row in branch_stats)
+
+    # Profiles created at registration have no branch yet; they count in the totals only
+    charted_branches = [row for row in branch_stats if row['branch']]
+
+    return {
+        'branch_labels': [branch_short.get(row['branch'], row['branch']) for row in charted_branches],
+        'branch_total_data': [row['total'] for row in charted_branches],
+        'branch_placed_data': [row['placed'] for row in charted_branches],
+
+        'company_labels': [name for name, _ in top_companies],
+        'company_job_counts': [count for _, count in top_companies],
+
+        'status_labels': list(status_counts),
+        'status_counts': list(status_counts.values()),
+
+        'trend_labels': [row['month'].strftime('%B %Y') for row in monthly_applications],
+        'trend_counts': [row['count'] for row in monthly_applications],
+
+        'cgpa_labels': [label for label, _, _ in CGPA_RANGES],
+        'cgpa_placed': [cgpa_buckets.get(label, {}).get('placed', 0) for label, _, _ in CGPA_RANGES],
+        'cgpa_not_placed': [cgpa_buckets.get(label, {}).get('not_placed', 0) for label, _, _ in CGPA_RANGES],
+
+        'interview_statuses': INTERVIEW_STATUSES,
+        'interview_counts': [status_counts.get(status, 0) for status in INTERVIEW_STATUSES],
+
+        'total_students': total_students,
+        'placed_students': placed_students,
+        'total_companies': totals['total_companies'],
+        'total_jobs': totals['total_jobs'],
+        'total_applications': sum(status_counts.values()),
+        'total_interviews': InterviewSchedule.objects.count(),
+        'placement_percentage': round(placed_students / total_students * 100, 2) if total_students else 0,
+    }
+
+
+def refresh_snapshot(keep=30):
+    """
+    Stores a freshly computed snapshot and deletes all but the `keep` most recent ones.
+    """
+    with analytics_reads():
+        data = compute_analytics()
+    snapshot = AnalyticsSnapshot.objects.create(data=data)
+    stale_ids = AnalyticsSnapshot.objects.order_by('-created_at').values_list('pk', flat=True)[keep:]
+    AnalyticsSnapshot.objects.filter(pk__in=list(stale_ids)).delete()
+    return snapshot
+
+
+def latest_analytics(max_age):
+    """
+    Returns the newest snapshot. When it is older than max_age seconds, the first caller
+    to take the refresh lock recomputes it and every other caller meanwhile gets the
+    stale one; only a missing snapshot is always computed. refresh_analytics keeps the
+    snapshot fresh so that visitors normally never wait for one.
+    """
+    snapshot = AnalyticsSnapshot.objects.order_by('-created_at').first()
+    if snapshot is not None and timezone.now() - snapshot.created_at <= timedelta(seconds=max_age):
+        return snapshot
+    if not cache.add(REFRESH_LOCK_KEY, True, REFRESH_LOCK_TIMEOUT):
+        # Another request is refreshing it
+        return snapshot or refresh_snapshot()
+    try:
+        return refresh_snapshot()
+    finally:
+        cache.delete(REFRESH_LOCK_KEY)
@@ -0,0 +1,117 @@
+# core/applicants.py
+
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from django.db.models import Q
+
+from .eligibility import branch_keys, normalized_branch
+from .models import Application
+from .skills import rank_by_skills, students_with_skills
+
+# Applicants shown per page of the applicant list
+APPLICANTS_PAGE_SIZE = 50
+
+# The only columns the applicant list renders
+APPLICANT_COLUMNS = (
+    'status', 'applied_at', 'student__cgpa', 'student__branch', 'student__resume',
+    'student__user__first_name', 'student__user__last_name', 'student__user__username',
+)
+
+# Keyset orders of the applicant list, every key descending: newest first, or,
+# when ranked by skills, best match first and newest first among equal matches
+NEWEST_FIRST = ('applied_at', 'pk')
+BEST_MATCH_FIRST = ('skill_matches', 'applied_at', 'pk')
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=dt_timezone.utc)
+
+
+def encode_cursor(application, keys=NEWEST_FIRST):
+    """The position of an application in the given order, e.g. `<applied_at µs>-<id>`."""
+    values = (getattr(application, key) for key in keys)
+    return '-'.join(
+        str((value - _EPOCH) // timedelta(microseconds=1) if isinstance(value, datetime) else value)
+        for value in values
+    )
+
+
+def decode_cursor(value, keys=NEWEST_FIRST):
+    """Returns the key values of a cursor, or None when it is missing or malformed."""
+    parts = (value or '').split('-')
+    if len(parts) != len(keys) or not all(part.isdigit() for part in parts):
+        return None
+    return tuple(
+        _EPOCH + timedelta(microseconds=int(part)) if key == 'applied_at' else int(part)
+        for key, part in zip(keys, parts)
+    )
+
+
+def _beyond(keys, values, lookup):
+    """Matches the rows past the given key values: (k1 < v1) OR (k1 = v1 AND k2 < v2) ..."""
+    condition, equal = Q(), {}
+    for key, value in zip(keys, values):
+        condition |= Q(**equal, **{f'{key}__{lookup}': value})
+        equal[key] = value
+    return condition
+
+
+def filter_applicants(job, filters):
+    """
+    The applications of a job matching the cleaned data of an ApplicantFilterForm:
+    status, CGPA range, branch (by code or name) and every comma-separated skill
+    (through the skill search index).
+    """
+    applications = Application.objects.filter(job=job)
+    if filters.get('status'):
+        applications = applications.filter(status=filters['status'])
+    if filters.get('min_cgpa') is not None:
+        applications = applications.filter(student__cgpa__gte=filters['min_cgpa'])
+    if filters.get('max_cgpa') is not None:
+        applications = applications.filter(student__cgpa__lte=filters['max_cgpa'])
+    if filters.get('branch'):
+        branch = filters['branch']
+        # Normalized like eligible_students() does it, so every listed student can be found by branch
+        applications = applications.alias(normalized_branch=normalized_branch('student__branch')).filter(
+            normalized_branch__in=branch_keys([branch])
+        )
+    if (filters.get('skills') or '').strip():
+        applications = applications.filter(student__in=students_with_skills(filters['skills']))
+    return applications
+
+
+def rank_applicants(applications, skills):
+    """
+    Annotates each application with the number of the comma-separated skills its
+    student has (`skill_matches`), leaving out the students with none of them.
+    Page the result in BEST_MATCH_FIRST order.
+    """
+    return rank_by_skills(applications, skills, student_ref='student_id')
+
+
+def applicant_page(applications, after=None, before=None, size=None, keys=NEWEST_FIRST):
+    """
+    One page of applications in the descending order of `keys`, using keyset
+    pagination: the page after the `after` cursor, the page before the `before`
+    cursor, or the first page. Unlike OFFSET, the cost of a page does not grow
+    with its depth. Returns (applications, previous cursor, next cursor); a cursor
+    is None when there is no page in that direction.
+    """
+    size = size or APPLICANTS_PAGE_SIZE
+    applications = applications.select_related('student__user').only(*APPLICANT_COLUMNS)
+    before, after = decode_cursor(before, keys), decode_cursor(after, keys)
+    if before:
+        rows = list(applications.filter(_beyond(keys, before, 'gt')).order_by(*keys)[:size + 1])
+        has_prev, has_next = len(rows) > size, True
+        rows = rows[:size][::-1]
+    else:
+        if after:
+            applications = applications.filter(_beyond(keys, after, 'lt'))
+        rows = list(applications.order_by(*(f'-{key}' for key in keys))[:size + 1])
+        has_prev, has_next = after is not None, len(rows) > size
+        rows = rows[:size]
+    if not rows:
+        return rows, None, None
+    return (
+        rows,
+        encode_cursor(rows[0], keys) if has_prev else None,
+        encode_cursor(rows[-1], keys) if has_next else None,
+    )
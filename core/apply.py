@@ -0,0 +1,105 @@
+# core/apply.py
+
+import re
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import IntegrityError, transaction
+from django.db.models import Exists, OuterRef
+from django.utils import timezone
+
+from .badges import invalidate_user_badges
+from .counters import count_applications
+from .models import Application, JobPosting, StudentJobEligibility
+from .versions import applications_version_name, bump_versions, student_version_name
+
+# Outcomes of apply_for_job
+APPLIED = 'applied'
+ALREADY_APPLIED = 'already_applied'
+# A request with the same idempotency key is still running, and may yet be refused
+IN_PROGRESS = 'in_progress'
+
+# Marks a key whose request is still running
+_IN_FLIGHT = 'in_flight'
+
+IDEMPOTENCY_KEY = re.compile(r'^[A-Za-z0-9-]{1,64}$')
+
+
+class ApplyError(ValueError):
+    """The student may not apply to the job (closed, not approved or not eligible)."""
+
+
+def _idempotency_timeout():
+    # Seconds an apply request's key is remembered, bounding how late a retry is recognised
+    return getattr(settings, 'APPLY_IDEMPOTENCY_TIMEOUT', 60 * 60)
+
+
+def _cache_key(student_profile, job_id, idempotency_key):
+    if not IDEMPOTENCY_KEY.match(idempotency_key or ''):
+        return None
+    return f'core:apply:{student_profile.pk}:{job_id}:{idempotency_key}'
+
+
+def apply_for_job(student_profile, job_id, idempotency_key=None):
+    """
+    Applies the student to the job and returns APPLIED, or ALREADY_APPLIED when an
+    application exists. Raises ApplyError if the job is not approved, its deadline
+    has passed or the student is not eligible, and JobPosting.DoesNotExist for an
+    unknown job. A request repeating the idempotency key of an earlier one (a double
+    click, a retried POST) gets that request's outcome back without touching the
+    database, or IN_PROGRESS while the earlier one is still running.
+
+    The key only spares repeated work: cache.add is not atomic on every backend (the
+    file-based cache included), so two requests may both run. The (job, student)
+    unique constraint is what guarantees a single application.
+    """
+    key = _cache_key(student_profile, job_id, idempotency_key)
+    if key and not cache.add(key, _IN_FLIGHT, _idempotency_timeout()):
+        outcome = cache.get(key)
+        # None: the entry was evicted or deleted by a refused request in the meantime
+        return IN_PROGRESS if outcome in (None, _IN_FLIGHT) else outcome
+    try:
+        outcome = _apply(student_profile, job_id)
+    except Exception:
+        if key:
+            cache.delete(key)
+        raise
+    if key:
+        cache.set(key, outcome, _idempotency_timeout())
+    return outcome
+
+
+def _apply(student_profile, job_id):
+    application = Application(job_id=job_id, student=student_profile, status='Applied')
+    try:
+        with transaction.atomic():
+            # The insert comes first so that SQLite takes its write lock at the start of the
+            # transaction; a transaction that reads first and then writes cannot wait for a
+            # concurrent writer and fails at once with "database is locked". A repeat
+            # violates the (job, student) constraint before any of the job's rules is read.
+            Application.objects.bulk_create([application])
+            job = JobPosting.objects.filter(pk=job_id).annotate(
+                eligible=Exists(StudentJobEligibility.objects.filter(job=OuterRef('pk'), student=student_profile)),
+            ).values('company_id', 'is_approved', 'application_deadline', 'eligible').first()
+
+            # Raising rolls the insert back
+            if job is None:
+                raise JobPosting.DoesNotExist('No job posting with this id.')
+            if not job['is_approved']:
+                raise ApplyError('This job is not open for applications.')
+            if job['application_deadline'] < timezone.now().date():
+                raise ApplyError('The application deadline for this job has passed.')
+            if not job['eligible']:
+                raise ApplyError('You are not eligible to apply for this job.')
+
+            # bulk_create skips the signals that count the application and refresh the badges
+            count_applications(job_id, added={'Applied': 1})
+            invalidate_user_badges(student_profile.pk, job['company_id'])
+            bump_versions(student_version_name(student_profile.pk), applications_version_name(job['company_id']))
+    except IntegrityError:
+        # Either the student has applied before, or the job does not exist: foreign keys
+        # are checked at the insert or at commit, depending on the backend
+        if Application.objects.filter(job_id=job_id, student=student_profile).exists():
+            return ALREADY_APPLIED
+        raise JobPosting.DoesNotExist('No job posting with this id.')
+    return APPLIED
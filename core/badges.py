@@ -0,0 +1,81 @@
+# core/badges.py
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
+
+from .models import Application, InterviewSchedule, JobPosting
+from .routers import primary_reads
+
+ADMIN_BADGES_CACHE_KEY = 'core:nav_badges:admin'
+
+
+def _cache_timeout():
+    # Safety net for counts that change with the date (upcoming interviews); signals do the rest
+    return getattr(settings, 'NAV_BADGES_CACHE_TIMEOUT', 300)
+
+
+def _cache_key(user):
+    # Admin badges are the same for every admin, so they share one entry
+    if user.role == 'admin':
+        return ADMIN_BADGES_CACHE_KEY
+    return f'core:nav_badges:{user.pk}'
+
+
+def compute_badges(user):
+    """
+    Counts the navigation badges of a user: jobs awaiting approval for admins,
+    upcoming interviews for students and unreviewed applicants for companies.
+    Profiles share their user's primary key, so no profile lookup is needed.
+    """
+    if user.role == 'admin':
+        return {'pending_jobs_count': JobPosting.objects.filter(is_approved=False).count()}
+    if user.role == 'student':
+        return {'upcoming_interviews_count': InterviewSchedule.objects.filter(
+            application__student_id=user.pk, interview_date__gte=timezone.now().date()
+        ).count()}
+    if user.role == 'company':
+        return {'new_applicants_count': Application.objects.filter(
+            job__company_id=user.pk, status='Applied'
+        ).count()}
+    return {}
+
+
+def get_nav_badges(request):
+    """
+    Returns the badge counts for the logged-in user, computed at most once per
+    request and served from the cache until a signal invalidates them.
+    """
+    if hasattr(request, '_nav_badges'):
+        return request._nav_badges
+
+    user = request.user
+    key = _cache_key(user)
+    badges = cache.get(key)
+    if badges is None and user.role == 'admin' and hasattr(request, '_dashboard_stats'):
+        # admin_dashboard has just counted the pending jobs for this request
+        badges = {'pending_jobs_count': request._dashboard_stats['pending_jobs_count']}
+        cache.set(key, badges, _cache_timeout())
+    elif badges is None:
+        # Cached until the next change, so never counted on a replica that lags behind
+        with primary_reads():
+            badges = compute_badges(user)
+        cache.set(key, badges, _cache_timeout())
+
+    request._nav_badges = badges
+    return badges
+
+
+def has_cached_badges(user):
+    """Tells whether the user's badges can be rendered without a query."""
+    return cache.has_key(_cache_key(user))
+
+
+def invalidate_admin_badges():
+    """Drops the shared admin badges (pending job approvals)."""
+    cache.delete(ADMIN_BADGES_CACHE_KEY)
+
+
+def invalidate_user_badges(*user_ids):
+    """Drops the badges of the given students or companies (by user/profile pk)."""
+    cache.delete_many([f'core:nav_badges:{pk}' for pk in user_ids if pk is not None])
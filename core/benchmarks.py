@@ -0,0 +1,395 @@
+# core/benchmarks.py
+
+import queue
+import statistics
+import threading
+import tracemalloc
+import uuid
+from collections import Counter
+from itertools import zip_longest
+from datetime import date, timedelta
+from time import perf_counter
+
+from django.db import connection, transaction
+from django.db.models import Count, Exists, OuterRef
+from django.test import Client, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from .counters import set_status
+from .eligibility import open_jobs
+from .models import Application, AuditLog, ExportJob, JobPosting, StudentJobEligibility, User
+from .tasks import run_task
+
+# Scenario name -> setup function; see the @scenario functions below
+SCENARIOS = {}
+
+# Applications shortlisted at once by the bulk_shortlist scenario
+SHORTLIST_BATCH_SIZE = 100
+
+
+class BenchmarkError(Exception):
+    """The database lacks the data a scenario needs (e.g. it has not been seeded)."""
+
+
+class BenchContext:
+    """
+    The accounts and records the scenarios act on, picked once from the seeded
+    database. Jobs are the busiest ones, so the figures reflect the worst case.
+    """
+
+    def __init__(self):
+        self.admin = User.objects.filter(role='admin').order_by('pk').first()
+        self.busiest_job = JobPosting.objects.filter(is_approved=True).order_by('-applicant_count', 'pk').select_related('company__user').first()
+        # A student with an open job they are eligible for but have not applied to yet
+        self.open_eligibility = StudentJobEligibility.objects.filter(
+            ~Exists(Application.objects.filter(job=OuterRef('job'), student=OuterRef('student')))
+        ).select_related('student__user').order_by('pk').first()
+        self.clients = {}
+
+    def client_for(self, user):
+        """A test client logged in as the user, reused across iterations."""
+        if user is None:
+            raise BenchmarkError('No suitable account found; seed the database first (python manage.py seed_data).')
+        if user.pk not in self.clients:
+            client = Client()
+            client.force_login(user)
+            self.clients[user.pk] = client
+        return self.clients[user.pk]
+
+    def require(self, value, what):
+        if value is None:
+            raise BenchmarkError(f'No {what} found; seed the database first (python manage.py seed_data).')
+        return value
+
+
+def scenario(name):
+    """
+    Registers a scenario. The decorated function receives the BenchContext and
+    returns the step to time: a callable making one request and returning its response.
+    """
+    def register(setup):
+        SCENARIOS[name] = setup
+        return setup
+    return register
+
+
+# ==============================================================================
+# Scenarios
+# ==============================================================================
+
+@scenario('job_listings')
+def job_listings(ctx):
+    student = ctx.require(ctx.open_eligibility, 'eligible student').student
+    client = ctx.client_for(student.user)
+    url = reverse('core:job_listings')
+    return lambda: client.get(url)
+
+
+@scenario('apply')
+def apply(ctx):
+    eligibility = ctx.require(ctx.open_eligibility, 'eligible student')
+    client = ctx.client_for(eligibility.student.user)
+    url = reverse('core:apply_for_job', args=[eligibility.job_id])
+    return lambda: client.post(url)
+
+
+@scenario('applicant_review')
+def applicant_review(ctx):
+    job = ctx.require(ctx.busiest_job, 'job with applicants')
+    client = ctx.client_for(job.company.user)
+    url = reverse('core:job_applicants', args=[job.pk])
+    return lambda: client.get(url)
+
+
+@scenario('bulk_shortlist')
+def bulk_shortlist(ctx):
+    job = ctx.require(ctx.busiest_job, 'job with applicants')
+    client = ctx.client_for(job.company.user)
+    url = reverse('core:job_applicants', args=[job.pk])
+    app_ids = list(Application.objects.filter(job=job, status='Applied').order_by('pk').values_list(
+        'pk', flat=True
+    )[:SHORTLIST_BATCH_SIZE])
+    return lambda: client.post(url, {'selected_applications': app_ids, 'action': 'shortlist'})
+
+
+@scenario('schedule_interviews')
+def schedule_interviews(ctx):
+    job = ctx.require(ctx.busiest_job, 'job with applicants')
+    client = ctx.client_for(job.company.user)
+    url = reverse('core:schedule_interview', args=[job.pk])
+    data = {
+        'interview_date': (date.today() + timedelta(days=7)).isoformat(),
+        'interview_time': '10:00',
+        'round_name': 'Technical Round 1',
+        'mode': 'Online',
+        'venue_or_link': 'https://meet.example.com/bench',
+        'additional_instructions': '',
+    }
+    return lambda: client.post(url, data)
+
+
+@scenario('analytics')
+def analytics(ctx):
+    client = ctx.client_for(ctx.admin)
+    url = reverse('core:analytics')
+
+    def step():
+        # Measure the page as served when its snapshot has expired and is recomputed
+        with override_settings(ANALYTICS_SNAPSHOT_MAX_AGE=-1):
+            return client.get(url)
+    return step
+
+
+def _export_step(ctx, url_name, data):
+    client = ctx.client_for(ctx.admin)
+    url = reverse(url_name)
+
+    def step():
+        # Queue the report, then produce it the way run_workers would
+        response = client.post(url, data)
+        task = ExportJob.objects.latest('pk')
+        run_task('export', task.pk)
+        task.refresh_from_db()
+        # The transaction is rolled back, but the file would stay behind
+        task.result_file.delete(save=False)
+        return response
+    return step
+
+
+@scenario('export_students')
+def export_students(ctx):
+    return _export_step(ctx, 'core:export_students_csv', {'branch': '', 'status': ''})
+
+
+@scenario('export_jobs')
+def export_jobs(ctx):
+    return _export_step(ctx, 'core:export_jobs_csv', {'company': ''})
+
+
+# ==============================================================================
+# Measurement
+# ==============================================================================
+
+def _run_once(step):
+    """Runs one step inside a transaction that is rolled back, so scenarios never change the data."""
+    with transaction.atomic():
+        response = step()
+        transaction.set_rollback(True)
+    if response.status_code >= 400:
+        raise BenchmarkError(f'The request failed with status {response.status_code}.')
+
+
+def _percentile(timings, percent):
+    if len(timings) < 2:
+        return timings[0]
+    return statistics.quantiles(timings, n=100, method='inclusive')[percent - 1]
+
+
+def measure(step, iterations, warmup=1, before_each=None):
+    """
+    Times the step and returns its p50/p95 latency (ms), the largest query count
+    and the peak Python memory of one traced run (KiB). before_each, if given,
+    runs untimed before every iteration (e.g. to clear the cache).
+    """
+    for _ in range(warmup):
+        if before_each:
+            before_each()
+        _run_once(step)
+
+    timings = []
+    queries = 0
+    for _ in range(iterations):
+        if before_each:
+            before_each()
+        with CaptureQueriesContext(connection) as captured:
+            started = perf_counter()
+            _run_once(step)
+            timings.append((perf_counter() - started) * 1000)
+        queries = max(queries, len(captured))
+
+    # Tracing slows everything down, so memory is measured in a separate, untimed run
+    if before_each:
+        before_each()
+    tracemalloc.start()
+    try:
+        _run_once(step)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        'p50_ms': round(_percentile(timings, 50), 2),
+        'p95_ms': round(_percentile(timings, 95), 2),
+        'queries': queries,
+        'peak_memory_kib': round(peak / 1024),
+    }
+
+
+def dataset_size():
+    """Row counts recorded with a baseline, so runs on differently sized data are not compared blindly."""
+    return {
+        'students': User.objects.filter(role='student').count(),
+        'jobs': JobPosting.objects.count(),
+        'applications': Application.objects.count(),
+    }
+
+
+def compare(result, baseline, tolerance):
+    """
+    Returns the regressions of one scenario against its baseline figures: latency or
+    memory more than `tolerance` (a fraction) above the baseline, or any extra query.
+    """
+    regressions = []
+    for metric in ('p50_ms', 'p95_ms', 'peak_memory_kib'):
+        if result[metric] > baseline[metric] * (1 + tolerance):
+            regressions.append(f'{metric} {baseline[metric]} -> {result[metric]}')
+    if result['queries'] > baseline['queries']:
+        regressions.append(f'queries {baseline["queries"]} -> {result["queries"]}')
+    return regressions
+
+
+# ==============================================================================
+# Concurrent writes (`manage.py bench_writes`)
+# ==============================================================================
+
+def run_concurrently(tasks, workers):
+    """
+    Runs the tasks, (kind, callable making one request) pairs, in order on `workers`
+    threads, each with its own database connection. Returns the throughput, the
+    p50/p95 latency (ms) of each kind and the errors: exceptions such as "database
+    is locked" and 5xx responses, counted by message. Unlike measure(), the writes
+    are committed.
+    """
+    pending = queue.Queue()
+    for task in tasks:
+        pending.put(task)
+    timings, errors = {}, Counter()
+    lock = threading.Lock()
+
+    def work():
+        try:
+            while True:
+                try:
+                    kind, task = pending.get_nowait()
+                except queue.Empty:
+                    return
+                started = perf_counter()
+                try:
+                    response = task()
+                    error = f'HTTP {response.status_code}' if response.status_code >= 500 else None
+                except Exception as e:
+                    error = f'{type(e).__name__}: {e}'
+                with lock:
+                    timings.setdefault(kind, []).append((perf_counter() - started) * 1000)
+                    if error:
+                        errors[error] += 1
+        finally:
+            connection.close()
+
+    threads = [threading.Thread(target=work) for _ in range(workers)]
+    started = perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    seconds = perf_counter() - started
+
+    requests = sum(len(kind_timings) for kind_timings in timings.values())
+    return {
+        'requests': requests,
+        'requests_per_s': round(requests / seconds, 1),
+        'kinds': {
+            kind: {
+                'requests': len(kind_timings),
+                'p50_ms': round(_percentile(kind_timings, 50), 2),
+                'p95_ms': round(_percentile(kind_timings, 95), 2),
+            }
+            for kind, kind_timings in timings.items()
+        },
+        'errors': dict(errors),
+    }
+
+
+class DeadlineRush:
+    """
+    The traffic of a deadline hour, replayed against the seeded database: students
+    applying to the busiest open job (each submitting the form `clicks` times with
+    the same idempotency key), its company shortlisting and rejecting applicants
+    (status updates and audit log entries) and students browsing the job listings.
+    undo() removes what the rush wrote.
+    """
+
+    def __init__(self, students=100, clicks=2, reviews=100, reads=100):
+        not_applied = StudentJobEligibility.objects.filter(job__in=open_jobs()).exclude(
+            Exists(Application.objects.filter(job=OuterRef('job'), student=OuterRef('student')))
+        )
+        busiest = not_applied.values('job').annotate(n=Count('pk')).order_by('-n', 'job').first()
+        if busiest is None:
+            raise BenchmarkError('No open job with eligible students left to apply; seed the database first.')
+        self.job = JobPosting.objects.select_related('company__user').get(pk=busiest['job'])
+        self.students = [
+            eligibility.student
+            for eligibility in not_applied.filter(job=self.job).select_related('student__user').order_by('student')[
+                :students
+            ]
+        ]
+        self.clicks = clicks
+        # Applicants reviewed by the company, with the status to restore afterwards
+        self.reviewed = dict(Application.objects.filter(job=self.job, status__in=('Applied', 'Shortlisted')).order_by(
+            'pk'
+        ).values_list('pk', 'status')[:reviews])
+        self.reads = reads
+        self.last_audit_log = AuditLog.objects.order_by('-pk').values_list('pk', flat=True).first() or 0
+        self.clients = []
+
+    def _client(self, user):
+        client = Client()
+        client.force_login(user)
+        self.clients.append(client)
+        return client
+
+    def tasks(self):
+        """The (kind, request) pairs, interleaved so the kinds run side by side."""
+        apply_url = reverse('core:apply_for_job', args=[self.job.pk])
+        review_url = reverse('core:job_applicants', args=[self.job.pk])
+        listings_url = reverse('core:job_listings')
+
+        applies = []
+        for student in self.students:
+            client, data = self._client(student.user), {'idempotency_key': uuid.uuid4().hex}
+            # The submissions of one student are queued together so that they overlap
+            applies.append([('apply', lambda client=client, data=data: client.post(apply_url, data))] * self.clicks)
+        company = self._client(self.job.company.user)
+        reviews = [
+            [('review', lambda pk=pk, action=action: company.post(
+                review_url, {'selected_applications': [pk], 'action': action}
+            ))]
+            for pk in self.reviewed for action in ('shortlist', 'reject')
+        ]
+        readers = [self._client(student.user) for student in self.students[:10]]
+        reads = [
+            [('read', lambda client=readers[i % len(readers)]: client.get(listings_url))]
+            for i in range(self.reads if readers else 0)
+        ]
+
+        tasks = []
+        for batch in zip_longest(applies, reviews, reads, fillvalue=[]):
+            for group in batch:
+                tasks.extend(group)
+        return tasks
+
+    def applications_made(self):
+        return Application.objects.filter(job=self.job, student__in=self.students).count()
+
+    def undo(self):
+        """Deletes the applications and audit entries of the rush and restores the reviewed statuses."""
+        # Deleting through the ORM also takes the applications off the job's counters
+        Application.objects.filter(job=self.job, student__in=self.students).delete()
+        for status in set(self.reviewed.values()):
+            set_status(Application.objects.filter(pk__in=[
+                pk for pk, original in self.reviewed.items() if original == status
+            ]), status)
+        AuditLog.objects.filter(pk__gt=self.last_audit_log).delete()
+        for client in self.clients:
+            client.logout()
@@ -0,0 +1,406 @@
+# core/bulk_import.py
+
+import csv
+import io
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date
+from functools import partial
+
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.core.exceptions import ValidationError
+from django.core.validators import URLValidator, validate_email
+from django.db import connection, transaction
+
+from .eligibility import refresh_jobs, refresh_students
+from .models import Branch, CompanyProfile, JobPosting, JobPostingBranch, StudentProfile, User
+from .stats import invalidate_dashboard_stats
+from .versions import JOBS, bump_versions
+
+# Rows per INSERT statement and per lookup query
+IMPORT_BATCH_SIZE = 500
+
+# Below this many passwords, starting a process pool costs more than it saves
+PARALLEL_HASH_THRESHOLD = 50
+
+COLUMNS = {
+    'students': ['username', 'password', 'email', 'first_name', 'last_name', 'branch', 'cgpa', 'backlogs'],
+    'companies': ['username', 'password', 'email', 'name', 'description', 'website', 'hr_name', 'hr_email'],
+    'jobs': [
+        'company_username', 'title', 'description', 'location', 'salary_range',
+        'application_deadline', 'min_cgpa', 'max_backlogs', 'branches',
+    ],
+}
+
+
+class ImportReport:
+    """
+    Outcome of one bulk import: rows created, per-row errors and timing.
+    """
+
+    def __init__(self, upload_type):
+        self.upload_type = upload_type
+        self.created = 0
+        self.errors = []  # (line number, message) pairs
+        self.elapsed = 0.0
+
+    @property
+    def ok(self):
+        return not self.errors
+
+    @property
+    def rows_per_second(self):
+        return self.created / self.elapsed if self.elapsed else 0.0
+
+    def add_error(self, line, message):
+        self.errors.append((line, message))
+
+    def summary(self):
+        return (
+            f'Imported {self.created} {self.upload_type} in {self.elapsed:.2f}s '
+            f'({self.rows_per_second:.0f} rows/s).'
+        )
+
+
+def import_csv(upload_type, csv_file, progress=None):
+    """
+    Validates the whole CSV file and, only if every row is valid, creates its
+    records in batches inside one transaction. Returns an ImportReport.
+
+    `progress`, if given, is called as progress(rows_done, rows_total) while
+    the import runs.
+    """
+    started = time.perf_counter()
+    report = ImportReport(upload_type)
+    rows = _read_rows(csv_file, COLUMNS[upload_type], report)
+    if rows:
+        rows = VALIDATORS[upload_type](rows, report)
+        report.errors.sort(key=lambda error: error[0])
+    if report.ok and rows:
+        if 'password' in COLUMNS[upload_type]:
+            # Hashing is the slow part, so it runs before the insert transaction is opened
+            hashes = hash_passwords((row['password'] for _, row in rows), progress=progress)
+            for (_, row), hashed in zip(rows, hashes):
+                row['password_hash'] = hashed
+        report.created = CREATORS[upload_type](rows)
+        invalidate_dashboard_stats()
+        if progress:
+            progress(report.created, len(rows))
+    report.elapsed = time.perf_counter() - started
+    return report
+
+
+# ==============================================================================
+# Parsing & validation
+# ==============================================================================
+
+def _read_rows(csv_file, columns, report):
+    """
+    Decodes the upload and returns a list of (line number, {column: value}) pairs,
+    skipping the header row and blank lines.
+    """
+    try:
+        text = csv_file.read().decode('utf-8-sig')
+    except UnicodeDecodeError:
+        report.add_error(1, 'The file is not UTF-8 encoded text.')
+        return []
+
+    reader = csv.reader(io.StringIO(text))
+    next(reader, None)  # Skip the header row
+    rows = []
+    for values in reader:
+        if not any(value.strip() for value in values):
+            continue
+        if len(values) != len(columns):
+            report.add_error(
+                reader.line_num, f'Expected {len(columns)} columns ({", ".join(columns)}), found {len(values)}.'
+            )
+            continue
+        rows.append((reader.line_num, dict(zip(columns, (value.strip() for value in values)))))
+    if not rows and report.ok:
+        report.add_error(1, 'The file contains no data rows.')
+    return rows
+
+
+def _chunks(items, size=IMPORT_BATCH_SIZE):
+    items = list(items)
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def _require(line, row, fields, report):
+    missing = [field for field in fields if not row[field]]
+    if missing:
+        report.add_error(line, f'Missing required value(s): {", ".join(missing)}.')
+    return not missing
+
+
+def _parse_number(line, row, field, cast, report, minimum=None, maximum=None, default=None):
+    """Converts row[field] in place; returns False (and records an error) when it is invalid."""
+    value = row[field]
+    if value == '' and default is not None:
+        row[field] = default
+        return True
+    try:
+        row[field] = cast(value)
+    except ValueError:
+        report.add_error(line, f'{field} must be a number, got "{value}".')
+        return False
+    if (minimum is not None and row[field] < minimum) or (maximum is not None and row[field] > maximum):
+        report.add_error(line, f'{field} must be between {minimum} and {maximum}, got {value}.')
+        return False
+    return True
+
+
+def _validate_optional(line, row, field, validator, report):
+    if not row[field]:
+        return True
+    try:
+        validator(row[field])
+    except ValidationError:
+        report.add_error(line, f'{field} "{row[field]}" is not valid.')
+        return False
+    return True
+
+
+def _check_account(line, row, report, seen):
+    """
+    Checks the user columns shared by student and company uploads, including
+    usernames repeated within the file (`seen` maps username to first line).
+    """
+    ok = _require(line, row, ['username', 'password'], report)
+    ok = _validate_optional(line, row, 'email', validate_email, report) and ok
+    if row['username'] in seen:
+        report.add_error(line, f'Username "{row["username"]}" is repeated (first seen on line {seen[row["username"]]}).')
+        ok = False
+    seen.setdefault(row['username'], line)
+    return ok
+
+
+def _exclude_taken_usernames(rows, report):
+    """
+    Drops (and reports) the rows whose username already belongs to an account.
+    """
+    taken = set()
+    for chunk in _chunks(row['username'] for _, row in rows):
+        taken.update(User.objects.filter(username__in=chunk).values_list('username', flat=True))
+    for line, row in rows:
+        if row['username'] in taken:
+            report.add_error(line, f'Username "{row["username"]}" already exists.')
+    return [(line, row) for line, row in rows if row['username'] not in taken]
+
+
+def _validate_students(rows, report):
+    valid = []
+    seen = {}
+    for line, row in rows:
+        ok = _check_account(line, row, report, seen)
+        ok = _require(line, row, ['branch', 'cgpa'], report) and ok
+        if row['cgpa']:
+            ok = _parse_number(line, row, 'cgpa', float, report, minimum=0, maximum=10) and ok
+        ok = _parse_number(line, row, 'backlogs', int, report, minimum=0, default=0) and ok
+        if ok:
+            valid.append((line, row))
+    return _exclude_taken_usernames(valid, report)
+
+
+def _validate_companies(rows, report):
+    valid = []
+    seen = {}
+    for line, row in rows:
+        ok = _check_account(line, row, report, seen)
+        ok = _require(line, row, ['name', 'description'], report) and ok
+        ok = _validate_optional(line, row, 'website', URLValidator(), report) and ok
+        ok = _validate_optional(line, row, 'hr_email', validate_email, report) and ok
+        if ok:
+            valid.append((line, row))
+    return _exclude_taken_usernames(valid, report)
+
+
+def _validate_jobs(rows, report):
+    companies = {}
+    for chunk in _chunks({row['company_username'] for _, row in rows}):
+        companies.update(
+            CompanyProfile.objects.filter(user__username__in=chunk).values_list('user__username', 'pk')
+        )
+    # Branches may be given by code or full name, case-insensitively
+    branches = {}
+    for branch in Branch.objects.all():
+        branches[branch.code.lower()] = branch.pk
+        branches[branch.name.lower()] = branch.pk
+
+    valid = []
+    for line, row in rows:
+        ok = _require(line, row, ['company_username', 'title', 'description', 'location', 'application_deadline'], report)
+        if row['company_username'] and row['company_username'] not in companies:
+            report.add_error(line, f'No company account with username "{row["company_username"]}".')
+            ok = False
+        row['company_id'] = companies.get(row['company_username'])
+
+        if row['application_deadline']:
+            try:
+                row['application_deadline'] = date.fromisoformat(row['application_deadline'])
+            except ValueError:
+                report.add_error(line, f'application_deadline must be YYYY-MM-DD, got "{row["application_deadline"]}".')
+                ok = False
+        ok = _parse_number(line, row, 'min_cgpa', float, report, minimum=0, maximum=10, default=6.0) and ok
+        ok = _parse_number(line, row, 'max_backlogs', int, report, minimum=0, default=0) and ok
+
+        tokens = [token.strip() for token in row['branches'].split(';') if token.strip()]
+        unknown = [token for token in tokens if token.lower() not in branches]
+        if unknown:
+            report.add_error(line, f'Unknown branch(es): {", ".join(unknown)}.')
+            ok = False
+        row['branch_ids'] = {branches[token.lower()] for token in tokens if token.lower() in branches}
+
+        if ok:
+            valid.append((line, row))
+    return valid
+
+
+# ==============================================================================
+# Record creation
+# ==============================================================================
+
+def hash_passwords(passwords, progress=None):
+    """
+    Hashes the passwords, spreading the work over a process pool for large batches.
+    The pool size comes from BULK_IMPORT_HASH_WORKERS (default: one per CPU) and the
+    hasher from BULK_IMPORT_PASSWORD_HASHER (default: the first of PASSWORD_HASHERS).
+    Django upgrades a cheaper import hash to the default hasher at the user's first login.
+    """
+    passwords = list(passwords)
+    hasher = partial(make_password, hasher=getattr(settings, 'BULK_IMPORT_PASSWORD_HASHER', None) or 'default')
+    workers = getattr(settings, 'BULK_IMPORT_HASH_WORKERS', None) or os.cpu_count() or 1
+    if workers <= 1 or len(passwords) < PARALLEL_HASH_THRESHOLD:
+        return _collect(map(hasher, passwords), len(passwords), progress)
+    # make_password only needs settings, so spawned workers do not have to set up the app registry
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        chunksize = max(1, len(passwords) // (workers * 4))
+        return _collect(executor.map(hasher, passwords, chunksize=chunksize), len(passwords), progress)
+
+
+def _collect(hashes, total, progress):
+    """Drains the hash iterator, reporting progress after every batch."""
+    result = []
+    for hashed in hashes:
+        result.append(hashed)
+        if progress and len(result) % IMPORT_BATCH_SIZE == 0:
+            progress(len(result), total)
+    return result
+
+
+def _create_users(rows, role):
+    """
+    Bulk-inserts the User rows (with passwords already hashed) and returns {username: pk}.
+    """
+    users = [
+        User(
+            username=row['username'],
+            password=row['password_hash'],
+            email=row['email'],
+            first_name=row.get('first_name', ''),
+            last_name=row.get('last_name', ''),
+            role=role,
+        )
+        for _, row in rows
+    ]
+    User.objects.bulk_create(users, batch_size=IMPORT_BATCH_SIZE)
+    if all(user.pk for user in users):
+        return {user.username: user.pk for user in users}
+    # Backends that cannot return primary keys from a bulk insert
+    user_ids = {}
+    for chunk in _chunks(user.username for user in users):
+        user_ids.update(User.objects.filter(username__in=chunk).values_list('username', 'pk'))
+    return user_ids
+
+
+@transaction.atomic
+def _create_students(rows):
+    user_ids = _create_users(rows, 'student')
+    StudentProfile.objects.bulk_create(
+        [
+            StudentProfile(
+                user_id=user_ids[row['username']], branch=row['branch'], cgpa=row['cgpa'], backlogs=row['backlogs']
+            )
+            for _, row in rows
+        ],
+        batch_size=IMPORT_BATCH_SIZE,
+    )
+    # bulk_create skips the post_save signal that keeps the eligibility index current
+    refresh_students(user_ids.values())
+    return len(rows)
+
+
+@transaction.atomic
+def _create_companies(rows):
+    user_ids = _create_users(rows, 'company')
+    # Companies uploaded by the TPO are approved on creation
+    CompanyProfile.objects.bulk_create(
+        [
+            CompanyProfile(
+                user_id=user_ids[row['username']],
+                name=row['name'],
+                description=row['description'],
+                website=row['website'],
+                hr_name=row['hr_name'],
+                hr_email=row['hr_email'],
+                is_approved=True,
+            )
+            for _, row in rows
+        ],
+        batch_size=IMPORT_BATCH_SIZE,
+    )
+    return len(rows)
+
+
+@transaction.atomic
+def _create_jobs(rows):
+    # Jobs uploaded by the TPO are approved on creation
+    jobs = [
+        JobPosting(
+            company_id=row['company_id'],
+            title=row['title'],
+            description=row['description'],
+            location=row['location'],
+            salary_range=row['salary_range'],
+            application_deadline=row['application_deadline'],
+            min_cgpa=row['min_cgpa'],
+            max_backlogs=row['max_backlogs'],
+            is_approved=True,
+        )
+        for _, row in rows
+    ]
+    if connection.features.can_return_rows_from_bulk_insert:
+        JobPosting.objects.bulk_create(jobs, batch_size=IMPORT_BATCH_SIZE)
+    else:
+        for job in jobs:
+            job.save()
+
+    JobPostingBranch.objects.bulk_create(
+        [
+            JobPostingBranch(job_id=job.pk, branch_id=branch_id)
+            for job, (_, row) in zip(jobs, rows)
+            for branch_id in row['branch_ids']
+        ],
+        batch_size=IMPORT_BATCH_SIZE,
+    )
+    # Neither bulk_create nor the through-model insert fires the eligibility signals
+    refresh_jobs(jobs)
+    bump_versions(JOBS)
+    return len(jobs)
+
+
+VALIDATORS = {
+    'students': _validate_students,
+    'companies': _validate_companies,
+    'jobs': _validate_jobs,
+}
+
+CREATORS = {
+    'students': _create_students,
+    'companies': _create_companies,
+    'jobs': _create_jobs,
+}
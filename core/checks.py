@@ -0,0 +1,21 @@
+# core/checks.py
+
+from django.core.checks import Error, Tags, register
+from django.db import DEFAULT_DB_ALIAS, connections
+
+# UPDATE ... RETURNING (core/counters.py) arrived in SQLite 3.35
+MIN_SQLITE_VERSION = (3, 35, 0)
+
+
+@register(Tags.compatibility)
+def check_sqlite_version(app_configs=None, **kwargs):
+    """Refuses SQLite libraries older than MIN_SQLITE_VERSION, which Django 5.2 still supports."""
+    connection = connections[DEFAULT_DB_ALIAS]
+    if connection.vendor != 'sqlite' or connection.Database.sqlite_version_info >= MIN_SQLITE_VERSION:
+        return []
+    return [Error(
+        f'SQLite {connection.Database.sqlite_version} is too old.',
+        hint=f'Status changes use UPDATE ... RETURNING; install SQLite '
+             f'{".".join(map(str, MIN_SQLITE_VERSION))} or later.',
+        id='core.E001',
+    )]
@@ -1,16 +1,15 @@
-
 # core/context_processors.py
 
-from .models import JobPosting
+from .badges import get_nav_badges
 
 def notifications_context(request):
     """
-    Makes a notification count available to all templates.
+    Makes the navigation badge counts (e.g. `pending_jobs_count` for admins)
+    available to all templates. They are cached per user, so rendering a page
+    normally costs no query.
     """
-    if request.user.is_authenticated and request.user.role == 'admin':
-        # Calculate the count only for logged-in admins
-        count = JobPosting.objects.filter(is_approved=False).count()
-        return {'pending_jobs_count': count}
-    
-    # Return an empty dictionary for other users
-    return {}
\ No newline at end of file
+    if request.user.is_authenticated:
+        return get_nav_badges(request)
+
+    # Return an empty dictionary for anonymous users
+    return {}
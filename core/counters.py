@@ -0,0 +1,159 @@
+# core/counters.py
+
+from collections import Counter
+from functools import reduce
+from operator import or_
+
+from django.db import connection, transaction
+from django.db.models import Case, Count, F, IntegerField, OuterRef, Q, Subquery, Sum, Value, When
+from django.db.models.functions import Coalesce, Greatest
+
+from .models import Application, CompanyProfile, JobPosting
+from .versions import applications_version_name, bump_versions
+
+# Application status -> the counter of JobPosting and CompanyProfile holding it
+STATUS_COUNTERS = {
+    'Applied': 'applied_count',
+    'Shortlisted': 'shortlisted_count',
+    'Rejected': 'rejected_count',
+    'Interview': 'interview_count',
+    'Offered': 'offered_count',
+}
+
+
+def _shift(field, delta):
+    # Decrements stop at zero, so a drifted counter cannot fail a user's action;
+    # `recount` puts it right
+    return F(field) + delta if delta > 0 else Greatest(F(field) + delta, 0)
+
+
+def _deltas(added=None, removed=None):
+    deltas = Counter()
+    for status, n in (added or {}).items():
+        deltas['applicant_count'] += n
+        deltas[STATUS_COUNTERS[status]] += n
+    for status, n in (removed or {}).items():
+        deltas['applicant_count'] -= n
+        deltas[STATUS_COUNTERS[status]] -= n
+    return deltas
+
+
+def count_applications(job_id, added=None, removed=None):
+    """
+    Applies application changes to the counters of a job and its company, with two
+    UPDATEs. `added` and `removed` map statuses to numbers of applications, e.g. a
+    status change of three applications is removed={'Applied': 3}, added={'Shortlisted': 3}.
+    """
+    changes = {field: _shift(field, delta) for field, delta in _deltas(added, removed).items() if delta}
+    if changes:
+        JobPosting.objects.filter(pk=job_id).update(**changes)
+        CompanyProfile.objects.filter(jobs=job_id).update(**changes)
+
+
+def _update_counters(model, deltas):
+    """Applies {pk: {counter: delta}} to many rows with one UPDATE, whatever their number."""
+    changes = {}
+    for field in {field for row in deltas.values() for field, delta in row.items() if delta}:
+        delta = Case(
+            *(When(pk=pk, then=Value(row[field])) for pk, row in deltas.items() if row[field]),
+            default=Value(0), output_field=IntegerField(),
+        )
+        changes[field] = Greatest(F(field) + delta, 0)
+    if changes:
+        model.objects.filter(pk__in=list(deltas)).update(**changes)
+
+
+def move_applications(applications, source, status):
+    """
+    Moves the applications of the queryset that are in the `source` status to `status`
+    with one UPDATE ... RETURNING (SQLite 3.35 or later, see core/checks.py) and returns
+    the (pk, job_id) of the rows it changed. Nothing is read before the write, so a
+    transaction that starts with it takes SQLite's write lock at once instead of
+    upgrading a read lock, which fails at once while another writer is active.
+    """
+    subquery, params = applications.filter(status=source).order_by().values('pk').query.sql_with_params()
+    quote = connection.ops.quote_name
+    meta = Application._meta
+
+    def column(name):
+        return quote(meta.get_field(name).column)
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'UPDATE {quote(meta.db_table)} SET {column("status")} = %s '
+            f'WHERE {column("status")} = %s AND {column("id")} IN ({subquery}) '
+            f'RETURNING {column("id")}, {column("job")}',
+            [status, source, *params],
+        )
+        return cursor.fetchall()
+
+
+@transaction.atomic
+def set_status(applications, status):
+    """
+    Moves every application of the queryset that is not already in `status` to it,
+    with one UPDATE ... RETURNING per old status, and moves the rows those updates
+    changed between the counters of their jobs and companies with one more UPDATE
+    each. Use it instead of `.update(status=...)`, which bypasses the signals that
+    count a single application's change. Returns the number moved.
+    """
+    job_deltas = {}
+    for old_status in STATUS_COUNTERS:
+        if old_status == status:
+            continue
+        moved_per_job = Counter(job_id for _, job_id in move_applications(applications, old_status, status))
+        for job_id, n in moved_per_job.items():
+            job_deltas.setdefault(job_id, Counter()).update(_deltas(added={status: n}, removed={old_status: n}))
+    if not job_deltas:
+        return 0
+
+    company_deltas = {}
+    for job_id, company_id in JobPosting.objects.filter(pk__in=list(job_deltas)).values_list('pk', 'company_id'):
+        company_deltas.setdefault(company_id, Counter()).update(job_deltas[job_id])
+    moved = sum(deltas[STATUS_COUNTERS[status]] for deltas in job_deltas.values())
+    _update_counters(JobPosting, job_deltas)
+    _update_counters(CompanyProfile, company_deltas)
+    bump_versions(*(applications_version_name(company_id) for company_id in company_deltas))
+    return moved
+
+
+# ==============================================================================
+# Repair
+# ==============================================================================
+
+def _job_counts(status=None):
+    applications = Application.objects.filter(job=OuterRef('pk'))
+    if status:
+        applications = applications.filter(status=status)
+    counts = applications.order_by().values('job').annotate(n=Count('pk')).values('n')
+    return Coalesce(Subquery(counts), 0, output_field=IntegerField())
+
+
+def _company_counts(field):
+    totals = JobPosting.objects.filter(company=OuterRef('pk')).order_by().values('company').annotate(
+        n=Sum(field)
+    ).values('n')
+    return Coalesce(Subquery(totals), 0, output_field=IntegerField())
+
+
+def _repair(queryset, expected):
+    """Rewrites the counters of the rows whose stored counts differ from the expected ones."""
+    drifted = reduce(or_, (~Q(**{field: F(f'expected_{field}')}) for field in expected))
+    stale = queryset.alias(**{f'expected_{field}': value for field, value in expected.items()}).filter(drifted)
+    return queryset.filter(pk__in=stale.values('pk')).update(**expected)
+
+
+@transaction.atomic
+def recount_application_counters():
+    """
+    Recomputes every job's and company's counters from the applications, writing
+    only those that drifted (e.g. after a bulk_create or a raw UPDATE, which skip
+    the counting). Returns (jobs repaired, companies repaired).
+    """
+    job_counts = {'applicant_count': _job_counts()}
+    job_counts.update({field: _job_counts(status) for status, field in STATUS_COUNTERS.items()})
+    jobs = _repair(JobPosting.objects.all(), job_counts)
+    companies = _repair(
+        CompanyProfile.objects.all(), {field: _company_counts(field) for field in CompanyProfile.COUNTER_FIELDS}
+    )
+    return jobs, companies
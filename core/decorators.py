@@ -1,8 +1,12 @@
 # core/decorators.py
 
+from functools import wraps
+
 from django.core.exceptions import PermissionDenied
 from django.contrib.auth.decorators import user_passes_test
 
+from .routers import analytics_reads
+
 def student_required(function):
     # A decorator that checks if the user is a student
     actual_decorator = user_passes_test(
@@ -28,4 +32,12 @@ def admin_required(function):
         login_url='login',
         redirect_field_name=None
     )
-    return actual_decorator(function)
\ No newline at end of file
+    return actual_decorator(function)
+
+def reads_from_analytics(function):
+    # A decorator that sends the view's reads to the read-only analytics connection
+    @wraps(function)
+    def wrapper(request, *args, **kwargs):
+        with analytics_reads():
+            return function(request, *args, **kwargs)
+    return wrapper
@@ -0,0 +1,198 @@
+# core/eligibility.py
+
+from django.core.exceptions import EmptyResultSet
+from django.db import connection, transaction
+from django.db.models import Exists, IntegerField, OuterRef, Q, Value
+from django.db.models.functions import Lower, Trim
+from django.utils import timezone
+
+from .models import Branch, JobPosting, JobPostingBranch, StudentJobEligibility, StudentProfile
+
+# Jobs per INSERT ... SELECT in refresh_jobs(); SQLite allows 500 SELECTs in one UNION
+JOB_REFRESH_BATCH_SIZE = 200
+
+
+def open_jobs():
+    """
+    Returns all approved jobs whose application deadline has not yet passed.
+    """
+    return JobPosting.objects.filter(is_approved=True, application_deadline__gte=timezone.now().date())
+
+
+def branches_matching(branch):
+    """
+    Returns the Branch rows a student's free-text branch refers to (by code or full name).
+    Case and surrounding spaces are ignored, as eligible_students() ignores them in SQL
+    and as job branch lists were read when they became Branch rows.
+    """
+    branch = (branch or '').strip(' ')
+    return Branch.objects.filter(Q(code__iexact=branch) | Q(name__iexact=branch))
+
+
+def branch_keys(branches):
+    """The values a normalized student branch (see normalized_branch) takes for the given Branch rows."""
+    return [key.lower() for branch in branches for key in (branch.name, branch.code)]
+
+
+def normalized_branch(field='branch'):
+    """A student's branch in lower case without surrounding spaces, to compare with branch_keys()."""
+    return Lower(Trim(field))
+
+
+def eligibility_q(student_profile):
+    """
+    Builds a Q object matching the jobs whose CGPA, backlog and branch rules
+    the given student satisfies. A job with no branches is open to all branches.
+    """
+    # A student without a CGPA can never satisfy the (non-nullable) min_cgpa rule
+    if student_profile.cgpa is None:
+        return Q(pk__in=[])
+
+    restricted = Exists(JobPostingBranch.objects.filter(job=OuterRef('pk')))
+    branch_allowed = Exists(JobPostingBranch.objects.filter(
+        job=OuterRef('pk'),
+        branch__in=branches_matching(student_profile.branch).values('pk'),
+    ))
+    return (
+        Q(min_cgpa__lte=student_profile.cgpa)
+        & Q(max_backlogs__gte=student_profile.backlogs)
+        & (~restricted | branch_allowed)
+    )
+
+
+def annotate_eligibility(queryset, student_profile):
+    """
+    Annotates each job in the queryset with `is_eligible` for the given student,
+    read from the materialized StudentJobEligibility index.
+    """
+    return queryset.annotate(
+        is_eligible=Exists(StudentJobEligibility.objects.filter(student=student_profile, job=OuterRef('pk')))
+    )
+
+
+def is_eligible(student_profile, job):
+    """
+    Checks a single job against the materialized index with one indexed lookup.
+    """
+    return StudentJobEligibility.objects.filter(student=student_profile, job=job).exists()
+
+
+def eligible_students(job):
+    """
+    Returns the students who satisfy the CGPA, backlog and branch rules of a job.
+    """
+    students = StudentProfile.objects.filter(cgpa__gte=job.min_cgpa, backlogs__lte=job.max_backlogs)
+    branches = list(job.branches.all())
+    if branches:
+        # Normalized like branches_matching() matches it, so every refresh path indexes the same students
+        students = students.alias(normalized_branch=normalized_branch()).filter(
+            normalized_branch__in=branch_keys(branches)
+        )
+    return students
+
+
+# ==============================================================================
+# Maintenance of the StudentJobEligibility index
+# ==============================================================================
+
+def _insert_index_rows(pairs):
+    """
+    Inserts the (student_id, job_id) rows selected by a two-column values_list queryset
+    with one INSERT ... SELECT, so the ids never travel through Python. Returns the row count.
+    """
+    try:
+        sql, params = pairs.order_by().query.sql_with_params()
+    except EmptyResultSet:
+        # The filter can match nothing, e.g. for a student without a CGPA
+        return 0
+    quote = connection.ops.quote_name
+    meta = StudentJobEligibility._meta
+    columns = ', '.join(quote(meta.get_field(name).column) for name in ('student', 'job'))
+    with connection.cursor() as cursor:
+        cursor.execute(f'INSERT INTO {quote(meta.db_table)} ({columns}) {sql}', params)
+        return cursor.rowcount
+
+
+def _student_pairs(students, job):
+    return students.annotate(
+        index_job_id=Value(job.pk, output_field=IntegerField())
+    ).values_list('pk', 'index_job_id')
+
+
+@transaction.atomic
+def refresh_student(student_profile):
+    """
+    Recomputes the index rows of one student, e.g. after a CGPA, backlog or branch change.
+    """
+    StudentJobEligibility.objects.filter(student=student_profile).delete()
+    _insert_index_rows(open_jobs().filter(eligibility_q(student_profile)).annotate(
+        index_student_id=Value(student_profile.pk, output_field=IntegerField())
+    ).values_list('index_student_id', 'pk'))
+
+
+@transaction.atomic
+def refresh_students(student_ids):
+    """
+    Recomputes the index rows of many students at once (e.g. after a bulk import),
+    with one query per open job instead of one refresh per student.
+    """
+    student_ids = list(student_ids)
+    StudentJobEligibility.objects.filter(student_id__in=student_ids).delete()
+    created = 0
+    for job in open_jobs().prefetch_related('branches'):
+        created += _insert_index_rows(_student_pairs(eligible_students(job).filter(pk__in=student_ids), job))
+    return created
+
+
+@transaction.atomic
+def refresh_job(job):
+    """
+    Recomputes the index rows of one job, e.g. after its criteria, branches or approval change.
+    """
+    StudentJobEligibility.objects.filter(job=job).delete()
+    if not job.is_approved or job.application_deadline < timezone.now().date():
+        return
+    _insert_index_rows(_student_pairs(eligible_students(job), job))
+
+
+@transaction.atomic
+def refresh_jobs(jobs):
+    """
+    Recomputes the index rows of many jobs at once (e.g. after a bulk import). The
+    students of a chunk of jobs are inserted by one INSERT ... SELECT over the UNION
+    of their per-job queries, instead of one refresh per job.
+    """
+    job_ids = [job.pk for job in jobs]
+    created = 0
+    for start in range(0, len(job_ids), JOB_REFRESH_BATCH_SIZE):
+        chunk = job_ids[start:start + JOB_REFRESH_BATCH_SIZE]
+        StudentJobEligibility.objects.filter(job_id__in=chunk).delete()
+        pairs = [
+            _student_pairs(eligible_students(job), job).order_by()
+            for job in open_jobs().filter(pk__in=chunk).prefetch_related('branches')
+        ]
+        if pairs:
+            created += _insert_index_rows(pairs[0].union(*pairs[1:], all=True))
+    return created
+
+
+def prune_closed_jobs():
+    """
+    Removes the index rows of jobs whose deadline has passed. Returns the number of rows deleted.
+    """
+    deleted, _ = StudentJobEligibility.objects.filter(
+        job__application_deadline__lt=timezone.now().date()
+    ).delete()
+    return deleted
+
+
+@transaction.atomic
+def rebuild_index():
+    """
+    Rebuilds the whole index from scratch. Returns the number of rows created.
+    """
+    StudentJobEligibility.objects.all().delete()
+    created = 0
+    for job in open_jobs().prefetch_related('branches'):
+        created += _insert_index_rows(_student_pairs(eligible_students(job), job))
+    return created
@@ -0,0 +1,92 @@
+# core/exports.py
+
+import csv
+
+from django.db.models import Case, CharField, Value, When
+from django.utils import timezone
+
+from .models import JobPosting, StudentProfile
+
+# Rows fetched from the database cursor per round trip while exporting
+EXPORT_CHUNK_SIZE = 2000
+
+STUDENT_HEADER = ['Username', 'First Name', 'Last Name', 'Email', 'Branch', 'CGPA', 'Backlogs', 'Placed Status']
+JOB_HEADER = ['Job Title', 'Company', 'Location', 'Salary Range', 'Deadline', 'Status', 'Applicant Count']
+
+
+def student_queryset(branch=None, status=None):
+    """
+    Returns the students to export, optionally filtered by branch and placement status.
+    """
+    students = StudentProfile.objects.all()
+    if branch:
+        students = students.filter(branch__icontains=branch)
+    if status:
+        students = students.filter(is_placed=status == 'placed')
+    return students
+
+
+def student_rows(students):
+    """
+    Yields one CSV row per student in the queryset.
+    """
+    rows = students.order_by('pk').values_list(
+        'user__username', 'user__first_name', 'user__last_name', 'user__email',
+        'branch', 'cgpa', 'backlogs', 'is_placed',
+    )
+    for *fields, is_placed in rows.iterator(chunk_size=EXPORT_CHUNK_SIZE):
+        yield [*fields, 'Placed' if is_placed else 'Not Placed']
+
+
+def job_queryset(company=None):
+    """
+    Returns the job postings to export, optionally filtered by company name.
+    """
+    jobs = JobPosting.objects.all()
+    if company:
+        jobs = jobs.filter(company__name__icontains=company)
+    return jobs
+
+
+def job_rows(jobs):
+    """
+    Yields one CSV row per job posting, with its status computed in the query and its stored applicant count.
+    """
+    status = Case(
+        When(is_approved=False, then=Value('Pending')),
+        When(application_deadline__lt=timezone.now().date(), then=Value('Closed')),
+        default=Value('Open'),
+        output_field=CharField(),
+    )
+    rows = jobs.annotate(export_status=status).order_by('pk').values_list(
+        'title', 'company__name', 'location', 'salary_range', 'application_deadline',
+        'export_status', 'applicant_count',
+    )
+    return rows.iterator(chunk_size=EXPORT_CHUNK_SIZE)
+
+
+def export_data(export_type, filters):
+    """
+    Returns (header, row count, row iterator) for an ExportJob's type and filters.
+    """
+    if export_type == 'students':
+        students = student_queryset(filters.get('branch'), filters.get('status'))
+        return STUDENT_HEADER, students.count(), student_rows(students)
+    jobs = job_queryset(filters.get('company'))
+    return JOB_HEADER, jobs.count(), job_rows(jobs)
+
+
+def write_csv(csv_file, header, rows, total, progress=None):
+    """
+    Writes the header and rows to an open text file. Calls progress(rows_done, total)
+    every EXPORT_CHUNK_SIZE rows. Returns the number of rows written.
+    """
+    writer = csv.writer(csv_file)
+    writer.writerow(header)
+    written = 0
+    for row in rows:
+        writer.writerow(row)
+        written += 1
+        if progress and written % EXPORT_CHUNK_SIZE == 0:
+            progress(written, total)
+    return written
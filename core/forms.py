@@ -2,7 +2,7 @@
 
 from django import forms
 # Correctly import OUR custom User model and other models from this app
-from .models import User, StudentProfile, CompanyProfile, JobPosting, InterviewSchedule
+from .models import User, StudentProfile, CompanyProfile, JobPosting, InterviewSchedule, ImportJob, Application, Branch
 
 # ==============================================================================
 # 1. Registration Forms
@@ -116,26 +116,25 @@ class JobPostingForm(forms.ModelForm):
         widget=forms.Textarea(attrs={'rows': 4}),
         help_text="A detailed description of the job role and responsibilities."
     )
-    allowed_branches = forms.CharField(
-        help_text="Enter comma-separated branch codes (e.g., CSE, ECE, ME)."
-    )
 
     class Meta:
         model = JobPosting
         # The 'company' and 'is_approved' fields will be set automatically in the view
         exclude = ['company', 'is_approved', 'posted_at']
+        widgets = {
+            'branches': forms.CheckboxSelectMultiple,
+        }
+        labels = {
+            'branches': 'Allowed Branches',
+        }
 
 # ==============================================================================
 # 4. Utility Forms
 # ==============================================================================
 
 class BulkUploadForm(forms.Form):
-    UPLOAD_TYPE_CHOICES = (
-        ('students', 'Students'),
-        ('companies', 'Companies'),
-    )
     upload_type = forms.ChoiceField(
-        choices=UPLOAD_TYPE_CHOICES,
+        choices=ImportJob.UPLOAD_TYPE_CHOICES,
         label="Select Data Type to Upload",
         widget=forms.Select(attrs={'class': 'form-select'})
     )
@@ -154,6 +153,33 @@ class ResumeUploadForm(forms.ModelForm):
             'resume': 'Upload Your Resume File (PDF or DOCX)',
         }
 
+class ApplicantFilterForm(forms.Form):
+    """Server-side filters of a job's applicant list (see core/applicants.py)."""
+    status = forms.ChoiceField(
+        choices=(('', 'Any status'),) + Application.STATUS_CHOICES, required=False,
+        widget=forms.Select(attrs={'class': 'form-select form-select-sm'}),
+    )
+    min_cgpa = forms.FloatField(
+        required=False, min_value=0, max_value=10,
+        widget=forms.NumberInput(attrs={'class': 'form-control form-control-sm', 'placeholder': 'Min CGPA', 'step': '0.1'}),
+    )
+    max_cgpa = forms.FloatField(
+        required=False, min_value=0, max_value=10,
+        widget=forms.NumberInput(attrs={'class': 'form-control form-control-sm', 'placeholder': 'Max CGPA', 'step': '0.1'}),
+    )
+    branch = forms.ModelChoiceField(
+        queryset=Branch.objects.all(), required=False, empty_label='Any branch',
+        widget=forms.Select(attrs={'class': 'form-select form-select-sm'}),
+    )
+    skills = forms.CharField(
+        required=False, max_length=200,
+        widget=forms.TextInput(attrs={'class': 'form-control form-control-sm', 'placeholder': 'Skills, e.g. Python, SQL'}),
+    )
+    rank_skills = forms.CharField(
+        required=False, max_length=200,
+        widget=forms.TextInput(attrs={'class': 'form-control form-control-sm', 'placeholder': 'Rank by skills, e.g. Python, SQL'}),
+    )
+
 class InterviewScheduleForm(forms.ModelForm):
     """
     A form for scheduling an interview for shortlisted candidates.
@@ -173,6 +199,21 @@ class InterviewScheduleForm(forms.ModelForm):
     # Use widgets to get user-friendly date and time inputs in the browser
     interview_date = forms.DateField(widget=forms.DateInput(attrs={'type': 'date'}))
     interview_time = forms.TimeField(widget=forms.TimeInput(attrs={'type': 'time'}))
+
+    # Batch scheduling options (see core/scheduling.py)
+    slot_minutes = forms.IntegerField(
+        required=False, min_value=5, max_value=480, label='Slot length (minutes)',
+        help_text='Give candidates consecutive slots of this length, starting at the interview time. '
+                  'Leave blank to interview everyone at that time.',
+    )
+    candidates_per_slot = forms.IntegerField(
+        required=False, min_value=1, initial=1, label='Candidates per slot',
+        help_text='Number of parallel interview panels.',
+    )
+    skip_clashes = forms.BooleanField(
+        required=False, label='Skip candidates who already have an interview at that time',
+        help_text='They stay shortlisted, so you can schedule them separately.',
+    )
     
     class Meta:
         model = InterviewSchedule
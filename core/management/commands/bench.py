@@ -0,0 +1,130 @@
+# core/management/commands/bench.py
+
+import json
+import os
+from datetime import datetime
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.management.base import BaseCommand, CommandError
+from django.test import override_settings
+
+from core.benchmarks import SCENARIOS, BenchContext, BenchmarkError, compare, dataset_size, measure
+
+
+class Command(BaseCommand):
+    help = 'Time the placement workflows against the current (seeded) database and compare with a baseline'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'scenarios',
+            nargs='*',
+            metavar='scenario',
+            help=f'Scenarios to run (default: all of {", ".join(SCENARIOS)})',
+        )
+        parser.add_argument(
+            '--iterations',
+            type=int,
+            default=20,
+            help='Timed runs per scenario (default: 20)',
+        )
+        parser.add_argument(
+            '--warmup',
+            type=int,
+            default=2,
+            help='Untimed runs per scenario before timing (default: 2)',
+        )
+        parser.add_argument(
+            '--baseline',
+            default=os.path.join(settings.BASE_DIR, 'bench_baseline.json'),
+            help='Baseline file to compare with and to --save to (default: bench_baseline.json)',
+        )
+        parser.add_argument(
+            '--save',
+            action='store_true',
+            help='Record this run as the new baseline',
+        )
+        parser.add_argument(
+            '--tolerance',
+            type=float,
+            default=0.2,
+            help='Allowed latency and memory increase over the baseline, as a fraction (default: 0.2)',
+        )
+        parser.add_argument(
+            '--check',
+            action='store_true',
+            help='Exit with an error if any scenario regressed',
+        )
+        parser.add_argument(
+            '--cold-cache',
+            action='store_true',
+            help='Clear the cache before every run instead of measuring with a warm cache',
+        )
+
+    def handle(self, *args, **options):
+        names = options['scenarios'] or list(SCENARIOS)
+        unknown = [name for name in names if name not in SCENARIOS]
+        if unknown:
+            raise CommandError(f'Unknown scenario(s): {", ".join(unknown)}. Choose from {", ".join(SCENARIOS)}.')
+        if options['iterations'] < 1:
+            raise CommandError('--iterations must be at least 1.')
+
+        baseline = self.load_baseline(options['baseline'])
+        size = dataset_size()
+        if baseline and baseline['dataset'] != size:
+            self.stdout.write(self.style.WARNING(
+                f'The baseline was recorded on a different dataset ({baseline["dataset"]}, now {size}).'
+            ))
+
+        results = {}
+        regressed = []
+        # The test client sends requests as "testserver"
+        with override_settings(ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, 'testserver']):
+            try:
+                context = BenchContext()
+                for name in names:
+                    step = SCENARIOS[name](context)
+                    results[name] = measure(
+                        step, options['iterations'], options['warmup'],
+                        before_each=cache.clear if options['cold_cache'] else None,
+                    )
+                    regressions = []
+                    if baseline and name in baseline['scenarios']:
+                        regressions = compare(results[name], baseline['scenarios'][name], options['tolerance'])
+                    self.report(name, results[name], baseline['scenarios'].get(name) if baseline else None, regressions)
+                    if regressions:
+                        regressed.append(name)
+            except BenchmarkError as e:
+                raise CommandError(str(e))
+
+        if options['save']:
+            with open(options['baseline'], 'w', encoding='utf-8') as f:
+                json.dump({
+                    'recorded_at': datetime.now().isoformat(timespec='seconds'),
+                    'iterations': options['iterations'],
+                    'dataset': size,
+                    'scenarios': {**(baseline['scenarios'] if baseline else {}), **results},
+                }, f, indent=2)
+            self.stdout.write(self.style.SUCCESS(f'✓ Saved the baseline to {options["baseline"]}'))
+
+        if regressed and options['check']:
+            raise CommandError(f'Regressed: {", ".join(regressed)}')
+
+    def load_baseline(self, path):
+        if not os.path.exists(path):
+            return None
+        with open(path, encoding='utf-8') as f:
+            return json.load(f)
+
+    def report(self, name, result, baseline, regressions):
+        line = (
+            f'{name:<20} p50 {result["p50_ms"]:>9.2f} ms   p95 {result["p95_ms"]:>9.2f} ms   '
+            f'{result["queries"]:>4} queries   {result["peak_memory_kib"]:>7} KiB'
+        )
+        if baseline is None:
+            self.stdout.write(line)
+        elif regressions:
+            self.stdout.write(self.style.ERROR(f'✗ {line}   ({"; ".join(regressions)})'))
+        else:
+            change = (result['p50_ms'] - baseline['p50_ms']) / baseline['p50_ms'] * 100 if baseline['p50_ms'] else 0
+            self.stdout.write(self.style.SUCCESS(f'✓ {line}   (p50 {change:+.0f}%)'))
@@ -0,0 +1,120 @@
+# core/management/commands/bench_writes.py
+
+import logging
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import override_settings
+
+from core.benchmarks import BenchmarkError, DeadlineRush, run_concurrently
+
+
+class Command(BaseCommand):
+    help = (
+        'Replay a deadline hour of concurrent applications, status updates and page views '
+        'against the current database, then undo its writes. Run it once per DATABASE_PROFILE to compare them.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=8,
+            help='Concurrent requests (threads, one database connection each) (default: 8)',
+        )
+        parser.add_argument(
+            '--students',
+            type=int,
+            default=100,
+            help='Students applying to the same job (default: 100)',
+        )
+        parser.add_argument(
+            '--clicks',
+            type=int,
+            default=2,
+            help='Times each student submits the form, with the same idempotency key (default: 2)',
+        )
+        parser.add_argument(
+            '--reviews',
+            type=int,
+            default=100,
+            help='Applicants the company shortlists and rejects meanwhile (default: 100)',
+        )
+        parser.add_argument(
+            '--reads',
+            type=int,
+            default=100,
+            help='Job listing page views meanwhile (default: 100)',
+        )
+        parser.add_argument(
+            '--journal-mode',
+            choices=['wal', 'delete'],
+            help='SQLite journal mode for the run; the previous mode is restored afterwards',
+        )
+
+    def handle(self, *args, **options):
+        if min(options['workers'], options['students'], options['clicks']) < 1:
+            raise CommandError('--workers, --students and --clicks must be at least 1.')
+        if min(options['reviews'], options['reads']) < 0:
+            raise CommandError('--reviews and --reads cannot be negative.')
+        try:
+            rush = DeadlineRush(options['students'], options['clicks'], options['reviews'], options['reads'])
+        except BenchmarkError as e:
+            raise CommandError(str(e))
+
+        previous_mode = self.set_journal_mode(options['journal_mode'])
+        self.stdout.write(f'Database profile: {settings.DATABASE_PROFILE} ({self.describe_connection()})')
+        try:
+            # The test client sends requests as "testserver". The per-request perf log and
+            # the tracebacks of failed requests are left out; failures are counted below.
+            logging.disable(logging.CRITICAL)
+            with override_settings(ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, 'testserver'], PERF_SAMPLE_RATE=0):
+                result = run_concurrently(rush.tasks(), options['workers'])
+        finally:
+            logging.disable(logging.NOTSET)
+            applied = rush.applications_made()
+            rush.undo()
+            if previous_mode:
+                self.set_journal_mode(previous_mode)
+
+        self.stdout.write(
+            f'{result["requests"]} requests on {options["workers"]} workers: {result["requests_per_s"]:.1f} req/s'
+        )
+        for kind, figures in result['kinds'].items():
+            self.stdout.write(
+                f'  {kind:<8} {figures["requests"]:>5} requests   '
+                f'p50 {figures["p50_ms"]:>8.2f} ms   p95 {figures["p95_ms"]:>8.2f} ms'
+            )
+        for error, count in result['errors'].items():
+            self.stdout.write(self.style.ERROR(f'✗ {count} x {error}'))
+        if not result['errors']:
+            self.stdout.write(self.style.SUCCESS('✓ No failed requests'))
+        if applied == len(rush.students):
+            self.stdout.write(self.style.SUCCESS(f'✓ {applied} students applied exactly once (writes undone)'))
+        else:
+            self.stdout.write(self.style.ERROR(f'✗ {applied} applications for {len(rush.students)} students (writes undone)'))
+
+    def pragma(self, name):
+        with connection.cursor() as cursor:
+            cursor.execute(f'PRAGMA {name}')
+            return cursor.fetchone()[0]
+
+    def describe_connection(self):
+        if connection.vendor != 'sqlite':
+            return connection.vendor
+        options = connection.settings_dict.get('OPTIONS', {})
+        return (
+            f'journal_mode={self.pragma("journal_mode")}, synchronous={self.pragma("synchronous")}, '
+            f'busy_timeout={self.pragma("busy_timeout")} ms, '
+            f'transaction_mode={options.get("transaction_mode") or "DEFERRED"}'
+        )
+
+    def set_journal_mode(self, mode):
+        """Switches the SQLite journal mode and returns the previous one (None if unchanged)."""
+        if not mode or connection.vendor != 'sqlite':
+            return None
+        previous = self.pragma('journal_mode')
+        with connection.cursor() as cursor:
+            cursor.execute(f'PRAGMA journal_mode={mode}')
+        return previous
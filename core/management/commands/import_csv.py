@@ -0,0 +1,26 @@
+# core/management/commands/import_csv.py
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core.bulk_import import COLUMNS, import_csv
+
+
+class Command(BaseCommand):
+    help = 'Bulk import students, companies or jobs from a CSV file (same format as the TPO upload page)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('upload_type', choices=sorted(COLUMNS))
+        parser.add_argument('csv_path', help='Path to the CSV file')
+
+    def handle(self, *args, **options):
+        try:
+            with open(options['csv_path'], 'rb') as csv_file:
+                report = import_csv(options['upload_type'], csv_file)
+        except OSError as e:
+            raise CommandError(e)
+
+        if not report.ok:
+            for line, message in report.errors:
+                self.stderr.write(f'  line {line}: {message}')
+            raise CommandError(f'Nothing was imported: {len(report.errors)} row(s) need fixing.')
+        self.stdout.write(self.style.SUCCESS(f'✓ {report.summary()}'))
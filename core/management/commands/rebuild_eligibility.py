@@ -0,0 +1,25 @@
+# core/management/commands/rebuild_eligibility.py
+
+from django.core.management.base import BaseCommand
+
+from core.eligibility import prune_closed_jobs, rebuild_index
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the materialized student/job eligibility index'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--prune-only',
+            action='store_true',
+            help='Only remove entries for jobs whose deadline has passed (suitable for a daily cron job)',
+        )
+
+    def handle(self, *args, **options):
+        if options['prune_only']:
+            deleted = prune_closed_jobs()
+            self.stdout.write(self.style.SUCCESS(f'✓ Removed {deleted} entries for closed jobs'))
+            return
+
+        created = rebuild_index()
+        self.stdout.write(self.style.SUCCESS(f'✓ Rebuilt eligibility index with {created} entries'))
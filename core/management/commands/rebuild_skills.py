@@ -0,0 +1,14 @@
+# core/management/commands/rebuild_skills.py
+
+from django.core.management.base import BaseCommand
+
+from core.skills import fts_available, rebuild_skill_index
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the normalised student skills and the skill search index from the profiles'
+
+    def handle(self, *args, **options):
+        created = rebuild_skill_index()
+        index = 'StudentSkill and the FTS5 index' if fts_available() else 'StudentSkill (FTS5 unavailable)'
+        self.stdout.write(self.style.SUCCESS(f'✓ Indexed {created} student skills in {index}'))
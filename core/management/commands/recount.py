@@ -0,0 +1,13 @@
+# core/management/commands/recount.py
+
+from django.core.management.base import BaseCommand
+
+from core.counters import recount_application_counters
+
+
+class Command(BaseCommand):
+    help = 'Recount the application counters of every job and company, repairing any that drifted'
+
+    def handle(self, *args, **options):
+        jobs, companies = recount_application_counters()
+        self.stdout.write(self.style.SUCCESS(f'✓ Repaired the application counters of {jobs} jobs and {companies} companies'))
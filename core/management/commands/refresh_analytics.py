@@ -0,0 +1,21 @@
+# core/management/commands/refresh_analytics.py
+
+from django.core.management.base import BaseCommand
+
+from core.analytics import refresh_snapshot
+
+
+class Command(BaseCommand):
+    help = 'Recompute the analytics snapshot shown on the TPO analytics page'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--keep',
+            type=int,
+            default=30,
+            help='Number of snapshots to keep (default: 30)',
+        )
+
+    def handle(self, *args, **options):
+        snapshot = refresh_snapshot(keep=options['keep'])
+        self.stdout.write(self.style.SUCCESS(f'✓ Stored {snapshot}'))
@@ -0,0 +1,150 @@
+# core/management/commands/run_workers.py
+
+import multiprocessing
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+
+import django
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+from core.tasks import claim_next_task, fail_interrupted_tasks, requeue_interrupted_tasks, run_task, still_running
+
+# Times a task interrupted by a dead worker is retried in a worker of its own; a task
+# whose own worker dies that many times fails
+MAX_WORKER_CRASHES = 3
+
+# Message of a task that failed because it kept taking its worker process down
+WORKER_DIED_MESSAGE = f'The worker process running it stopped unexpectedly {MAX_WORKER_CRASHES} times.'
+
+
+class Command(BaseCommand):
+    help = 'Process queued bulk imports and report exports with a pool of worker processes'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=os.cpu_count() or 1,
+            help='Number of worker processes; 0 runs tasks in this process (default: one per CPU)',
+        )
+        parser.add_argument(
+            '--poll-interval',
+            type=float,
+            default=2.0,
+            help='Seconds between checks for new tasks (default: 2)',
+        )
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help='Exit once the queue is empty instead of waiting for new tasks',
+        )
+
+    def handle(self, *args, **options):
+        # Only one run_workers process should serve a database, so anything still
+        # marked running was interrupted when the previous one stopped
+        requeued = requeue_interrupted_tasks()
+        if requeued:
+            self.stdout.write(self.style.WARNING(f'Requeued {requeued} interrupted task(s)'))
+
+        try:
+            if options['workers'] == 0:
+                self.run_inline(options)
+            else:
+                self.run_pool(options)
+        except KeyboardInterrupt:
+            self.stdout.write('Stopping workers; unfinished tasks will be requeued on the next start.')
+
+    def run_inline(self, options):
+        while True:
+            claimed = claim_next_task()
+            if claimed is None:
+                if options['once']:
+                    return
+                time.sleep(options['poll_interval'])
+                continue
+            self.report(claimed, run_task(*claimed))
+
+    def run_pool(self, options):
+        workers = options['workers']
+        # Spawned (not forked) workers set Django up themselves and open their own
+        # database connections instead of sharing this process's
+        connections.close_all()
+        context = multiprocessing.get_context('spawn')
+        while True:
+            claimed_tasks = set()
+            try:
+                with ProcessPoolExecutor(max_workers=workers, mp_context=context, initializer=django.setup) as pool:
+                    self.stdout.write(f'Started {workers} worker process(es)')
+                    self.serve(pool, workers, claimed_tasks, options)
+                return
+            except BrokenProcessPool:
+                # A worker process died (killed, out of memory, a crash in native code) and
+                # took the pool and the tasks of its healthy workers down with it. Which task
+                # was the cause is unknown, so each interrupted one is run again on its own.
+                interrupted = sorted(still_running(claimed_tasks))
+                self.stderr.write(f'✗ A worker process died; retrying {len(interrupted)} interrupted task(s) one by one.')
+                for claimed in interrupted:
+                    self.retry_alone(claimed, context)
+
+    def retry_alone(self, claimed, context):
+        """
+        Runs a task interrupted by a dead worker in a pool of its own, so that a crash
+        can only be its own. It fails after MAX_WORKER_CRASHES such crashes.
+        """
+        kind, pk = claimed
+        for attempt in range(1, MAX_WORKER_CRASHES + 1):
+            try:
+                with ProcessPoolExecutor(max_workers=1, mp_context=context, initializer=django.setup) as pool:
+                    status = pool.submit(run_task, *claimed).result()
+            except BrokenProcessPool:
+                self.stderr.write(f'✗ {kind.capitalize()} #{pk} crashed its worker ({attempt}/{MAX_WORKER_CRASHES})')
+                continue
+            self.report(claimed, status)
+            return
+        fail_interrupted_tasks([claimed], WORKER_DIED_MESSAGE)
+        self.report(claimed, 'failed')
+
+    def serve(self, pool, workers, claimed_tasks, options):
+        """
+        Keeps the pool busy with queued tasks until the queue is empty (with --once).
+        Tasks are added to `claimed_tasks` when claimed and removed once finished.
+        """
+        running = {}
+        while True:
+            while len(running) < workers:
+                claimed = claim_next_task()
+                if claimed is None:
+                    break
+                claimed_tasks.add(claimed)
+                running[pool.submit(run_task, *claimed)] = claimed
+
+            if not running:
+                if options['once']:
+                    return
+                time.sleep(options['poll_interval'])
+                continue
+
+            done, _ = wait(running, timeout=options['poll_interval'], return_when=FIRST_COMPLETED)
+            for future in done:
+                claimed = running.pop(future)
+                try:
+                    status = future.result()
+                except BrokenProcessPool:
+                    # run_pool retries the interrupted tasks and starts a new pool
+                    raise
+                except Exception as e:
+                    # run_task catches the task's errors; this one came from the pool itself
+                    fail_interrupted_tasks([claimed], f'{type(e).__name__}: {e}')
+                    status = 'failed'
+                claimed_tasks.discard(claimed)
+                self.report(claimed, status)
+
+    def report(self, claimed, status):
+        kind, pk = claimed
+        if status == 'done':
+            self.stdout.write(self.style.SUCCESS(f'✓ {kind.capitalize()} #{pk} done'))
+        else:
+            self.stdout.write(self.style.ERROR(f'✗ {kind.capitalize()} #{pk} {status}'))
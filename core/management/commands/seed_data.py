@@ -1,24 +1,57 @@
 # core/management/commands/seed_data.py
 
-from django.core.management.base import BaseCommand
+import bisect
+import multiprocessing
+import os
+import random
+import re
+import traceback
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from datetime import datetime, timedelta, date, time
+from io import BytesIO
+from time import perf_counter
+
+import django
+from django.core.management.base import BaseCommand, CommandError
 from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.cache import cache
 from django.core.files.base import ContentFile
-from django.db import transaction
-from core.models import StudentProfile, CompanyProfile, JobPosting, Application, InterviewSchedule, Document, AuditLog
+from django.core.files.storage import default_storage
+from django.db import connection, transaction
+from django.utils import timezone
+from core.models import (
+    StudentProfile, CompanyProfile, Branch, JobPosting, JobPostingBranch, StudentJobEligibility,
+    Application, InterviewSchedule, Document, AuditLog, StudentSkill,
+)
+from core.counters import recount_application_counters
+from core.eligibility import rebuild_index
+from core.skills import FTS_TABLE, fts_available, rebuild_skill_index
 from faker import Faker
-import random
-from datetime import datetime, timedelta, date, time
 from reportlab.lib.pagesizes import letter
 from reportlab.pdfgen import canvas
 from reportlab.lib.units import inch
 from PIL import Image, ImageDraw, ImageFont
-from io import BytesIO
-import traceback
-import os
 
 User = get_user_model()
 fake = Faker('en_IN')  # Indian locale
 
+# Students seeded when --scale is not given
+DEFAULT_SCALE = 50
+
+# Rows per INSERT statement
+SEED_BATCH_SIZE = 1000
+
+# Students generated (with their resumes and applications) per round; bounds memory at large scales
+STUDENT_CHUNK_SIZE = 5000
+
+# Beyond the companies listed below, one generated company is added per this many students
+STUDENTS_PER_COMPANY = 500
+
+# Accounts of each role listed in credentials.md
+CREDENTIALS_LISTED = 50
+
 # Constants
 BRANCHES = [
     'Computer Science Engineering',
@@ -220,12 +253,170 @@ JOB_TEMPLATES = [
     },
 ]
 
+# Students per branch in every 50 seeded
+BRANCH_DISTRIBUTION = {
+    'Computer Science Engineering': 15,
+    'Electronics and Communication Engineering': 10,
+    'Mechanical Engineering': 8,
+    'Electrical and Electronics Engineering': 7,
+    'Civil Engineering': 5,
+    'Chemical Engineering': 5
+}
+
+LOGO_COLORS = ['#4285F4', '#EA4335', '#FBBC05', '#34A853', '#FF6D00', '#7B1FA2',
+               '#00ACC1', '#C0CA33', '#F4511E', '#8E24AA']
+
+DOCUMENTS = [
+    ('Resume Template for Students', 'Use this template to create your professional resume.'),
+    ('Placement Guidelines 2025-26', 'Important guidelines for the placement process.'),
+    ('Interview Preparation Guide', 'Tips and tricks to ace your interviews.'),
+    ('Company Research Checklist', 'How to research companies before applying.'),
+    ('Sample Cover Letter Template', 'Template for writing effective cover letters.'),
+    ('FAQs for Placement Process', 'Frequently asked questions answered.'),
+    ('Dress Code for Interviews', 'Professional attire guidelines.')
+]
+
+
+# ==============================================================================
+# Generated files. These run in the file worker processes, so they take plain
+# dicts rather than model instances.
+# ==============================================================================
+
+def render_resume_pdf(student):
+    """Render a simple resume PDF and return its bytes"""
+    buffer = BytesIO()
+    c = canvas.Canvas(buffer, pagesize=letter)
+
+    # Header
+    c.setFont("Helvetica-Bold", 18)
+    c.drawString(1*inch, 10.5*inch, f"{student['first_name']} {student['last_name']}")
+
+    # Contact Info
+    c.setFont("Helvetica", 10)
+    y = 10.2*inch
+    c.drawString(1*inch, y, f"Email: {student['email']}")
+    y -= 0.2*inch
+    c.drawString(1*inch, y, f"Phone: {student['phone_number']}")
+    y -= 0.2*inch
+    c.drawString(1*inch, y, f"LinkedIn: {student['linkedin_url']}")
+    y -= 0.2*inch
+    c.drawString(1*inch, y, f"GitHub: {student['github_url']}")
+
+    # Education
+    y -= 0.4*inch
+    c.setFont("Helvetica-Bold", 12)
+    c.drawString(1*inch, y, "Education")
+    y -= 0.2*inch
+    c.setFont("Helvetica", 10)
+    c.drawString(1*inch, y, f"{student['branch']}")
+    y -= 0.15*inch
+    c.drawString(1*inch, y, f"CGPA: {student['cgpa']} | Graduation Year: {student['graduation_year']}")
+
+    # Skills
+    y -= 0.3*inch
+    c.setFont("Helvetica-Bold", 12)
+    c.drawString(1*inch, y, "Technical Skills")
+    y -= 0.2*inch
+    c.setFont("Helvetica", 10)
+
+    # Word wrap skills
+    max_width = 80
+    words = student['skills'].split(', ')
+    current_line = []
+    for word in words:
+        test_line = ', '.join(current_line + [word])
+        if len(test_line) <= max_width:
+            current_line.append(word)
+        else:
+            if current_line:
+                c.drawString(1*inch, y, ', '.join(current_line))
+                y -= 0.15*inch
+            current_line = [word]
+    if current_line:
+        c.drawString(1*inch, y, ', '.join(current_line))
+
+    c.save()
+    return buffer.getvalue()
+
+
+def render_company_logo(company_name, bg_color):
+    """Render a simple logo with the company's initials and return the PNG bytes"""
+    img = Image.new('RGB', (200, 200), color=bg_color)
+    draw = ImageDraw.Draw(img)
+
+    # Get initials
+    words = company_name.split()
+    initials = ''.join([w[0].upper() for w in words[:2]])
+
+    # Draw initials
+    font_size = 80
+    try:
+        font = ImageFont.truetype("arial.ttf", font_size)
+    except:
+        try:
+            font = ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf", font_size)
+        except:
+            font = ImageFont.load_default()
+
+    # Get text bounding box
+    bbox = draw.textbbox((0, 0), initials, font=font)
+    text_width = bbox[2] - bbox[0]
+    text_height = bbox[3] - bbox[1]
+    position = ((200 - text_width) // 2, (200 - text_height) // 2 - 10)
+
+    draw.text(position, initials, fill='white', font=font)
+
+    buffer = BytesIO()
+    img.save(buffer, format='PNG')
+    return buffer.getvalue()
+
+
+def render_document_pdf(title, content):
+    """Render a simple PDF document and return its bytes"""
+    buffer = BytesIO()
+    c = canvas.Canvas(buffer, pagesize=letter)
+
+    c.setFont("Helvetica-Bold", 16)
+    c.drawString(1*inch, 10.5*inch, title)
+
+    c.setFont("Helvetica", 11)
+    y_position = 10*inch
+    for line in content.split('\n'):
+        c.drawString(1*inch, y_position, line[:80])
+        y_position -= 0.2*inch
+
+    c.save()
+    return buffer.getvalue()
+
+
+def save_resume(student):
+    """Render and store one student's resume; returns the stored file name"""
+    filename = f"resumes/{student['username'].replace('.', '_')}_resume.pdf"
+    return default_storage.save(filename, ContentFile(render_resume_pdf(student)))
+
+
+def save_logo(company):
+    """Render and store one company's logo; returns the stored file name"""
+    filename = f"company_logos/{company['username'][:-len('_hr')]}.png"
+    return default_storage.save(filename, ContentFile(render_company_logo(company['name'], company['color'])))
+
+
+@contextmanager
+def keep_auto_now_add(model, field_name):
+    """Let bulk_create store the given value of an auto_now_add field instead of the current time"""
+    field = model._meta.get_field(field_name)
+    field.auto_now_add = False
+    try:
+        yield
+    finally:
+        field.auto_now_add = True
+
 
 class Command(BaseCommand):
     help = 'Seed database with realistic placement system data'
 
-    def __init__(self):
-        super().__init__()
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
         self.credentials = {
             'admins': [],
             'students': [],
@@ -239,8 +430,16 @@ class Command(BaseCommand):
             'applications': 0,
             'interviews': 0,
             'documents': 0,
-            'audit_logs': 0
+            'audit_logs': 0,
+            'eligibility': 0,
+            'skills': 0,
         }
+        # Lightweight records of what was inserted, used by the later steps
+        self.students = []  # (pk, branch code, cgpa, backlogs, is_placed)
+        self.companies = []  # company dicts with their user pk
+        self.jobs = []  # job dicts with their pk
+        self.application_samples = []  # (student pk, job title, company name) for the audit log
+        self.pool = None
 
     def add_arguments(self, parser):
         parser.add_argument(
@@ -248,16 +447,56 @@ class Command(BaseCommand):
             action='store_true',
             help='Clear existing data before seeding',
         )
+        parser.add_argument(
+            '--scale',
+            type=int,
+            default=DEFAULT_SCALE,
+            help=f'Number of students; companies, jobs, applications and interviews grow with it (default: {DEFAULT_SCALE})',
+        )
+        parser.add_argument(
+            '--seed',
+            type=int,
+            help='Random seed, so that the same scale produces the same data',
+        )
+        parser.add_argument(
+            '--no-files',
+            action='store_true',
+            help='Skip resumes, logos, documents and credentials.md',
+        )
+        parser.add_argument(
+            '--non-interactive',
+            action='store_true',
+            help='Never prompt; fail instead of asking to clear existing data',
+        )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=os.cpu_count() or 1,
+            help='Processes rendering resumes and logos; 1 renders them in this process (default: one per CPU)',
+        )
 
     def handle(self, *args, **options):
+        if options['scale'] < 1:
+            raise CommandError('--scale must be at least 1.')
+        self.scale = options['scale']
+        self.with_files = not options['no_files']
+        self.workers = max(1, options['workers'])
+        # The audit log samples (10 student, 5 company, 10 job and 20 application entries) grow with the scale
+        self.audit_factor = max(1, self.scale // DEFAULT_SCALE)
+        if options['seed'] is not None:
+            random.seed(options['seed'])
+            Faker.seed(options['seed'])
+
         self.stdout.write("=" * 50)
         self.stdout.write("Placement Management System - Data Seeder")
         self.stdout.write("=" * 50)
-        
+
         if options['clear']:
             self.clear_data()
         else:
             if User.objects.filter(role='student').exists():
+                if options['non_interactive']:
+                    raise CommandError('Data already exists; pass --clear to replace it.')
                 self.stdout.write(self.style.WARNING('\nData already exists!'))
                 response = input("Clear and reseed? (yes/no): ")
                 if response.lower() == 'yes':
@@ -265,8 +504,15 @@ class Command(BaseCommand):
                 else:
                     self.stdout.write("Seeding cancelled.")
                     return
-        
+
+        # Every seeded account of a role shares one password, so each is hashed once
+        self.password_hashes = {
+            'student': make_password('student123'),
+            'company': make_password('company123'),
+        }
+
         try:
+            self.start_file_pool()
             self.seed_admins()
             self.seed_students()
             self.seed_companies()
@@ -275,35 +521,89 @@ class Command(BaseCommand):
             self.seed_interviews()
             self.seed_documents()
             self.seed_audit_logs()
+            self.build_eligibility_index()
             self.generate_credentials_file()
-            
+
+            # bulk_create fires no signals, so cached counters and badges were never invalidated
+            cache.clear()
             self.print_summary()
-            
+
         except Exception as e:
-            self.stdout.write(self.style.ERROR(f'\n✗ Error during seeding: {str(e)}'))
             traceback.print_exc()
+            # A non-zero exit status lets scripts and CI notice that the seed failed
+            raise CommandError(f'Error during seeding: {e}') from e
+        finally:
+            if self.pool is not None:
+                self.pool.shutdown()
 
     def clear_data(self):
         """Clear existing data"""
         self.stdout.write("\nClearing existing data...")
-        
+
         with transaction.atomic():
+            # Deleting through the ORM would load every application and interview to send
+            # its post_delete signal; the caches those signals invalidate are cleared below
+            with connection.cursor() as cursor:
+                for model in (StudentJobEligibility, StudentSkill, InterviewSchedule, Application, JobPostingBranch,
+                              JobPosting, StudentProfile, CompanyProfile):
+                    cursor.execute(f'DELETE FROM {connection.ops.quote_name(model._meta.db_table)}')
+                if fts_available():
+                    cursor.execute(f'DELETE FROM {FTS_TABLE}')
             AuditLog.objects.all().delete()
             Document.objects.all().delete()
-            InterviewSchedule.objects.all().delete()
-            Application.objects.all().delete()
-            JobPosting.objects.all().delete()
-            CompanyProfile.objects.all().delete()
-            StudentProfile.objects.all().delete()
             User.objects.filter(role__in=['student', 'company']).delete()
-            
+
+        cache.clear()
         self.stdout.write(self.style.SUCCESS('✓ Existing data cleared'))
 
+    def start_step(self, label):
+        self.step_started = perf_counter()
+        self.stdout.write(f"\n{label}...")
+
+    def finish_step(self, message):
+        self.stdout.write(self.style.SUCCESS(f'✓ {message} ({perf_counter() - self.step_started:.1f}s)'))
+
+    def start_file_pool(self):
+        if not self.with_files or self.workers == 1:
+            return
+        # Spawned workers set Django up themselves to reach the settings and file storage
+        context = multiprocessing.get_context('spawn')
+        self.pool = ProcessPoolExecutor(max_workers=self.workers, mp_context=context, initializer=django.setup)
+
+    def save_files(self, save, items):
+        """Run save(item) for every item, in the worker pool if there is one; returns the file names"""
+        if self.pool is None:
+            return [save(item) for item in items]
+        chunksize = max(1, len(items) // (self.workers * 4))
+        return list(self.pool.map(save, items, chunksize=chunksize))
+
+    def create_users(self, rows, role):
+        """Bulk-insert one User per row dict and store its primary key in row['pk']"""
+        users = [
+            User(
+                username=row['username'],
+                password=self.password_hashes[role],
+                email=row['email'],
+                first_name=row['first_name'],
+                last_name=row['last_name'],
+                role=role
+            )
+            for row in rows
+        ]
+        User.objects.bulk_create(users, batch_size=SEED_BATCH_SIZE)
+        if not all(user.pk for user in users):
+            # Backends that cannot return primary keys from a bulk insert
+            user_ids = dict(User.objects.filter(username__in=[u.username for u in users]).values_list('username', 'pk'))
+            for user in users:
+                user.pk = user_ids[user.username]
+        for row, user in zip(rows, users):
+            row['pk'] = user.pk
+
     @transaction.atomic
     def seed_admins(self):
         """Create admin users"""
-        self.stdout.write("\n[1/9] Creating admin users...")
-        
+        self.start_step("[1/10] Creating admin users")
+
         # Super admin
         admin, created = User.objects.get_or_create(
             username='admin',
@@ -319,7 +619,7 @@ class Command(BaseCommand):
         if created:
             admin.set_password('admin123')
             admin.save()
-            
+
         self.credentials['admins'].append({
             'username': 'admin',
             'password': 'admin123',
@@ -327,7 +627,7 @@ class Command(BaseCommand):
             'role': 'Super Admin',
             'name': 'System Administrator'
         })
-        
+
         # Placement officer
         officer, created = User.objects.get_or_create(
             username='placement_officer',
@@ -343,7 +643,7 @@ class Command(BaseCommand):
         if created:
             officer.set_password('placement123')
             officer.save()
-            
+
         self.credentials['admins'].append({
             'username': 'placement_officer',
             'password': 'placement123',
@@ -351,298 +651,237 @@ class Command(BaseCommand):
             'role': 'Placement Officer',
             'name': 'Rajesh Kumar'
         })
-        
+
         self.stats['users'] += 2
-        self.stdout.write(self.style.SUCCESS('✓ Created 2 admin users'))
+        self.finish_step('Created 2 admin users')
+
+    def branch_plan(self):
+        """The branch of every student to create, in BRANCH_DISTRIBUTION proportions"""
+        total = sum(BRANCH_DISTRIBUTION.values())
+        counts = {branch: self.scale * share // total for branch, share in BRANCH_DISTRIBUTION.items()}
+        counts[BRANCHES[0]] += self.scale - sum(counts.values())
+        return [branch for branch, count in counts.items() for _ in range(count)]
+
+    def student_row(self, student_num, branch, name_counts):
+        """Generate the user and profile fields of one student"""
+        first_name = random.choice(FIRST_NAMES)
+        last_name = random.choice(LAST_NAMES)
+        # Names repeat once the scale outgrows the name lists; number the repeats
+        seen = name_counts.get((first_name, last_name), 0)
+        name_counts[(first_name, last_name)] = seen + 1
+        username = f"{first_name.lower()}.{last_name.lower()}" + (str(seen + 1) if seen else '')
+
+        # Generate CGPA based on distribution
+        rand = random.random()
+        if rand < 0.2:  # 20% between 9.0-10.0
+            cgpa = round(random.uniform(9.0, 10.0), 2)
+        elif rand < 0.5:  # 30% between 8.0-8.99
+            cgpa = round(random.uniform(8.0, 8.99), 2)
+        elif rand < 0.8:  # 30% between 7.0-7.99
+            cgpa = round(random.uniform(7.0, 7.99), 2)
+        else:  # 20% between 6.0-6.99
+            cgpa = round(random.uniform(6.0, 6.99), 2)
+
+        # Backlogs distribution
+        rand = random.random()
+        if rand < 0.7:
+            backlogs = 0
+        elif rand < 0.9:
+            backlogs = 1
+        else:
+            backlogs = 2
+
+        # Random skills from branch pool
+        skills_pool = SKILLS_BY_BRANCH[branch]
+        num_skills = random.randint(5, 10)
+
+        return {
+            'username': username,
+            'email': f"{username}@student.edu",
+            'first_name': first_name,
+            'last_name': last_name,
+            'branch': branch,
+            'cgpa': cgpa,
+            'backlogs': backlogs,
+            # 30% placed
+            'is_placed': student_num < (self.scale * 0.3),
+            'skills': ', '.join(random.sample(skills_pool, min(num_skills, len(skills_pool)))),
+            'graduation_year': 2026,
+            'phone_number': f"+91{random.choice(['9', '8', '7'])}{random.randint(100000000, 999999999)}",
+            'linkedin_url': f"https://linkedin.com/in/{first_name.lower()}-{last_name.lower()}-{random.randint(100, 999)}",
+            'github_url': f"https://github.com/{first_name.lower()}{last_name.lower()}{random.randint(10, 99)}",
+            'resume': None,
+        }
 
     @transaction.atomic
     def seed_students(self):
         """Create student users and profiles"""
-        self.stdout.write("\n[2/9] Creating student users and profiles...")
-        
-        student_count = 50
-        branch_distribution = {
-            'Computer Science Engineering': 15,
-            'Electronics and Communication Engineering': 10,
-            'Mechanical Engineering': 8,
-            'Electrical and Electronics Engineering': 7,
-            'Civil Engineering': 5,
-            'Chemical Engineering': 5
-        }
-        
-        used_names = set()
-        student_num = 0
-        
-        for branch, count in branch_distribution.items():
-            for i in range(count):
-                # Generate unique name
-                while True:
-                    first_name = random.choice(FIRST_NAMES)
-                    last_name = random.choice(LAST_NAMES)
-                    full_name = f"{first_name} {last_name}"
-                    if full_name not in used_names:
-                        used_names.add(full_name)
-                        break
-                
-                username = f"{first_name.lower()}.{last_name.lower()}"
-                email = f"{username}@student.edu"
-                
-                # Create user
-                user = User.objects.create(
-                    username=username,
-                    email=email,
-                    first_name=first_name,
-                    last_name=last_name,
-                    role='student'
-                )
-                user.set_password('student123')
-                user.save()
-                
-                # Generate CGPA based on distribution
-                rand = random.random()
-                if rand < 0.2:  # 20% between 9.0-10.0
-                    cgpa = round(random.uniform(9.0, 10.0), 2)
-                elif rand < 0.5:  # 30% between 8.0-8.99
-                    cgpa = round(random.uniform(8.0, 8.99), 2)
-                elif rand < 0.8:  # 30% between 7.0-7.99
-                    cgpa = round(random.uniform(7.0, 7.99), 2)
-                else:  # 20% between 6.0-6.99
-                    cgpa = round(random.uniform(6.0, 6.99), 2)
-                
-                # Backlogs distribution
-                rand = random.random()
-                if rand < 0.7:
-                    backlogs = 0
-                elif rand < 0.9:
-                    backlogs = 1
-                else:
-                    backlogs = 2
-                
-                # 30% placed
-                is_placed = student_num < (student_count * 0.3)
-                
-                # Random skills from branch pool
-                skills_pool = SKILLS_BY_BRANCH[branch]
-                num_skills = random.randint(5, 10)
-                skills = ', '.join(random.sample(skills_pool, min(num_skills, len(skills_pool))))
-                
-                phone_number = f"+91{random.choice(['9', '8', '7'])}{random.randint(100000000, 999999999)}"
-                linkedin_url = f"https://linkedin.com/in/{first_name.lower()}-{last_name.lower()}-{random.randint(100, 999)}"
-                github_url = f"https://github.com/{first_name.lower()}{last_name.lower()}{random.randint(10, 99)}"
-                
-                # Create profile
-                profile = StudentProfile.objects.create(
-                    user=user,
-                    phone_number=phone_number,
-                    cgpa=cgpa,
-                    branch=branch,
-                    graduation_year=2026,
-                    backlogs=backlogs,
-                    skills=skills,
-                    linkedin_url=linkedin_url,
-                    github_url=github_url,
-                    is_placed=is_placed
-                )
-                
-                # Generate and save resume
-                resume_buffer = self.generate_resume_pdf(profile)
-                resume_filename = f"{first_name.lower()}_{last_name.lower()}_resume.pdf"
-                profile.resume.save(resume_filename, ContentFile(resume_buffer.read()), save=True)
-                
+        self.start_step("[2/10] Creating student users and profiles")
+
+        branches = self.branch_plan()
+        name_counts = {}
+
+        for start in range(0, len(branches), STUDENT_CHUNK_SIZE):
+            rows = [
+                self.student_row(student_num, branch, name_counts)
+                for student_num, branch in enumerate(branches[start:start + STUDENT_CHUNK_SIZE], start)
+            ]
+            if self.with_files:
+                for row, resume in zip(rows, self.save_files(save_resume, rows)):
+                    row['resume'] = resume
+
+            self.create_users(rows, 'student')
+            StudentProfile.objects.bulk_create(
+                [
+                    StudentProfile(
+                        user_id=row['pk'],
+                        phone_number=row['phone_number'],
+                        resume=row['resume'],
+                        cgpa=row['cgpa'],
+                        branch=row['branch'],
+                        graduation_year=row['graduation_year'],
+                        backlogs=row['backlogs'],
+                        skills=row['skills'],
+                        linkedin_url=row['linkedin_url'],
+                        github_url=row['github_url'],
+                        is_placed=row['is_placed']
+                    )
+                    for row in rows
+                ],
+                batch_size=SEED_BATCH_SIZE,
+            )
+
+            for row in rows:
+                self.students.append((row['pk'], BRANCH_SHORT[row['branch']], row['cgpa'], row['backlogs'], row['is_placed']))
                 self.credentials['students'].append({
-                    'username': username,
-                    'email': email,
-                    'branch': BRANCH_SHORT[branch],
-                    'cgpa': cgpa,
-                    'placed': 'Yes' if is_placed else 'No'
+                    'username': row['username'],
+                    'email': row['email'],
+                    'branch': BRANCH_SHORT[row['branch']],
+                    'cgpa': row['cgpa'],
+                    'placed': 'Yes' if row['is_placed'] else 'No'
                 })
-                
-                student_num += 1
-                self.stats['users'] += 1
-                self.stats['students'] += 1
-        
-        self.stdout.write(self.style.SUCCESS(f'✓ Created {student_count} students with profiles and resumes'))
-
-    def generate_resume_pdf(self, student):
-        """Generate a simple resume PDF"""
-        buffer = BytesIO()
-        c = canvas.Canvas(buffer, pagesize=letter)
-        
-        # Header
-        c.setFont("Helvetica-Bold", 18)
-        c.drawString(1*inch, 10.5*inch, f"{student.user.get_full_name()}")
-        
-        # Contact Info
-        c.setFont("Helvetica", 10)
-        y = 10.2*inch
-        c.drawString(1*inch, y, f"Email: {student.user.email}")
-        y -= 0.2*inch
-        c.drawString(1*inch, y, f"Phone: {student.phone_number}")
-        y -= 0.2*inch
-        c.drawString(1*inch, y, f"LinkedIn: {student.linkedin_url}")
-        y -= 0.2*inch
-        c.drawString(1*inch, y, f"GitHub: {student.github_url}")
-        
-        # Education
-        y -= 0.4*inch
-        c.setFont("Helvetica-Bold", 12)
-        c.drawString(1*inch, y, "Education")
-        y -= 0.2*inch
-        c.setFont("Helvetica", 10)
-        c.drawString(1*inch, y, f"{student.branch}")
-        y -= 0.15*inch
-        c.drawString(1*inch, y, f"CGPA: {student.cgpa} | Graduation Year: {student.graduation_year}")
-        
-        # Skills
-        y -= 0.3*inch
-        c.setFont("Helvetica-Bold", 12)
-        c.drawString(1*inch, y, "Technical Skills")
-        y -= 0.2*inch
-        c.setFont("Helvetica", 10)
-        
-        # Word wrap skills
-        skills_text = student.skills
-        max_width = 80
-        words = skills_text.split(', ')
-        current_line = []
-        for word in words:
-            test_line = ', '.join(current_line + [word])
-            if len(test_line) <= max_width:
-                current_line.append(word)
-            else:
-                if current_line:
-                    c.drawString(1*inch, y, ', '.join(current_line))
-                    y -= 0.15*inch
-                current_line = [word]
-        if current_line:
-            c.drawString(1*inch, y, ', '.join(current_line))
-        
-        c.save()
-        buffer.seek(0)
-        return buffer
+            if len(branches) > STUDENT_CHUNK_SIZE:
+                self.stdout.write(f"  {len(self.students)}/{len(branches)} students")
+
+        self.stats['users'] += len(self.students)
+        self.stats['students'] += len(self.students)
+        resumes = ' and resumes' if self.with_files else ''
+        self.finish_step(f'Created {len(self.students)} students with profiles{resumes}')
+
+    def company_plan(self):
+        """The listed companies, plus generated ones at larger scales"""
+        companies = [dict(company) for company in COMPANIES]
+        for _ in range(self.scale // STUDENTS_PER_COMPANY - len(COMPANIES)):
+            name = fake.company()
+            tier = random.choice(['product', 'service', 'startup'])
+            companies.append({
+                'name': name,
+                'website': f"https://{re.sub(r'[^a-z0-9]', '', name.lower())}.com/careers",
+                'tier': tier,
+                'desc': f'{name} is a {tier} company. {fake.catch_phrase()}.',
+            })
+
+        usernames = set()
+        for idx, company in enumerate(companies):
+            username = re.sub(r'[^\w.@+-]+', '_', company['name'].lower()) + '_hr'
+            if username in usernames:
+                username = f"{username[:-len('_hr')]}_{idx}_hr"
+            usernames.add(username)
+            domain = re.sub(r'[^a-z0-9-]', '', company['name'].lower().split()[0])
+
+            # HR details
+            hr_first, hr_last = HR_NAMES[idx % len(HR_NAMES)]
+            company.update({
+                'username': username,
+                'email': f"hr@{domain}.com",
+                'first_name': company['name'],
+                'last_name': 'HR',
+                'hr_name': f"{hr_first} {hr_last}",
+                'hr_email': f"{hr_first.lower()}.{hr_last.lower()}@{domain}.com",
+                # 90% approved
+                'is_approved': random.random() < 0.9,
+                'color': random.choice(LOGO_COLORS),
+                'logo': None,
+            })
+        return companies
 
     @transaction.atomic
     def seed_companies(self):
         """Create company users and profiles"""
-        self.stdout.write("\n[3/9] Creating company users and profiles...")
-        
-        for idx, company_data in enumerate(COMPANIES):
-            username = company_data['name'].lower().replace(' ', '_') + '_hr'
-            email = f"hr@{company_data['name'].lower().split()[0]}.com"
-            
-            # Create user
-            user = User.objects.create(
-                username=username,
-                email=email,
-                first_name=company_data['name'],
-                last_name='HR',
-                role='company'
-            )
-            user.set_password('company123')
-            user.save()
-            
-            # HR details
-            hr_first, hr_last = HR_NAMES[idx % len(HR_NAMES)]
-            hr_name = f"{hr_first} {hr_last}"
-            hr_email = f"{hr_first.lower()}.{hr_last.lower()}@{company_data['name'].lower().split()[0]}.com"
-            
-            # 90% approved
-            is_approved = random.random() < 0.9
-            
-            # Create profile
-            profile = CompanyProfile.objects.create(
-                user=user,
-                name=company_data['name'],
-                description=company_data['desc'],
-                website=company_data['website'],
-                is_approved=is_approved,
-                hr_name=hr_name,
-                hr_email=hr_email
-            )
-            
-            # Generate and save logo
-            logo_buffer = self.generate_company_logo(company_data['name'])
-            logo_filename = f"{company_data['name'].lower().replace(' ', '_')}.png"
-            profile.logo.save(logo_filename, ContentFile(logo_buffer.read()), save=True)
-            
+        self.start_step("[3/10] Creating company users and profiles")
+
+        companies = self.company_plan()
+        if self.with_files:
+            for company, logo in zip(companies, self.save_files(save_logo, companies)):
+                company['logo'] = logo
+
+        self.create_users(companies, 'company')
+        CompanyProfile.objects.bulk_create(
+            [
+                CompanyProfile(
+                    user_id=company['pk'],
+                    name=company['name'],
+                    description=company['desc'],
+                    website=company['website'],
+                    logo=company['logo'],
+                    is_approved=company['is_approved'],
+                    hr_name=company['hr_name'],
+                    hr_email=company['hr_email']
+                )
+                for company in companies
+            ],
+            batch_size=SEED_BATCH_SIZE,
+        )
+
+        for company in companies:
             self.credentials['companies'].append({
-                'username': username,
-                'email': email,
-                'company': company_data['name'],
-                'approved': 'Yes' if is_approved else 'No'
+                'username': company['username'],
+                'email': company['email'],
+                'company': company['name'],
+                'approved': 'Yes' if company['is_approved'] else 'No'
             })
-            
-            self.stats['users'] += 1
-            self.stats['companies'] += 1
-        
-        self.stdout.write(self.style.SUCCESS(f'✓ Created {len(COMPANIES)} companies with profiles and logos'))
-
-    def generate_company_logo(self, company_name):
-        """Generate a simple logo with company initials"""
-        colors = ['#4285F4', '#EA4335', '#FBBC05', '#34A853', '#FF6D00', '#7B1FA2', 
-                  '#00ACC1', '#C0CA33', '#F4511E', '#8E24AA']
-        bg_color = random.choice(colors)
-        
-        img = Image.new('RGB', (200, 200), color=bg_color)
-        draw = ImageDraw.Draw(img)
-        
-        # Get initials
-        words = company_name.split()
-        initials = ''.join([w[0].upper() for w in words[:2]])
-        
-        # Draw initials
-        font_size = 80
-        try:
-            font = ImageFont.truetype("arial.ttf", font_size)
-        except:
-            try:
-                font = ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf", font_size)
-            except:
-                font = ImageFont.load_default()
-        
-        # Get text bounding box
-        bbox = draw.textbbox((0, 0), initials, font=font)
-        text_width = bbox[2] - bbox[0]
-        text_height = bbox[3] - bbox[1]
-        position = ((200 - text_width) // 2, (200 - text_height) // 2 - 10)
-        
-        draw.text(position, initials, fill='white', font=font)
-        
-        buffer = BytesIO()
-        img.save(buffer, format='PNG')
-        buffer.seek(0)
-        return buffer
+        self.companies = companies
+
+        self.stats['users'] += len(companies)
+        self.stats['companies'] += len(companies)
+        logos = ' and logos' if self.with_files else ''
+        self.finish_step(f'Created {len(companies)} companies with profiles{logos}')
 
     @transaction.atomic
     def seed_jobs(self):
         """Create job postings"""
-        self.stdout.write("\n[4/9] Creating job postings...")
-        
-        approved_companies = CompanyProfile.objects.filter(is_approved=True)
-        
-        for company in approved_companies:
+        self.start_step("[4/10] Creating job postings")
+
+        branches = self.get_branches()
+        jobs = []
+        job_branches = []
+
+        for company in self.companies:
+            if not company['is_approved']:
+                continue
+
             # 2-3 jobs per company
             num_jobs = random.randint(2, 3)
-            
+
             # Filter templates by company tier
-            tier_templates = [t for t in JOB_TEMPLATES if t['tier'] == company.user.username.split('_')[0] 
+            tier_templates = [t for t in JOB_TEMPLATES if t['tier'] == company['tier']
                              or random.random() < 0.3]  # 30% cross-tier
-            
+
             if not tier_templates:
                 tier_templates = JOB_TEMPLATES
-            
+
             for i in range(num_jobs):
                 template = random.choice(tier_templates)
-                
+
                 location = random.choice(template['locations'])
-                
+
                 # Deadline between 30-180 days from now
                 days_ahead = random.randint(30, 180)
                 deadline = date.today() + timedelta(days=days_ahead)
-                
+
                 # 80% approved
                 is_approved = random.random() < 0.8
-                
+
                 description = f"""We are looking for talented {template['title']} to join our team in {location}.
 
 Responsibilities:
@@ -661,9 +900,9 @@ Eligibility:
 - Maximum Backlogs: {template['max_backlogs']}
 - Branches: {template['allowed_branches']}
 """
-                
-                job = JobPosting.objects.create(
-                    company=company,
+
+                jobs.append(JobPosting(
+                    company_id=company['pk'],
                     title=template['title'],
                     description=description,
                     salary_range=template['salary_range'],
@@ -671,106 +910,145 @@ Eligibility:
                     application_deadline=deadline,
                     min_cgpa=template['min_cgpa'],
                     max_backlogs=template['max_backlogs'],
-                    allowed_branches=template['allowed_branches'],
                     is_approved=is_approved
+                ))
+                job_branches.append(template['allowed_branches'].split(','))
+
+        if connection.features.can_return_rows_from_bulk_insert:
+            JobPosting.objects.bulk_create(jobs, batch_size=SEED_BATCH_SIZE)
+        else:
+            for job in jobs:
+                job.save()
+        JobPostingBranch.objects.bulk_create(
+            [JobPostingBranch(job_id=job.pk, branch=branches[code]) for job, codes in zip(jobs, job_branches) for code in codes],
+            batch_size=SEED_BATCH_SIZE,
+        )
+
+        company_names = {company['pk']: company['name'] for company in self.companies}
+        self.jobs = [
+            {
+                'pk': job.pk,
+                'title': job.title,
+                'company_id': job.company_id,
+                'company': company_names[job.company_id],
+                'deadline': job.application_deadline,
+                'min_cgpa': job.min_cgpa,
+                'max_backlogs': job.max_backlogs,
+                'branches': set(codes),
+                'is_approved': job.is_approved,
+            }
+            for job, codes in zip(jobs, job_branches)
+        ]
+
+        self.stats['jobs'] += len(jobs)
+        self.finish_step(f'Created {self.stats["jobs"]} job postings')
+
+    def get_branches(self):
+        """Return the Branch rows keyed by short code, creating any that are missing"""
+        branches = {}
+        for name, code in BRANCH_SHORT.items():
+            branches[code], _ = Branch.objects.get_or_create(code=code, defaults={'name': name})
+        return branches
+
+    def eligible_job_lists(self):
+        """
+        Group the approved jobs by (branch code, backlogs) of the students they accept,
+        each group sorted by minimum CGPA, so a student's eligible jobs are a prefix of
+        their group. Applies the same rules as eligibility_q, without a query per student.
+        """
+        approved = [job for job in self.jobs if job['is_approved']]
+        groups = {}
+        for code in BRANCH_SHORT.values():
+            for backlogs in range(3):
+                jobs = sorted(
+                    (job for job in approved
+                     if job['max_backlogs'] >= backlogs and (not job['branches'] or code in job['branches'])),
+                    key=lambda job: job['min_cgpa'],
                 )
-                
-                self.stats['jobs'] += 1
-        
-        self.stdout.write(self.style.SUCCESS(f'✓ Created {self.stats["jobs"]} job postings'))
+                groups[(code, backlogs)] = (jobs, [job['min_cgpa'] for job in jobs])
+        return groups
 
     @transaction.atomic
     def seed_applications(self):
         """Create applications"""
-        self.stdout.write("\n[5/9] Creating applications...")
-        
-        students = StudentProfile.objects.all()
-        approved_jobs = JobPosting.objects.filter(is_approved=True)
-        
+        self.start_step("[5/10] Creating applications")
+
+        groups = self.eligible_job_lists()
         status_choices = ['Applied', 'Shortlisted', 'Rejected', 'Interview', 'Offered']
         status_weights = [0.4, 0.25, 0.2, 0.1, 0.05]
-        
-        for student in students:
-            # 8-10 applications per student
-            num_applications = random.randint(8, 10)
-            
-            # Find eligible jobs
-            eligible_jobs = []
-            for job in approved_jobs:
-                if self.is_student_eligible(student, job):
-                    eligible_jobs.append(job)
-            
-            if not eligible_jobs:
-                continue
-            
-            # Sample random jobs
-            jobs_to_apply = random.sample(eligible_jobs, min(num_applications, len(eligible_jobs)))
-            
-            has_offer = False
-            for job in jobs_to_apply:
-                # Select status
-                if student.is_placed and not has_offer and random.random() < 0.5:
-                    status = 'Offered'
-                    has_offer = True
-                else:
-                    status = random.choices(status_choices, weights=status_weights)[0]
-                
-                # Application date before deadline
-                days_before = random.randint(5, 60)
-                applied_date = job.application_deadline - timedelta(days=days_before)
-                
-                app = Application.objects.create(
-                    job=job,
-                    student=student,
-                    status=status
-                )
-                # Manually set applied_at
-                app.applied_at = datetime.combine(applied_date, datetime.min.time())
-                app.save()
-                
-                self.stats['applications'] += 1
-            
-            # Ensure placed students have at least one offer
-            if student.is_placed and not has_offer and jobs_to_apply:
-                app = Application.objects.filter(student=student).first()
-                if app:
-                    app.status = 'Offered'
-                    app.save()
-        
-        self.stdout.write(self.style.SUCCESS(f'✓ Created {self.stats["applications"]} applications'))
-
-    def is_student_eligible(self, student, job):
-        """Check if student is eligible for job"""
-        if student.cgpa < job.min_cgpa:
-            return False
-        if student.backlogs > job.max_backlogs:
-            return False
-        
-        allowed_branches = [b.strip() for b in job.allowed_branches.split(',')]
-        branch_short = BRANCH_SHORT.get(student.branch, '')
-        
-        if branch_short not in allowed_branches:
-            return False
-        
-        return True
+        sample_size = 20 * self.audit_factor
+
+        # applied_at is backdated to before each job's deadline
+        with keep_auto_now_add(Application, 'applied_at'):
+            for start in range(0, len(self.students), STUDENT_CHUNK_SIZE):
+                applications = []
+                for pk, code, cgpa, backlogs, is_placed in self.students[start:start + STUDENT_CHUNK_SIZE]:
+                    # 8-10 applications per student
+                    num_applications = random.randint(8, 10)
+
+                    # Find eligible jobs
+                    jobs, min_cgpas = groups[(code, backlogs)]
+                    eligible = bisect.bisect_right(min_cgpas, cgpa)
+                    if not eligible:
+                        continue
+
+                    # Sample random jobs
+                    picks = random.sample(range(eligible), min(num_applications, eligible))
+
+                    has_offer = False
+                    first_application = len(applications)
+                    for index in picks:
+                        job = jobs[index]
+                        # Select status
+                        if is_placed and not has_offer and random.random() < 0.5:
+                            status = 'Offered'
+                            has_offer = True
+                        else:
+                            status = random.choices(status_choices, weights=status_weights)[0]
+
+                        # Application date before deadline
+                        days_before = random.randint(5, 60)
+                        applied_date = job['deadline'] - timedelta(days=days_before)
+
+                        applications.append(Application(
+                            job_id=job['pk'],
+                            student_id=pk,
+                            status=status,
+                            applied_at=timezone.make_aware(datetime.combine(applied_date, datetime.min.time()))
+                        ))
+                        if len(self.application_samples) < sample_size:
+                            self.application_samples.append((pk, job['title'], job['company']))
+
+                    # Ensure placed students have at least one offer
+                    if is_placed and not has_offer:
+                        applications[first_application].status = 'Offered'
+
+                Application.objects.bulk_create(applications, batch_size=SEED_BATCH_SIZE)
+                self.stats['applications'] += len(applications)
+                if len(self.students) > STUDENT_CHUNK_SIZE:
+                    self.stdout.write(f"  {self.stats['applications']} applications")
+
+        self.finish_step(f'Created {self.stats["applications"]} applications')
 
     @transaction.atomic
     def seed_interviews(self):
         """Create interview schedules"""
-        self.stdout.write("\n[6/9] Creating interview schedules...")
-        
-        eligible_apps = Application.objects.filter(status__in=['Shortlisted', 'Interview'])
-        
+        self.start_step("[6/10] Creating interview schedules")
+
+        eligible_apps = Application.objects.filter(status__in=['Shortlisted', 'Interview']).order_by('pk').values_list(
+            'pk', 'applied_at', 'job__application_deadline'
+        )
+
         round_names = ['Technical Round 1', 'Technical Round 2', 'HR Round', 'Managerial Round']
         modes = ['Online', 'In-Person']
         time_slots = [time(9, 0), time(10, 0), time(11, 0), time(14, 0), time(15, 0), time(16, 0), time(17, 0)]
-        
+
         online_links = [
             'https://meet.google.com/abc-defg-hij',
             'https://zoom.us/j/123456789',
             'https://teams.microsoft.com/l/meetup-join/xyz'
         ]
-        
+
         venues = [
             'Google Office, Block A, 4th Floor, RMZ Infinity, Bangalore',
             'Microsoft Building, Gachibowli, Hyderabad',
@@ -778,7 +1056,7 @@ Eligibility:
             'Office Campus, Whitefield, Bangalore',
             'Tech Park, HITEC City, Hyderabad'
         ]
-        
+
         instructions = [
             'Please join 5 minutes before the scheduled time.',
             'Bring your resume, ID card, and all academic certificates.',
@@ -786,136 +1064,121 @@ Eligibility:
             'Prepare for coding questions on data structures and algorithms.',
             'Be ready to discuss your projects and technical skills.'
         ]
-        
-        for app in eligible_apps:
+
+        interviews = []
+        for app_id, applied_at, deadline in eligible_apps.iterator(chunk_size=SEED_BATCH_SIZE * 10):
             # 1-2 rounds per application
             num_rounds = random.randint(1, 2)
-            
+
             for i in range(num_rounds):
                 # Interview date between application and deadline
                 days_after = random.randint(7, 30)
-                interview_date = app.applied_at.date() + timedelta(days=days_after)
-                
-                if interview_date >= app.job.application_deadline:
-                    interview_date = app.job.application_deadline - timedelta(days=random.randint(1, 5))
-                
+                interview_date = applied_at.date() + timedelta(days=days_after)
+
+                if interview_date >= deadline:
+                    interview_date = deadline - timedelta(days=random.randint(1, 5))
+
                 mode = random.choices(modes, weights=[0.7, 0.3])[0]
                 venue_or_link = random.choice(online_links) if mode == 'Online' else random.choice(venues)
-                
-                InterviewSchedule.objects.create(
-                    application=app,
+
+                interviews.append(InterviewSchedule(
+                    application_id=app_id,
                     interview_date=interview_date,
                     interview_time=random.choice(time_slots),
                     round_name=random.choice(round_names),
                     mode=mode,
                     venue_or_link=venue_or_link,
                     additional_instructions=random.choice(instructions)
-                )
-                
-                self.stats['interviews'] += 1
-        
-        self.stdout.write(self.style.SUCCESS(f'✓ Created {self.stats["interviews"]} interview schedules'))
+                ))
+
+            if len(interviews) >= SEED_BATCH_SIZE * 10:
+                InterviewSchedule.objects.bulk_create(interviews, batch_size=SEED_BATCH_SIZE)
+                self.stats['interviews'] += len(interviews)
+                interviews = []
+
+        InterviewSchedule.objects.bulk_create(interviews, batch_size=SEED_BATCH_SIZE)
+        self.stats['interviews'] += len(interviews)
+        self.finish_step(f'Created {self.stats["interviews"]} interview schedules')
 
     @transaction.atomic
     def seed_documents(self):
         """Create admin documents"""
-        self.stdout.write("\n[7/9] Creating documents...")
-        
-        docs = [
-            ('Resume Template for Students', 'Use this template to create your professional resume.'),
-            ('Placement Guidelines 2025-26', 'Important guidelines for the placement process.'),
-            ('Interview Preparation Guide', 'Tips and tricks to ace your interviews.'),
-            ('Company Research Checklist', 'How to research companies before applying.'),
-            ('Sample Cover Letter Template', 'Template for writing effective cover letters.'),
-            ('FAQs for Placement Process', 'Frequently asked questions answered.'),
-            ('Dress Code for Interviews', 'Professional attire guidelines.')
-        ]
-        
-        for title, content in docs:
-            doc_buffer = self.generate_document_pdf(title, content)
-            filename = f"{title.lower().replace(' ', '_')}.pdf"
-            
-            doc = Document.objects.create(title=title)
-            doc.file.save(filename, ContentFile(doc_buffer.read()), save=True)
-            
-            self.stats['documents'] += 1
-        
-        self.stdout.write(self.style.SUCCESS(f'✓ Created {self.stats["documents"]} documents'))
-
-    def generate_document_pdf(self, title, content):
-        """Generate a simple PDF document"""
-        buffer = BytesIO()
-        c = canvas.Canvas(buffer, pagesize=letter)
-        
-        c.setFont("Helvetica-Bold", 16)
-        c.drawString(1*inch, 10.5*inch, title)
-        
-        c.setFont("Helvetica", 11)
-        y_position = 10*inch
-        for line in content.split('\n'):
-            c.drawString(1*inch, y_position, line[:80])
-            y_position -= 0.2*inch
-        
-        c.save()
-        buffer.seek(0)
-        return buffer
+        self.start_step("[7/10] Creating documents")
+
+        if not self.with_files:
+            self.finish_step('Skipped documents (--no-files)')
+            return
+
+        Document.objects.bulk_create([
+            Document(
+                title=title,
+                file=default_storage.save(
+                    f"documents/{title.lower().replace(' ', '_')}.pdf",
+                    ContentFile(render_document_pdf(title, content))
+                )
+            )
+            for title, content in DOCUMENTS
+        ])
+
+        self.stats['documents'] += len(DOCUMENTS)
+        self.finish_step(f'Created {self.stats["documents"]} documents')
 
     @transaction.atomic
     def seed_audit_logs(self):
         """Create audit logs"""
-        self.stdout.write("\n[8/9] Creating audit logs...")
-        
+        self.start_step("[8/10] Creating audit logs")
+
+        logs = []
+
         # Log student registrations
-        for student_cred in self.credentials['students'][:10]:  # Sample
-            user = User.objects.filter(username=student_cred['username']).first()
-            if user:
-                AuditLog.objects.create(
-                    user=user,
-                    action=f"Student {student_cred['username']} registered"
-                )
-                self.stats['audit_logs'] += 1
-        
+        for (pk, *_), student_cred in list(zip(self.students, self.credentials['students']))[:10 * self.audit_factor]:  # Sample
+            logs.append(AuditLog(user_id=pk, action=f"Student {student_cred['username']} registered"))
+
         # Log company registrations
-        for company_cred in self.credentials['companies'][:5]:  # Sample
-            user = User.objects.filter(username=company_cred['username']).first()
-            if user:
-                AuditLog.objects.create(
-                    user=user,
-                    action=f"Company {company_cred['company']} registered"
-                )
-                self.stats['audit_logs'] += 1
-        
+        for company in self.companies[:5 * self.audit_factor]:  # Sample
+            logs.append(AuditLog(user_id=company['pk'], action=f"Company {company['name']} registered"))
+
         # Log job postings
-        jobs = JobPosting.objects.all()[:10]
-        for job in jobs:
-            AuditLog.objects.create(
-                user=job.company.user,
-                action=f"Posted job: {job.title}"
-            )
-            self.stats['audit_logs'] += 1
-        
+        for job in self.jobs[:10 * self.audit_factor]:
+            logs.append(AuditLog(user_id=job['company_id'], action=f"Posted job: {job['title']}"))
+
         # Log some applications
-        apps = Application.objects.all()[:20]
-        for app in apps:
-            AuditLog.objects.create(
-                user=app.student.user,
-                action=f"Applied for {app.job.title} at {app.job.company.name}"
-            )
-            self.stats['audit_logs'] += 1
-        
-        self.stdout.write(self.style.SUCCESS(f'✓ Created {self.stats["audit_logs"]} audit logs'))
+        for student_id, title, company_name in self.application_samples:
+            logs.append(AuditLog(user_id=student_id, action=f"Applied for {title} at {company_name}"))
+
+        AuditLog.objects.bulk_create(logs, batch_size=SEED_BATCH_SIZE)
+        self.stats['audit_logs'] += len(logs)
+        self.finish_step(f'Created {self.stats["audit_logs"]} audit logs')
+
+    def build_eligibility_index(self):
+        """
+        bulk_create skips the signals that keep StudentJobEligibility, StudentSkill and
+        the application counters current, so rebuild them once
+        """
+        self.start_step("[9/10] Building the eligibility and skill indexes and the application counters")
+        self.stats['eligibility'] = rebuild_index()
+        self.stats['skills'] = rebuild_skill_index()
+        counted_jobs, _ = recount_application_counters()
+        self.finish_step(
+            f'Indexed {self.stats["eligibility"]} eligible student/job pairs and {self.stats["skills"]} student skills, '
+            f'counted the applications of {counted_jobs} jobs'
+        )
 
     def generate_credentials_file(self):
         """Generate credentials.md file"""
-        self.stdout.write("\n[9/9] Generating credentials file...")
-        
+        self.start_step("[10/10] Generating credentials file")
+
+        if not self.with_files:
+            self.finish_step('Skipped credentials.md (--no-files)')
+            return
+
         filepath = 'credentials.md'
-        
+
         with open(filepath, 'w', encoding='utf-8') as f:
             f.write(f"# Placement Management System - Login Credentials\n\n")
             f.write(f"**Generated on:** {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n")
             f.write("---\n\n")
-            
+
             # Admin credentials
             f.write("## Admin Accounts\n\n")
             for admin in self.credentials['admins']:
@@ -924,32 +1187,38 @@ Eligibility:
                 f.write(f"- **Password:** {admin['password']}\n")
                 f.write(f"- **Email:** {admin['email']}\n")
                 f.write(f"- **Name:** {admin['name']}\n\n")
-            
+
             # Student credentials
-            f.write("## Student Accounts (50 total)\n\n")
+            students = self.credentials['students']
+            f.write(f"## Student Accounts ({len(students)} total)\n\n")
             f.write("| Username | Email | Branch | CGPA | Placed |\n")
             f.write("|----------|-------|--------|------|--------|\n")
-            for student in self.credentials['students']:
+            for student in students[:CREDENTIALS_LISTED]:
                 f.write(f"| {student['username']} | {student['email']} | {student['branch']} | {student['cgpa']} | {student['placed']} |\n")
-            
+            if len(students) > CREDENTIALS_LISTED:
+                f.write(f"\n...and {len(students) - CREDENTIALS_LISTED} more.\n")
+
             f.write("\n**Note:** All students use password: `student123`\n\n")
-            
+
             # Company credentials
-            f.write("## Company Accounts (20 total)\n\n")
+            companies = self.credentials['companies']
+            f.write(f"## Company Accounts ({len(companies)} total)\n\n")
             f.write("| Username | Email | Company Name | Approved |\n")
             f.write("|----------|-------|--------------|----------|\n")
-            for company in self.credentials['companies']:
+            for company in companies[:CREDENTIALS_LISTED]:
                 f.write(f"| {company['username']} | {company['email']} | {company['company']} | {company['approved']} |\n")
-            
+            if len(companies) > CREDENTIALS_LISTED:
+                f.write(f"\n...and {len(companies) - CREDENTIALS_LISTED} more.\n")
+
             f.write("\n**Note:** All companies use password: `company123`\n\n")
-            
+
             # Quick links
             f.write("---\n\n")
             f.write("## Quick Login Links\n\n")
             f.write("- **Admin Panel:** http://localhost:8000/admin/\n")
             f.write("- **Student Login:** http://localhost:8000/login/\n")
             f.write("- **Company Login:** http://localhost:8000/login/\n\n")
-            
+
             # Statistics
             f.write("---\n\n")
             f.write("## Database Statistics\n\n")
@@ -961,44 +1230,44 @@ Eligibility:
             f.write(f"- **Interview Schedules:** {self.stats['interviews']}\n")
             f.write(f"- **Documents:** {self.stats['documents']}\n")
             f.write(f"- **Audit Logs:** {self.stats['audit_logs']}\n\n")
-            
+
             # Test scenarios
             f.write("---\n\n")
             f.write("## Test Scenarios\n\n")
-            
+
             placed_student = next((s for s in self.credentials['students'] if s['placed'] == 'Yes'), None)
             if placed_student:
                 f.write(f"### Scenario 1: Student with Placement\n")
                 f.write(f"- Login as: `{placed_student['username']}` / `student123`\n")
                 f.write(f"- Has: Complete profile, multiple applications, placed status\n\n")
-            
+
             high_cgpa = next((s for s in self.credentials['students'] if s['cgpa'] >= 9.0), None)
             if high_cgpa:
                 f.write(f"### Scenario 2: High CGPA Student\n")
                 f.write(f"- Login as: `{high_cgpa['username']}` / `student123`\n")
                 f.write(f"- Has: CGPA {high_cgpa['cgpa']}, excellent profile\n\n")
-            
+
             approved_company = next((c for c in self.credentials['companies'] if c['approved'] == 'Yes'), None)
             if approved_company:
                 f.write(f"### Scenario 3: Company with Active Jobs\n")
                 f.write(f"- Login as: `{approved_company['username']}` / `company123`\n")
                 f.write(f"- Has: Approved status, job postings, applicants\n\n")
-            
+
             f.write("### Scenario 4: Admin Testing\n")
             f.write("- Login as: `admin` / `admin123`\n")
             f.write("- Action: Approve pending companies and jobs\n\n")
-            
+
             f.write("---\n\n")
             f.write("*This file is auto-generated. Do not edit manually.*\n")
-        
-        self.stdout.write(self.style.SUCCESS(f'✓ Generated credentials.md'))
+
+        self.finish_step('Generated credentials.md')
 
     def print_summary(self):
         """Print seeding summary"""
         self.stdout.write("\n" + "=" * 50)
         self.stdout.write(self.style.SUCCESS("SEEDING COMPLETED SUCCESSFULLY!"))
         self.stdout.write("=" * 50)
-        
+
         self.stdout.write("\nStatistics:")
         self.stdout.write("-" * 50)
         self.stdout.write(f"Users: {self.stats['users']} (2 admins, {self.stats['students']} students, {self.stats['companies']} companies)")
@@ -1007,14 +1276,17 @@ Eligibility:
         self.stdout.write(f"Interview Schedules: {self.stats['interviews']}")
         self.stdout.write(f"Documents: {self.stats['documents']}")
         self.stdout.write(f"Audit Logs: {self.stats['audit_logs']}")
-        
-        self.stdout.write("\nFiles Generated:")
-        self.stdout.write("-" * 50)
-        self.stdout.write(f"- Resumes: {self.stats['students']} PDFs in media/resumes/")
-        self.stdout.write(f"- Logos: {self.stats['companies']} PNGs in media/company_logos/")
-        self.stdout.write(f"- Documents: {self.stats['documents']} PDFs in media/documents/")
-        self.stdout.write("- Credentials: credentials.md")
-        
+        self.stdout.write(f"Eligibility Index: {self.stats['eligibility']}")
+        self.stdout.write(f"Student Skills: {self.stats['skills']}")
+
+        if self.with_files:
+            self.stdout.write("\nFiles Generated:")
+            self.stdout.write("-" * 50)
+            self.stdout.write(f"- Resumes: {self.stats['students']} PDFs in media/resumes/")
+            self.stdout.write(f"- Logos: {self.stats['companies']} PNGs in media/company_logos/")
+            self.stdout.write(f"- Documents: {self.stats['documents']} PDFs in media/documents/")
+            self.stdout.write("- Credentials: credentials.md")
+
         self.stdout.write("\nNext Steps:")
         self.stdout.write("-" * 50)
         self.stdout.write("1. Review credentials.md for login details")
@@ -1022,7 +1294,7 @@ Eligibility:
         self.stdout.write("3. Login as admin: admin / admin123")
         self.stdout.write("4. Test student flow: [see credentials.md]")
         self.stdout.write("5. Test company flow: [see credentials.md]")
-        
+
         self.stdout.write("\n" + "=" * 50)
         self.stdout.write("Happy Testing!")
         self.stdout.write("=" * 50 + "\n")
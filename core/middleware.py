@@ -0,0 +1,70 @@
+# core/middleware.py
+
+import json
+import logging
+import random
+from contextlib import ExitStack
+from time import perf_counter
+
+from django.conf import settings
+from django.db import connections
+
+from . import perf
+
+logger = logging.getLogger('core.perf')
+
+
+def _response_size(response):
+    if response.streaming:
+        # Streamed bodies are only known up front when the length is declared (FileResponse)
+        length = response.get('Content-Length')
+        return int(length) if length else None
+    return len(response.content)
+
+
+class PerfMiddleware:
+    """
+    Measures a sample of requests (PERF_SAMPLE_RATE): wall time, database time, query
+    count, repeated query fingerprints and response size. Each measured request is
+    logged as one JSON line on the `core.perf` logger and added to the per-endpoint
+    ring buffers shown on /tpo/perf/.
+
+    This is a synchronous middleware on purpose: under ASGI, Django runs it in the
+    same thread as the (synchronous) views, which is where the query hooks must sit.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        rate = getattr(settings, 'PERF_SAMPLE_RATE', 1.0)
+        if rate <= 0 or (rate < 1 and random.random() >= rate):
+            return self.get_response(request)
+
+        recorder = perf.QueryRecorder()
+        started = perf_counter()
+        with ExitStack() as hooks:
+            for connection in connections.all():
+                hooks.enter_context(connection.execute_wrapper(recorder))
+            response = self.get_response(request)
+        wall_ms = (perf_counter() - started) * 1000
+
+        match = request.resolver_match
+        view_name = match.view_name if match else '<unresolved>'
+        db_ms = recorder.time * 1000
+        size = _response_size(response)
+        perf.record(view_name, wall_ms, db_ms, recorder.count, size)
+
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(json.dumps({
+                'view': view_name,
+                'method': request.method,
+                'path': request.path,
+                'status': response.status_code,
+                'wall_ms': round(wall_ms, 2),
+                'db_ms': round(db_ms, 2),
+                'queries': recorder.count,
+                'duplicate_queries': recorder.duplicates(),
+                'response_bytes': size,
+            }))
+        return response
@@ -0,0 +1,52 @@
+# Generated by Django 5.2.3 on 2026-10-18 08:26
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0006_interviewschedule_additional_instructions'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Branch',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('code', models.CharField(max_length=20, unique=True)),
+                ('name', models.CharField(max_length=100, unique=True)),
+            ],
+            options={
+                'verbose_name_plural': 'branches',
+                'ordering': ['code'],
+            },
+        ),
+        migrations.AlterField(
+            model_name='studentprofile',
+            name='branch',
+            field=models.CharField(db_index=True, max_length=100),
+        ),
+        migrations.CreateModel(
+            name='JobPostingBranch',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('branch', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='core.branch')),
+                ('job', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='core.jobposting')),
+            ],
+        ),
+        migrations.AddField(
+            model_name='jobposting',
+            name='branches',
+            field=models.ManyToManyField(blank=True, help_text='Branches allowed to apply. Leave empty to allow all branches.', related_name='jobs', through='core.JobPostingBranch', to='core.branch'),
+        ),
+        migrations.AddIndex(
+            model_name='jobpostingbranch',
+            index=models.Index(fields=['branch', 'job'], name='core_jobbranch_branch_job_idx'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='jobpostingbranch',
+            unique_together={('job', 'branch')},
+        ),
+    ]
@@ -0,0 +1,91 @@
+# Converts the comma-separated JobPosting.allowed_branches strings into JobPostingBranch rows.
+
+from django.db import migrations
+
+DEFAULT_BRANCHES = [
+    ('CSE', 'Computer Science Engineering'),
+    ('ECE', 'Electronics and Communication Engineering'),
+    ('ME', 'Mechanical Engineering'),
+    ('EEE', 'Electrical and Electronics Engineering'),
+    ('Civil', 'Civil Engineering'),
+    ('Chemical', 'Chemical Engineering'),
+]
+
+
+def unique_code(token, taken):
+    """
+    The token cut to the 20 characters of Branch.code, with a -2, -3... suffix when a
+    branch already has that code or name (long tokens can share their first 20 characters).
+    """
+    code = token[:20]
+    suffix = 1
+    while code.lower() in taken:
+        suffix += 1
+        tag = f'-{suffix}'
+        code = token[:20 - len(tag)] + tag
+    return code
+
+
+def populate_branches(apps, schema_editor):
+    Branch = apps.get_model('core', 'Branch')
+    JobPosting = apps.get_model('core', 'JobPosting')
+    JobPostingBranch = apps.get_model('core', 'JobPostingBranch')
+
+    for code, name in DEFAULT_BRANCHES:
+        Branch.objects.get_or_create(code=code, defaults={'name': name})
+
+    # Tokens are matched case-insensitively on either the code or the full name
+    lookup = {}
+    for branch in Branch.objects.all():
+        lookup[branch.code.lower()] = branch
+        lookup[branch.name.lower()] = branch
+
+    links = []
+    for job in JobPosting.objects.exclude(allowed_branches='').only('id', 'allowed_branches'):
+        seen = set()
+        for token in job.allowed_branches.split(','):
+            token = token.strip()
+            if not token:
+                continue
+            # A token longer than Branch.name was stored cut to its first 100 characters
+            branch = lookup.get(token.lower()) or lookup.get(token[:100].lower())
+            if branch is None:
+                branch = Branch.objects.create(code=unique_code(token, lookup), name=token[:100])
+                lookup[branch.code.lower()] = branch
+                lookup[branch.name.lower()] = branch
+            if branch.pk not in seen:
+                seen.add(branch.pk)
+                links.append(JobPostingBranch(job_id=job.pk, branch_id=branch.pk))
+
+    JobPostingBranch.objects.bulk_create(links, batch_size=1000)
+
+
+def restore_allowed_branches(apps, schema_editor):
+    """
+    Rebuilds the strings in their original order, since the links were created in token
+    order. This is lossy: each branch comes back once, by its code, without the spacing.
+    """
+    JobPosting = apps.get_model('core', 'JobPosting')
+    JobPostingBranch = apps.get_model('core', 'JobPostingBranch')
+
+    codes = {}
+    for job_id, code in JobPostingBranch.objects.order_by('pk').values_list('job_id', 'branch__code'):
+        codes.setdefault(job_id, []).append(code)
+
+    jobs = list(JobPosting.objects.filter(pk__in=codes).only('id'))
+    for job in jobs:
+        job.allowed_branches = ','.join(codes[job.pk])
+    JobPosting.objects.bulk_update(jobs, ['allowed_branches'], batch_size=1000)
+    # So that applying the migration again does not link the branches twice
+    JobPostingBranch.objects.all().delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0007_branch_jobpostingbranch_jobposting_branches'),
+    ]
+
+    operations = [
+        migrations.RunPython(populate_branches, restore_allowed_branches),
+    ]
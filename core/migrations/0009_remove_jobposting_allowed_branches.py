@@ -0,0 +1,23 @@
+# Generated by Django 5.2.3 on 2026-10-18 08:26
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0008_populate_jobposting_branches'),
+    ]
+
+    operations = [
+        # A default lets the column be re-added to existing rows when unapplying
+        migrations.AlterField(
+            model_name='jobposting',
+            name='allowed_branches',
+            field=models.CharField(blank=True, default='', max_length=255),
+        ),
+        migrations.RemoveField(
+            model_name='jobposting',
+            name='allowed_branches',
+        ),
+    ]
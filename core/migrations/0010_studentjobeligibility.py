@@ -0,0 +1,26 @@
+# Generated by Django 5.2.3 on 2026-10-18 08:28
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0009_remove_jobposting_allowed_branches'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StudentJobEligibility',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('job', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='student_eligibilities', to='core.jobposting')),
+                ('student', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='job_eligibilities', to='core.studentprofile')),
+            ],
+            options={
+                'verbose_name_plural': 'student job eligibilities',
+                'unique_together': {('student', 'job')},
+            },
+        ),
+    ]
@@ -0,0 +1,38 @@
+# Builds the initial StudentJobEligibility rows for all open, approved jobs.
+
+import datetime
+
+from django.db import migrations
+from django.db.models.functions import Lower, Trim
+
+
+def populate_eligibility(apps, schema_editor):
+    StudentProfile = apps.get_model('core', 'StudentProfile')
+    JobPosting = apps.get_model('core', 'JobPosting')
+    StudentJobEligibility = apps.get_model('core', 'StudentJobEligibility')
+
+    open_jobs = JobPosting.objects.filter(is_approved=True, application_deadline__gte=datetime.date.today())
+    for job in open_jobs.prefetch_related('branches'):
+        students = StudentProfile.objects.filter(cgpa__gte=job.min_cgpa, backlogs__lte=job.max_backlogs)
+        branches = list(job.branches.all())
+        if branches:
+            names = [branch.name for branch in branches] + [branch.code for branch in branches]
+            # Lower-cased and trimmed, as core.eligibility.eligible_students() matches it
+            students = students.alias(normalized_branch=Lower(Trim('branch'))).filter(
+                normalized_branch__in=[name.lower() for name in names]
+            )
+        StudentJobEligibility.objects.bulk_create(
+            [StudentJobEligibility(student_id=pk, job_id=job.pk) for pk in students.values_list('pk', flat=True)],
+            batch_size=1000,
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0010_studentjobeligibility'),
+    ]
+
+    operations = [
+        migrations.RunPython(populate_eligibility, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,45 @@
+# Generated by Django 5.2.3 on 2026-10-18 08:29
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0011_populate_studentjobeligibility'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='application',
+            index=models.Index(fields=['job', 'status'], name='core_app_job_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='application',
+            index=models.Index(fields=['student', 'status'], name='core_app_student_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='application',
+            index=models.Index(fields=['applied_at'], name='core_app_applied_at_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='auditlog',
+            index=models.Index(fields=['timestamp'], name='core_auditlog_timestamp_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='interviewschedule',
+            index=models.Index(fields=['interview_date', 'interview_time'], name='core_interview_date_time_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='jobposting',
+            index=models.Index(fields=['application_deadline', 'is_approved'], name='core_job_deadline_approved_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='jobposting',
+            index=models.Index(condition=models.Q(('is_approved', False)), fields=['-posted_at'], name='core_job_pending_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='jobposting',
+            index=models.Index(fields=['company', 'posted_at'], name='core_job_company_posted_idx'),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.3 on 2026-10-18 09:43
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0014_importjob_exportjob'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='application',
+            index=models.Index(fields=['job', 'applied_at'], name='core_app_job_applied_idx'),
+        ),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 5.2.3 on 2026-10-18 09:47
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0015_application_job_applied_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Skill',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100, unique=True)),
+                ('label', models.CharField(max_length=100)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='StudentSkill',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('skill', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='student_links', to='core.skill')),
+                ('student', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='skill_links', to='core.studentprofile')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['skill', 'student'], name='core_studentskill_skill_idx')],
+                'unique_together': {('student', 'skill')},
+            },
+        ),
+    ]
@@ -0,0 +1,74 @@
+# Creates the FTS5 skill index (on SQLite builds with FTS5) and fills Skill,
+# StudentSkill and the index from the existing StudentProfile.skills text.
+
+import re
+
+from django.db import migrations, DatabaseError
+
+FTS_TABLE = 'core_student_skill_fts'
+
+
+def create_fts_table(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    try:
+        # Only document membership is needed (AND queries), so no positions are stored
+        schema_editor.execute(
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5(skills, detail='none', columnsize=0)"
+        )
+    except DatabaseError:
+        # SQLite built without FTS5; searches use StudentSkill instead
+        pass
+
+
+def drop_fts_table(apps, schema_editor):
+    if schema_editor.connection.vendor == 'sqlite':
+        schema_editor.execute(f'DROP TABLE IF EXISTS {FTS_TABLE}')
+
+
+def populate_skills(apps, schema_editor):
+    StudentProfile = apps.get_model('core', 'StudentProfile')
+    Skill = apps.get_model('core', 'Skill')
+    StudentSkill = apps.get_model('core', 'StudentSkill')
+
+    parsed = {}
+    labels = {}
+    for pk, text in StudentProfile.objects.values_list('pk', 'skills').iterator(chunk_size=2000):
+        skills = {}
+        for label in re.split(r'[,;\n]', text or ''):
+            label = ' '.join(label.split())[:100]
+            if label:
+                skills.setdefault(label.lower(), label)
+        parsed[pk] = skills
+        for key, label in skills.items():
+            labels.setdefault(key, label)
+
+    Skill.objects.bulk_create([Skill(name=key, label=label) for key, label in labels.items()], batch_size=1000)
+    ids = dict(Skill.objects.values_list('name', 'pk'))
+    StudentSkill.objects.bulk_create(
+        [StudentSkill(student_id=pk, skill_id=ids[key]) for pk, skills in parsed.items() for key in skills],
+        batch_size=2000,
+    )
+
+    connection = schema_editor.connection
+    if connection.vendor == 'sqlite' and FTS_TABLE in connection.introspection.table_names():
+        with connection.cursor() as cursor:
+            cursor.executemany(
+                f'INSERT INTO {FTS_TABLE} (rowid, skills) VALUES (%s, %s)',
+                [
+                    (pk, ' '.join(f's{skill_id}' for skill_id in sorted(ids[key] for key in skills)))
+                    for pk, skills in parsed.items() if skills
+                ],
+            )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0016_skill_studentskill'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_fts_table, drop_fts_table),
+        migrations.RunPython(populate_skills, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 5.2.3 on 2026-10-18 09:56
+
+import core.models
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0017_populate_skills'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='JobSearchEntry',
+            fields=[
+                ('job', models.OneToOneField(db_column='rowid', on_delete=django.db.models.deletion.DO_NOTHING, primary_key=True, related_name='search_entry', serialize=False, to='core.jobposting')),
+                ('document', core.models.SearchDocumentField(db_column='core_job_fts')),
+                ('rank', models.FloatField()),
+            ],
+            options={
+                'db_table': 'core_job_fts',
+                'managed': False,
+            },
+        ),
+    ]
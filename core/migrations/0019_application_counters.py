@@ -0,0 +1,114 @@
+# Generated by Django 5.2.3 on 2026-10-18 10:12
+
+from django.db import migrations, models
+from django.db.models import Count
+
+COUNTERS = {
+    'Applied': 'applied_count',
+    'Shortlisted': 'shortlisted_count',
+    'Rejected': 'rejected_count',
+    'Interview': 'interview_count',
+    'Offered': 'offered_count',
+}
+
+
+def count_applications(apps, schema_editor):
+    """Fills the new counters of every job and company from the existing applications."""
+    Application = apps.get_model('core', 'Application')
+    JobPosting = apps.get_model('core', 'JobPosting')
+    CompanyProfile = apps.get_model('core', 'CompanyProfile')
+    fields = ['applicant_count', *COUNTERS.values()]
+
+    counts = {}
+    for job_id, status, n in Application.objects.order_by().values_list('job_id', 'status').annotate(n=Count('pk')):
+        job = counts.setdefault(job_id, dict.fromkeys(fields, 0))
+        job['applicant_count'] += n
+        if status in COUNTERS:
+            job[COUNTERS[status]] += n
+
+    companies = {}
+    jobs = [job for job in JobPosting.objects.only('pk', 'company_id') if job.pk in counts]
+    for job in jobs:
+        company = companies.setdefault(job.company_id, dict.fromkeys(fields, 0))
+        for field, n in counts[job.pk].items():
+            setattr(job, field, n)
+            company[field] += n
+    JobPosting.objects.bulk_update(jobs, fields, batch_size=500)
+
+    profiles = [profile for profile in CompanyProfile.objects.only('pk') if profile.pk in companies]
+    for profile in profiles:
+        for field, n in companies[profile.pk].items():
+            setattr(profile, field, n)
+    CompanyProfile.objects.bulk_update(profiles, fields, batch_size=500)
+
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0018_jobsearchentry'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='companyprofile',
+            name='applicant_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='companyprofile',
+            name='applied_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='companyprofile',
+            name='interview_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='companyprofile',
+            name='offered_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='companyprofile',
+            name='rejected_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='companyprofile',
+            name='shortlisted_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='jobposting',
+            name='applicant_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='jobposting',
+            name='applied_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='jobposting',
+            name='interview_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='jobposting',
+            name='offered_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='jobposting',
+            name='rejected_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='jobposting',
+            name='shortlisted_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(count_applications, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,79 @@
+# Creates the FTS5 job search index (on SQLite builds with FTS5), the triggers that
+# keep it current, and fills it from the existing jobs. Databases where the index was
+# created outside migrations already have it; it is then only refilled.
+
+from django.db import migrations, DatabaseError
+
+JOB_FTS_TABLE = 'core_job_fts'
+
+# bm25 weights of the indexed columns: title, description, location, company name
+RANK_WEIGHTS = (10.0, 1.0, 2.0, 5.0)
+
+# The triggers keep the index current for every write, including bulk_create and raw SQL
+JOB_TRIGGERS = {
+    'core_job_fts_insert': f"""
+        CREATE TRIGGER IF NOT EXISTS core_job_fts_insert AFTER INSERT ON core_jobposting BEGIN
+            INSERT INTO {JOB_FTS_TABLE} (rowid, title, description, location, company)
+            SELECT new.id, new.title, new.description, new.location, name
+            FROM core_companyprofile WHERE user_id = new.company_id;
+        END""",
+    'core_job_fts_update': f"""
+        CREATE TRIGGER IF NOT EXISTS core_job_fts_update AFTER UPDATE OF title, description, location, company_id
+        ON core_jobposting BEGIN
+            DELETE FROM {JOB_FTS_TABLE} WHERE rowid = old.id;
+            INSERT INTO {JOB_FTS_TABLE} (rowid, title, description, location, company)
+            SELECT new.id, new.title, new.description, new.location, name
+            FROM core_companyprofile WHERE user_id = new.company_id;
+        END""",
+    'core_job_fts_delete': f"""
+        CREATE TRIGGER IF NOT EXISTS core_job_fts_delete AFTER DELETE ON core_jobposting BEGIN
+            DELETE FROM {JOB_FTS_TABLE} WHERE rowid = old.id;
+        END""",
+    'core_job_fts_company_update': f"""
+        CREATE TRIGGER IF NOT EXISTS core_job_fts_company_update AFTER UPDATE OF name ON core_companyprofile BEGIN
+            UPDATE {JOB_FTS_TABLE} SET company = new.name
+            WHERE rowid IN (SELECT id FROM core_jobposting WHERE company_id = new.user_id);
+        END""",
+}
+
+
+def create_job_search(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    try:
+        schema_editor.execute(
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS {JOB_FTS_TABLE} USING fts5("
+            "title, description, location, company, prefix='2 3', tokenize='unicode61 remove_diacritics 2')"
+        )
+    except DatabaseError:
+        # SQLite built without FTS5; job search matches substrings instead
+        return
+    weights = ', '.join(str(weight) for weight in RANK_WEIGHTS)
+    schema_editor.execute(f"INSERT INTO {JOB_FTS_TABLE} ({JOB_FTS_TABLE}, rank) VALUES ('rank', 'bm25({weights})')")
+    for sql in JOB_TRIGGERS.values():
+        schema_editor.execute(sql)
+    schema_editor.execute(f'DELETE FROM {JOB_FTS_TABLE}')
+    schema_editor.execute(f"""
+        INSERT INTO {JOB_FTS_TABLE} (rowid, title, description, location, company)
+        SELECT job.id, job.title, job.description, job.location, company.name
+        FROM core_jobposting job JOIN core_companyprofile company ON company.user_id = job.company_id
+    """)
+
+
+def drop_job_search(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    for name in JOB_TRIGGERS:
+        schema_editor.execute(f'DROP TRIGGER IF EXISTS {name}')
+    schema_editor.execute(f'DROP TABLE IF EXISTS {JOB_FTS_TABLE}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0019_application_counters'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_job_search, drop_job_search),
+    ]
@@ -29,7 +29,7 @@ class StudentProfile(models.Model):
     phone_number = models.CharField(max_length=15, blank=True, null=True)
     resume = models.FileField(upload_to='resumes/', null=True, blank=True, help_text="Upload your resume in PDF format.")
     cgpa = models.FloatField(null=True, blank=True)
-    branch = models.CharField(max_length=100)
+    branch = models.CharField(max_length=100, db_index=True)
     graduation_year = models.IntegerField(null=True)
     backlogs = models.IntegerField(default=0)
     skills = models.TextField(blank=True, help_text="Comma-separated skills (e.g., Python, Django, JavaScript)")
@@ -40,7 +40,37 @@ class StudentProfile(models.Model):
     def __str__(self):
         return self.user.username
 
-class CompanyProfile(models.Model):
+class ApplicationCounters(models.Model):
+    """
+    Denormalized application counts: the total and one per status. Kept current by
+    the signals in core/signals.py and the bulk status updates in core/counters.py,
+    always with F() expressions, and repaired by the `recount` management command.
+    """
+    COUNTER_FIELDS = (
+        'applicant_count', 'applied_count', 'shortlisted_count', 'rejected_count', 'interview_count', 'offered_count',
+    )
+
+    applicant_count = models.PositiveIntegerField(default=0, editable=False)
+    applied_count = models.PositiveIntegerField(default=0, editable=False)
+    shortlisted_count = models.PositiveIntegerField(default=0, editable=False)
+    rejected_count = models.PositiveIntegerField(default=0, editable=False)
+    interview_count = models.PositiveIntegerField(default=0, editable=False)
+    offered_count = models.PositiveIntegerField(default=0, editable=False)
+
+    class Meta:
+        abstract = True
+
+    def save(self, **kwargs):
+        # A full save of a loaded instance would write back the counts it was loaded with,
+        # undoing increments made since; the counters are only ever written with F()
+        if not self._state.adding and kwargs.get('update_fields') is None:
+            kwargs['update_fields'] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key and field.name not in self.COUNTER_FIELDS
+            ]
+        super().save(**kwargs)
+
+class CompanyProfile(ApplicationCounters):
     """
     Stores all data specific to a company. Linked one-to-one with the User model.
     """
@@ -59,7 +89,22 @@ class CompanyProfile(models.Model):
 # ==============================================================================
 # 3. Core Functional Models
 # ==============================================================================
-class JobPosting(models.Model):
+class Branch(models.Model):
+    """
+    An academic branch (e.g., CSE - Computer Science Engineering) that job postings
+    can be restricted to. Students are matched on either the code or the full name.
+    """
+    code = models.CharField(max_length=20, unique=True)
+    name = models.CharField(max_length=100, unique=True)
+
+    class Meta:
+        verbose_name_plural = 'branches'
+        ordering = ['code']
+
+    def __str__(self):
+        return self.code
+
+class JobPosting(ApplicationCounters):
     """
     Represents a job opening posted by a company.
     """
@@ -71,13 +116,81 @@ class JobPosting(models.Model):
     application_deadline = models.DateField()
     min_cgpa = models.FloatField(default=6.0, help_text="Minimum CGPA required.")
     max_backlogs = models.IntegerField(default=0, help_text="Maximum number of backlogs allowed.")
-    allowed_branches = models.CharField(max_length=255, help_text="Comma-separated list of allowed branches (e.g., CSE,ECE,ME).")
+    branches = models.ManyToManyField(
+        Branch, through='JobPostingBranch', blank=True, related_name='jobs',
+        help_text="Branches allowed to apply. Leave empty to allow all branches."
+    )
     is_approved = models.BooleanField(default=False, help_text="Admin must approve the job posting.")
     posted_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [
+            # Open-jobs filter used by the student listings. The range column leads because
+            # SQLite compares booleans as a bare column test, which cannot seek on a prefix.
+            models.Index(fields=['application_deadline', 'is_approved'], name='core_job_deadline_approved_idx'),
+            # Admin approval queue (pending jobs, newest first)
+            models.Index(fields=['-posted_at'], name='core_job_pending_idx', condition=models.Q(is_approved=False)),
+            # A company's jobs, newest first
+            models.Index(fields=['company', 'posted_at'], name='core_job_company_posted_idx'),
+        ]
+
     def __str__(self):
         return f"{self.title} at {self.company.name}"
 
+class JobPostingBranch(models.Model):
+    """
+    Join table between JobPosting and Branch.
+    """
+    job = models.ForeignKey(JobPosting, on_delete=models.CASCADE)
+    branch = models.ForeignKey(Branch, on_delete=models.CASCADE)
+
+    class Meta:
+        # The unique constraint covers lookups by job; the index covers "jobs open to branch X"
+        unique_together = ('job', 'branch')
+        indexes = [
+            models.Index(fields=['branch', 'job'], name='core_jobbranch_branch_job_idx'),
+        ]
+
+class StudentJobEligibility(models.Model):
+    """
+    Materialized index of the open, approved jobs each student is eligible for.
+    A row exists only for eligible pairs. Maintained by the signals in core/signals.py
+    and rebuilt in bulk by the `rebuild_eligibility` management command.
+    """
+    student = models.ForeignKey(StudentProfile, on_delete=models.CASCADE, related_name='job_eligibilities')
+    job = models.ForeignKey(JobPosting, on_delete=models.CASCADE, related_name='student_eligibilities')
+
+    class Meta:
+        unique_together = ('student', 'job')
+        verbose_name_plural = 'student job eligibilities'
+
+class Skill(models.Model):
+    """
+    A skill named in student profiles. `name` is the normalised key (lower case,
+    single spaces) that searches match on; `label` keeps the spelling first seen.
+    """
+    name = models.CharField(max_length=100, unique=True)
+    label = models.CharField(max_length=100)
+
+    def __str__(self):
+        return self.label
+
+class StudentSkill(models.Model):
+    """
+    Normalised form of StudentProfile.skills, one row per student and skill.
+    Maintained from the free-text field by the signals in core/signals.py
+    (see core/skills.py), which also keep the FTS5 search index current.
+    """
+    student = models.ForeignKey(StudentProfile, on_delete=models.CASCADE, related_name='skill_links')
+    skill = models.ForeignKey(Skill, on_delete=models.CASCADE, related_name='student_links')
+
+    class Meta:
+        unique_together = ('student', 'skill')
+        indexes = [
+            # The students having a skill (search without FTS5)
+            models.Index(fields=['skill', 'student'], name='core_studentskill_skill_idx'),
+        ]
+
 class Application(models.Model):
     """
     Links a Student to a JobPosting, representing a single job application.
@@ -97,10 +210,60 @@ class Application(models.Model):
     class Meta:
         # Ensures a student can apply to a specific job only once
         unique_together = ('job', 'student')
+        indexes = [
+            # Applicants of a job filtered by status (applicant list, shortlisting, counters),
+            # in application order (interview scheduling)
+            models.Index(fields=['job', 'status', 'applied_at'], name='core_app_job_status_idx'),
+            # A student's applications filtered by status (placement status, offers)
+            models.Index(fields=['student', 'status'], name='core_app_student_status_idx'),
+            # Recent applications and monthly trends
+            models.Index(fields=['applied_at'], name='core_app_applied_at_idx'),
+            # A job's applicant list, newest first, paged by (applied_at, id)
+            models.Index(fields=['job', 'applied_at'], name='core_app_job_applied_idx'),
+        ]
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # The status the counters hold this application under (unknown when deferred)
+        instance._counted_status = instance.__dict__.get('status')
+        return instance
 
     def __str__(self):
         return f"{self.student.user.username}'s application for {self.job.title}"
 
+class SearchDocumentField(models.TextField):
+    """
+    The hidden column of an FTS5 table (named after the table), the left-hand
+    side of `MATCH`. Supports the `match` lookup: `filter(document__match='...')`.
+    """
+
+@SearchDocumentField.register_lookup
+class FullTextMatch(models.Lookup):
+    lookup_name = 'match'
+
+    def as_sql(self, compiler, connection):
+        lhs, lhs_params = self.process_lhs(compiler, connection)
+        rhs, rhs_params = self.process_rhs(compiler, connection)
+        return f'{lhs} MATCH {rhs}', lhs_params + rhs_params
+
+class JobSearchEntry(models.Model):
+    """
+    Read-only mapping of the SQLite FTS5 index over job titles, descriptions,
+    locations and company names, kept current by triggers (see migration 0020).
+    Joining it through `search_entry` filters and ranks jobs in one query.
+    """
+    job = models.OneToOneField(
+        JobPosting, primary_key=True, db_column='rowid', on_delete=models.DO_NOTHING, related_name='search_entry'
+    )
+    document = SearchDocumentField(db_column='core_job_fts')
+    # bm25 relevance with the column weights set by migration 0020; lower is better
+    rank = models.FloatField()
+
+    class Meta:
+        managed = False
+        db_table = 'core_job_fts'
+
 # ==============================================================================
 # 4. Utility & Optional Models
 # ==============================================================================
@@ -125,6 +288,11 @@ class InterviewSchedule(models.Model):
     venue_or_link = models.CharField(max_length=255)
     additional_instructions = models.TextField(blank=True, help_text="Any additional instructions for the candidate.")
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['interview_date', 'interview_time'], name='core_interview_date_time_idx'),
+        ]
+
 class Document(models.Model):
     """
     For admins to upload documents like guidelines, templates, etc.
@@ -133,6 +301,17 @@ class Document(models.Model):
     file = models.FileField(upload_to='documents/')
     uploaded_at = models.DateTimeField(auto_now_add=True)
 
+class AnalyticsSnapshot(models.Model):
+    """
+    Precomputed figures for the TPO analytics page, refreshed by the
+    `refresh_analytics` management command (see core/analytics.py).
+    """
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
+    data = models.JSONField()
+
+    def __str__(self):
+        return f"Analytics snapshot at {self.created_at.strftime('%Y-%m-%d %H:%M')}"
+
 class AuditLog(models.Model):
     """
     Tracks important actions performed by users in the system.
@@ -141,5 +320,89 @@ class AuditLog(models.Model):
     action = models.CharField(max_length=255)
     timestamp = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['timestamp'], name='core_auditlog_timestamp_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.user.username} - {self.action} at {self.timestamp.strftime('%Y-%m-%d %H:%M')}"
+# ==============================================================================
+# 5. Background Tasks (processed by `manage.py run_workers`)
+# ==============================================================================
+class BackgroundTask(models.Model):
+    """
+    Common fields of the queued jobs picked up by the run_workers command.
+    `progress` and `total` count rows so the admin pages can show a progress bar.
+    """
+    STATUS_CHOICES = (
+        ('queued', 'Queued'),
+        ('running', 'Running'),
+        ('done', 'Done'),
+        ('failed', 'Failed'),
+    )
+    created_by = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='queued')
+    progress = models.PositiveIntegerField(default=0)
+    total = models.PositiveIntegerField(default=0)
+    message = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        abstract = True
+        ordering = ['-created_at']
+
+    @property
+    def is_finished(self):
+        return self.status in ('done', 'failed')
+
+    @property
+    def percent(self):
+        if self.status == 'done':
+            return 100
+        return int(self.progress * 100 / self.total) if self.total else 0
+
+class ImportJob(BackgroundTask):
+    """
+    A bulk CSV upload waiting to be (or being) imported by core/bulk_import.py.
+    """
+    UPLOAD_TYPE_CHOICES = (
+        ('students', 'Students'),
+        ('companies', 'Companies'),
+        ('jobs', 'Jobs'),
+    )
+    upload_type = models.CharField(max_length=20, choices=UPLOAD_TYPE_CHOICES)
+    csv_file = models.FileField(upload_to='imports/')
+    created_count = models.PositiveIntegerField(default=0)
+    errors = models.JSONField(default=list, blank=True, help_text="(line, message) pairs of rejected rows.")
+
+    class Meta(BackgroundTask.Meta):
+        indexes = [
+            # Worker queue: oldest queued job first
+            models.Index(fields=['status', 'created_at'], name='core_importjob_queue_idx'),
+        ]
+
+    def __str__(self):
+        return f"Import of {self.get_upload_type_display().lower()} ({self.status})"
+
+class ExportJob(BackgroundTask):
+    """
+    A CSV report requested from the Generate Reports page, written to `result_file`.
+    """
+    EXPORT_TYPE_CHOICES = (
+        ('students', 'Students'),
+        ('jobs', 'Jobs'),
+    )
+    export_type = models.CharField(max_length=20, choices=EXPORT_TYPE_CHOICES)
+    filters = models.JSONField(default=dict, blank=True)
+    result_file = models.FileField(upload_to='exports/', blank=True)
+
+    class Meta(BackgroundTask.Meta):
+        indexes = [
+            models.Index(fields=['status', 'created_at'], name='core_exportjob_queue_idx'),
+        ]
+
     def __str__(self):
-        return f"{self.user.username} - {self.action} at {self.timestamp.strftime('%Y-%m-%d %H:%M')}"
\ No newline at end of file
+        return f"Export of {self.get_export_type_display().lower()} ({self.status})"
@@ -0,0 +1,127 @@
+# core/pagecache.py
+
+import hashlib
+
+from django.conf import settings
+from django.contrib.messages import get_messages
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.middleware.csrf import get_token
+from django.shortcuts import render
+from django.template.loader import render_to_string
+from django.utils import timezone
+from django.utils.cache import get_conditional_response, patch_cache_control, patch_vary_headers, quote_etag
+from django.utils.translation import get_language
+from django.views.decorators.cache import cache_control
+from django.views.decorators.http import condition
+
+from .badges import get_nav_badges
+from .versions import JOBS, get_versions, student_version_name
+
+# Rendered into cached pages in place of the CSRF token; each response gets the visitor's own
+CSRF_PLACEHOLDER = 'csrf-token-placeholder'
+
+
+def _public_page_timeout():
+    # Seconds a public page is served from the cache (0 disables it); only a deploy changes them
+    return getattr(settings, 'PUBLIC_PAGE_CACHE_TIMEOUT', 300)
+
+
+def has_pending_messages(request):
+    """Whether a flash message waits to be shown (without marking it as shown)."""
+    return len(get_messages(request)) > 0
+
+
+def page_etag(request, *parts):
+    """
+    An ETag for a page built from `parts`, or None when it has to be rendered anyway
+    because a flash message is pending. The CSRF secret is part of it: the forms of a
+    page the client kept carry a token that is only valid with the cookie it came with.
+    A first visit gets its CSRF cookie here, so its next request can already match.
+    """
+    if has_pending_messages(request):
+        return None
+    get_token(request)
+    parts = (*parts, request.META['CSRF_COOKIE'])
+    return hashlib.md5(repr(parts).encode(), usedforsecurity=False).hexdigest()
+
+
+def render_public(request, template_name, context=None):
+    """
+    Renders a page that is the same for every anonymous visitor (home, about, the
+    empty login and register forms), from the cache after the first time. The cached
+    page holds a placeholder for the CSRF token, filled in per response, and is
+    answered with 304 Not Modified when the client's copy is current. Signed-in
+    users, other methods and pages with a pending flash message are rendered as usual.
+    """
+    timeout = _public_page_timeout()
+    if (not timeout or request.method not in ('GET', 'HEAD') or request.user.is_authenticated
+            or has_pending_messages(request)):
+        return render(request, template_name, context)
+
+    key = f'core:page:{template_name}:{get_language()}'
+    cached = cache.get(key)
+    if cached is None:
+        page = render_to_string(template_name, {**(context or {}), 'csrf_token': CSRF_PLACEHOLDER}, request)
+        cached = (page, hashlib.md5(page.encode(), usedforsecurity=False).hexdigest())
+        cache.set(key, cached, timeout)
+    page, digest = cached
+
+    etag = quote_etag(page_etag(request, digest))
+    response = get_conditional_response(request, etag=etag)
+    if response is None:
+        if CSRF_PLACEHOLDER in page:
+            page = page.replace(CSRF_PLACEHOLDER, get_token(request))
+        response = HttpResponse(page)
+    response['ETag'] = etag
+    # Signed-in users get another page (or a redirect) at the same URL
+    patch_vary_headers(response, ['Cookie'])
+    patch_cache_control(response, private=True, no_cache=True)
+    return response
+
+
+def conditional_page(page_version):
+    """
+    Decorator answering a GET with 304 Not Modified when the page has not changed
+    since the client's copy. `page_version(request, *args, **kwargs)` returns what
+    the page is built from, e.g. data versions, and must cost no more than a few
+    cache reads. The client is told to revalidate its copy on every visit.
+    """
+    def etag(request, *args, **kwargs):
+        if request.method not in ('GET', 'HEAD'):
+            return None
+        return page_etag(request, request.get_full_path(), page_version(request, *args, **kwargs))
+
+    def decorator(view):
+        return cache_control(private=True, no_cache=True)(condition(etag_func=etag)(view))
+    return decorator
+
+
+def fragment_context(request, version_names, *parts):
+    """
+    Context for a template fragment cached per role and user until one of the named
+    data versions (or one of `parts`, e.g. today's date) changes:
+    `{% cache fragment_timeout <fragment name> fragment_version %}...{% endcache %}`.
+    """
+    return {
+        'fragment_timeout': getattr(settings, 'DASHBOARD_FRAGMENT_CACHE_TIMEOUT', 60 * 60),
+        'fragment_version': (request.user.role, request.user.pk, *parts, *get_versions(*version_names)),
+    }
+
+
+# ==============================================================================
+# Page versions
+# ==============================================================================
+
+def user_page_version(request, *args, **kwargs):
+    """For pages showing nothing but the user's navigation (name and badges) besides static content."""
+    return request.user.pk, request.user.username, get_nav_badges(request)
+
+
+def job_listings_version(request, *args, **kwargs):
+    """The jobs, the student's applications and eligibility, and today's date (deadlines)."""
+    return (
+        *user_page_version(request),
+        timezone.localdate(),
+        get_versions(JOBS, student_version_name(request.user.pk)),
+    )
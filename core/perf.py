@@ -0,0 +1,99 @@
+# core/perf.py
+
+import hashlib
+import math
+import re
+from collections import Counter, deque
+from time import perf_counter
+
+from django.conf import settings
+
+# A run of placeholders (IN lists, multi-row VALUES) collapses to one, so queries that
+# differ only in the length of such a list share a fingerprint
+PLACEHOLDER_RUN = re.compile(r'%s(?:\s*,\s*%s)+')
+
+# View name -> ring buffer of (wall ms, db ms, queries, response bytes) for this process
+_samples = {}
+
+
+def fingerprint(sql):
+    """Normalises a query so that repeated executions with different parameters match."""
+    return PLACEHOLDER_RUN.sub('%s, ...', sql)
+
+
+class QueryRecorder:
+    """
+    A connection.execute_wrapper hook that times every query of a request and
+    counts how often each fingerprint repeats (the signature of an N+1 loop).
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.time = 0.0
+        self.fingerprints = Counter()
+
+    def __call__(self, execute, sql, params, many, context):
+        started = perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.time += perf_counter() - started
+            self.count += 1
+            self.fingerprints[fingerprint(sql)] += 1
+
+    def duplicates(self):
+        """The fingerprints run more than once, most repeated first, with a short id and SQL excerpt."""
+        return [
+            {'id': hashlib.sha1(sql.encode()).hexdigest()[:12], 'count': count, 'sql': sql[:200]}
+            for sql, count in self.fingerprints.most_common()
+            if count > 1
+        ]
+
+
+def record(view_name, wall_ms, db_ms, queries, size):
+    """Adds one measured request to the endpoint's ring buffer (PERF_RING_SIZE samples)."""
+    buffer = _samples.get(view_name)
+    if buffer is None:
+        buffer = _samples.setdefault(view_name, deque(maxlen=getattr(settings, 'PERF_RING_SIZE', 500)))
+    buffer.append((wall_ms, db_ms, queries, size))
+
+
+def reset():
+    _samples.clear()
+
+
+def _percentile(sorted_values, percent):
+    # Nearest-rank percentile of an already sorted list
+    return sorted_values[max(0, math.ceil(percent / 100 * len(sorted_values)) - 1)]
+
+
+def endpoint_stats():
+    """
+    Summarises the ring buffers per endpoint, the endpoints taking the most total
+    time first. Figures cover the requests this process measured most recently.
+    """
+    rows = []
+    for view_name, buffer in list(_samples.items()):
+        samples = list(buffer)
+        if not samples:
+            continue
+        wall = sorted(sample[0] for sample in samples)
+        db = sorted(sample[1] for sample in samples)
+        queries = [sample[2] for sample in samples]
+        sizes = [sample[3] for sample in samples if sample[3] is not None]
+        rows.append({
+            'view_name': view_name,
+            'count': len(samples),
+            'p50_ms': _percentile(wall, 50),
+            'p95_ms': _percentile(wall, 95),
+            'p99_ms': _percentile(wall, 99),
+            'max_ms': wall[-1],
+            'db_p50_ms': _percentile(db, 50),
+            'db_p95_ms': _percentile(db, 95),
+            'avg_queries': sum(queries) / len(queries),
+            'max_queries': max(queries),
+            'avg_size_kib': sum(sizes) / len(sizes) / 1024 if sizes else None,
+            'total_ms': sum(wall),
+        })
+    rows.sort(key=lambda row: row['total_ms'], reverse=True)
+    return rows
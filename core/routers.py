@@ -0,0 +1,76 @@
+# core/routers.py
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.db import DEFAULT_DB_ALIAS, connections
+
+# Read-only connection for long scans: a replica, or the primary file opened with mode=ro
+ANALYTICS_DB_ALIAS = 'analytics'
+
+# Whether the reads of the current request (or task) go to the analytics connection
+_analytics_reads = ContextVar('analytics_reads', default=False)
+
+
+def analytics_database():
+    """
+    The alias serving analytics reads: 'analytics' when it is a database of its own,
+    otherwise 'default' (no alias configured, or a test mirror of the primary).
+    """
+    if ANALYTICS_DB_ALIAS not in connections.settings:
+        return DEFAULT_DB_ALIAS
+    analytics = connections[ANALYTICS_DB_ALIAS].settings_dict
+    if analytics['NAME'] == connections[DEFAULT_DB_ALIAS].settings_dict['NAME']:
+        return DEFAULT_DB_ALIAS
+    return ANALYTICS_DB_ALIAS
+
+
+def is_read_only(connection):
+    """Whether the SQLite connection opens its file through a mode=ro URI."""
+    return 'mode=ro' in str(connection.settings_dict['NAME']).partition('?')[2].split('&')
+
+
+@contextmanager
+def analytics_reads():
+    """Sends the queries reading inside the block to the analytics connection. Writes stay on the primary."""
+    token = _analytics_reads.set(True)
+    try:
+        yield
+    finally:
+        _analytics_reads.reset(token)
+
+
+@contextmanager
+def primary_reads():
+    """
+    Reads inside the block from the primary again, for data that is cached or acted
+    on and must not come from a replica lagging behind.
+    """
+    token = _analytics_reads.set(False)
+    try:
+        yield
+    finally:
+        _analytics_reads.reset(token)
+
+
+class AnalyticsRouter:
+    """
+    Routes reads made inside analytics_reads() to the analytics connection and
+    everything else, all writes included, to the primary. Objects read from the
+    replica are saved to the primary.
+    """
+
+    def db_for_read(self, model, **hints):
+        return analytics_database() if _analytics_reads.get() else DEFAULT_DB_ALIAS
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        if {obj1._state.db, obj2._state.db} <= {DEFAULT_DB_ALIAS, ANALYTICS_DB_ALIAS}:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # The replica is a copy of the primary, never migrated on its own
+        return False if db == ANALYTICS_DB_ALIAS else None
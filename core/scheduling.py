@@ -0,0 +1,134 @@
+# core/scheduling.py
+
+from datetime import datetime, time, timedelta
+
+from django.db import transaction
+
+from .badges import invalidate_user_badges
+from .counters import set_status
+from .models import Application, InterviewSchedule
+from .versions import bump_versions, interviews_version_name
+
+# Interviews have no end time; without slots, another interview closer than this counts as a clash
+DEFAULT_INTERVIEW_MINUTES = 60
+
+# Rows per INSERT statement
+SCHEDULE_BATCH_SIZE = 500
+
+# The InterviewScheduleForm fields copied onto every interview of a batch
+DETAIL_FIELDS = ('round_name', 'mode', 'venue_or_link', 'additional_instructions')
+
+
+class SlotOverflow(ValueError):
+    """The slots of a cohort would run past midnight."""
+
+
+def slot_times(count, start_date, start_time, slot_minutes=None, per_slot=1):
+    """
+    Returns the interview time of each of `count` candidates. Without slot_minutes
+    everyone is interviewed at start_time; otherwise every group of per_slot
+    candidates (parallel panels) gets the next slot_minutes-long slot.
+    """
+    if not slot_minutes:
+        return [start_time] * count
+    start = datetime.combine(start_date, start_time)
+    slots = (count + per_slot - 1) // per_slot
+    last = start + timedelta(minutes=slot_minutes * (slots - 1))
+    if last.date() != start_date:
+        raise SlotOverflow(f'{slots} slots of {slot_minutes} minutes run past midnight.')
+    return [(start + timedelta(minutes=slot_minutes * (i // per_slot))).time() for i in range(count)]
+
+
+def plan_interviews(applications, details, slot_minutes=None, per_slot=1):
+    """
+    Builds one unsaved InterviewSchedule per application from the form's cleaned_data,
+    in the order of the applications.
+    """
+    times = slot_times(len(applications), details['interview_date'], details['interview_time'], slot_minutes, per_slot)
+    return [
+        InterviewSchedule(
+            application=app,
+            interview_date=details['interview_date'],
+            interview_time=slot,
+            **{field: details.get(field, '') for field in DETAIL_FIELDS},
+        )
+        for app, slot in zip(applications, times)
+    ]
+
+
+def _shift(value, minutes):
+    moved = datetime.combine(datetime.min.date(), value) + timedelta(minutes=minutes)
+    if moved.date() != datetime.min.date():
+        return time.max if minutes > 0 else time.min
+    return moved.time()
+
+
+def existing_interviews(interview_date, earliest, latest):
+    """
+    The interviews (of every company) on the date between the two times, served by the
+    (interview_date, interview_time) index, as (student id, time, job title, company name).
+    """
+    return InterviewSchedule.objects.filter(
+        interview_date=interview_date, interview_time__gte=earliest, interview_time__lte=latest,
+    ).values_list(
+        'application__student_id', 'interview_time', 'application__job__title', 'application__job__company__name',
+    )
+
+
+def find_clashes(interviews, length_minutes=DEFAULT_INTERVIEW_MINUTES):
+    """
+    Returns {application id: [(time, job title, company name), ...]} for the planned
+    interviews whose student already has an interview less than length_minutes away,
+    with one query over the window spanned by the batch.
+    """
+    if not interviews:
+        return {}
+    interview_date = interviews[0].interview_date
+    times = [interview.interview_time for interview in interviews]
+    booked = {}
+    for student_id, booked_time, title, company in existing_interviews(
+        interview_date, _shift(min(times), -length_minutes), _shift(max(times), length_minutes)
+    ):
+        booked.setdefault(student_id, []).append((booked_time, title, company))
+
+    window = timedelta(minutes=length_minutes)
+    clashes = {}
+    for interview in interviews:
+        planned = datetime.combine(interview_date, interview.interview_time)
+        for booked_time, title, company in booked.get(interview.application.student_id, ()):
+            if abs(datetime.combine(interview_date, booked_time) - planned) < window:
+                clashes.setdefault(interview.application_id, []).append((booked_time, title, company))
+    return clashes
+
+
+def describe_clashes(applications, clashes, limit=10):
+    """Names the candidates whose interview would clash, with the interview they already have."""
+    names = []
+    for app in applications:
+        if app.pk in clashes and len(names) < limit:
+            booked_time, title, company = clashes[app.pk][0]
+            name = app.student.user.get_full_name() or app.student.user.username
+            names.append(f'{name} ({title} at {company}, {booked_time:%H:%M})')
+    more = f' and {len(clashes) - len(names)} more' if len(clashes) > len(names) else ''
+    return (
+        f'{len(clashes)} candidate(s) already have an interview at that time: {", ".join(names)}{more}. '
+        'Choose another time, or tick the option to skip them.'
+    )
+
+
+@transaction.atomic
+def schedule_interviews(interviews):
+    """
+    Saves the planned interviews with one bulk insert and moves their applications to
+    the Interview stage. Returns the number of interviews scheduled.
+    """
+    InterviewSchedule.objects.bulk_create(interviews, batch_size=SCHEDULE_BATCH_SIZE)
+    application_ids = [interview.application_id for interview in interviews]
+    # Batched like the insert, to stay below SQLite's limit on bound parameters
+    for start in range(0, len(application_ids), SCHEDULE_BATCH_SIZE):
+        set_status(Application.objects.filter(pk__in=application_ids[start:start + SCHEDULE_BATCH_SIZE]), 'Interview')
+    # bulk_create skips the signals that refresh the students' upcoming-interview badges and dashboards
+    student_ids = {interview.application.student_id for interview in interviews}
+    invalidate_user_badges(*student_ids)
+    bump_versions(*(interviews_version_name(student_id) for student_id in student_ids))
+    return len(interviews)
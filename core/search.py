@@ -0,0 +1,59 @@
+# core/search.py
+
+import re
+
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.db.models import Q
+
+# SQLite FTS5 index over job titles, descriptions, locations and company names, kept
+# current by triggers. Created by migration 0020 when the SQLite build has FTS5.
+JOB_FTS_TABLE = 'core_job_fts'
+
+# Words of a search query used; the rest are ignored
+MAX_SEARCH_TERMS = 8
+
+SEARCH_TERM = re.compile(r'\w+')
+
+# (database NAME, table) -> whether the FTS table exists; checked once per database
+_fts_tables = {}
+
+
+def fts_table_exists(table, using=DEFAULT_DB_ALIAS):
+    """Whether the FTS5 table exists in the database (SQLite builds with FTS5 only)."""
+    db = connections[using]
+    key = (db.settings_dict['NAME'], table)
+    if key not in _fts_tables:
+        _fts_tables[key] = db.vendor == 'sqlite' and table in db.introspection.table_names()
+    return _fts_tables[key]
+
+
+def search_terms(query):
+    """The lower-cased words of a search box query."""
+    return SEARCH_TERM.findall((query or '').lower())[:MAX_SEARCH_TERMS]
+
+
+def match_expression(terms):
+    """An FTS5 query requiring every term, each as a prefix ("pyth" finds "Python")."""
+    return ' '.join(f'"{term}"*' for term in terms)
+
+
+def search_jobs(jobs, query):
+    """
+    Narrows a JobPosting queryset to the jobs matching every word of the query in
+    their title, description, location or company name, best matches first (title
+    and company matches weigh most). Without FTS5 the same words are matched as
+    substrings and the queryset keeps its order.
+    """
+    terms = search_terms(query)
+    if not terms:
+        return jobs
+    if fts_table_exists(JOB_FTS_TABLE, jobs.db):
+        return jobs.filter(search_entry__document__match=match_expression(terms)).order_by(
+            'search_entry__rank', 'pk'
+        )
+    for term in terms:
+        jobs = jobs.filter(
+            Q(title__icontains=term) | Q(description__icontains=term)
+            | Q(location__icontains=term) | Q(company__name__icontains=term)
+        )
+    return jobs
@@ -0,0 +1,185 @@
+# core/signals.py
+
+from django.conf import settings
+from django.db.backends.signals import connection_created
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from . import counters, eligibility, skills
+from .badges import invalidate_admin_badges, invalidate_user_badges
+from .models import Application, CompanyProfile, InterviewSchedule, JobPosting, StudentProfile
+from .routers import is_read_only
+from .stats import invalidate_dashboard_stats
+from .versions import (
+    JOBS, applications_version_name, bump_versions, interviews_version_name, student_version_name,
+)
+
+# Fields whose changes can alter which jobs a student (or job) matches
+STUDENT_ELIGIBILITY_FIELDS = {'cgpa', 'backlogs', 'branch'}
+JOB_ELIGIBILITY_FIELDS = {'min_cgpa', 'max_backlogs', 'is_approved', 'application_deadline'}
+
+
+@receiver(post_save, sender=StudentProfile)
+def update_student_eligibility(sender, instance, created, update_fields=None, raw=False, **kwargs):
+    """Keeps the StudentJobEligibility index in sync with the student's profile."""
+    if raw:
+        return
+    if update_fields is not None and not STUDENT_ELIGIBILITY_FIELDS.intersection(update_fields):
+        return
+    eligibility.refresh_student(instance)
+
+
+@receiver(post_save, sender=StudentProfile)
+def update_student_skills(sender, instance, created, update_fields=None, raw=False, **kwargs):
+    """Keeps StudentSkill and the skill search index in sync with the profile's skills text."""
+    if raw:
+        return
+    if update_fields is not None and 'skills' not in update_fields:
+        return
+    skills.refresh_student_skills([instance])
+
+
+@receiver(post_delete, sender=StudentProfile)
+def remove_student_skills(sender, instance, **kwargs):
+    """StudentSkill rows go by cascade; the FTS index row has to be removed explicitly."""
+    skills.forget_student(instance.pk)
+
+
+@receiver(post_save, sender=JobPosting)
+def update_job_eligibility(sender, instance, created, update_fields=None, raw=False, **kwargs):
+    """Keeps the StudentJobEligibility index in sync with the job's criteria and approval."""
+    if raw:
+        return
+    if update_fields is not None and not JOB_ELIGIBILITY_FIELDS.intersection(update_fields):
+        return
+    eligibility.refresh_job(instance)
+
+
+@receiver(m2m_changed, sender=JobPosting.branches.through)
+def update_job_branch_eligibility(sender, instance, action, reverse, pk_set=None, **kwargs):
+    """Branches are saved after the job itself (form.save_m2m), so re-index on change."""
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+    if not reverse:
+        eligibility.refresh_job(instance)
+    elif pk_set:
+        # Jobs were linked to or unlinked from a branch (branch.jobs.add(...))
+        for job in JobPosting.objects.filter(pk__in=pk_set).prefetch_related('branches'):
+            eligibility.refresh_job(job)
+
+
+@receiver(post_save, sender=JobPosting)
+@receiver(post_delete, sender=JobPosting)
+def invalidate_job_counters(sender, **kwargs):
+    """A job was posted, approved or rejected (deleted); the pending count is stale."""
+    invalidate_dashboard_stats()
+    invalidate_admin_badges()
+
+
+@receiver(post_save, sender=StudentProfile)
+@receiver(post_save, sender=CompanyProfile)
+@receiver(post_delete, sender=StudentProfile)
+@receiver(post_delete, sender=CompanyProfile)
+def invalidate_profile_counters(sender, **kwargs):
+    """Student, company or placement totals may have changed."""
+    invalidate_dashboard_stats()
+
+
+@receiver(post_save, sender=Application)
+@receiver(post_delete, sender=Application)
+def invalidate_application_badges(sender, instance, **kwargs):
+    """A new or reviewed application changes the company's unreviewed-applicant badge."""
+    try:
+        company_id = instance.job.company_id
+    except JobPosting.DoesNotExist:
+        company_id = None
+    invalidate_user_badges(instance.student_id, company_id)
+
+
+@receiver(post_save, sender=Application)
+def count_application(sender, instance, created, raw=False, **kwargs):
+    """Counts a new application, or moves a saved one between the per-status counters."""
+    if raw:
+        return
+    if created:
+        counters.count_applications(instance.job_id, added={instance.status: 1})
+    elif getattr(instance, '_counted_status', None) not in (None, instance.status):
+        counters.count_applications(
+            instance.job_id, added={instance.status: 1}, removed={instance._counted_status: 1}
+        )
+    instance._counted_status = instance.status
+
+
+@receiver(post_delete, sender=Application)
+def uncount_application(sender, instance, **kwargs):
+    """A withdrawn application, or one deleted along with its job or student."""
+    counters.count_applications(instance.job_id, removed={instance.status: 1})
+
+
+@receiver(post_save, sender=JobPosting)
+@receiver(post_delete, sender=JobPosting)
+@receiver(post_save, sender=CompanyProfile)
+def bump_jobs_version(sender, **kwargs):
+    """Job listings show each job's details, criteria and company name."""
+    bump_versions(JOBS)
+
+
+@receiver(m2m_changed, sender=JobPosting.branches.through)
+def bump_jobs_version_on_branches(sender, action, **kwargs):
+    """A job's branches decide which students see it as eligible."""
+    if action in ('post_add', 'post_remove', 'post_clear'):
+        bump_versions(JOBS)
+
+
+@receiver(post_save, sender=StudentProfile)
+def bump_student_version(sender, instance, **kwargs):
+    """The student's eligibility, profile completion or placement changed."""
+    bump_versions(student_version_name(instance.pk))
+
+
+@receiver(post_save, sender=Application)
+@receiver(post_delete, sender=Application)
+def bump_application_versions(sender, instance, **kwargs):
+    """The student's pages and the company's dashboard both show the application."""
+    names = [student_version_name(instance.student_id)]
+    try:
+        names.append(applications_version_name(instance.job.company_id))
+    except JobPosting.DoesNotExist:
+        pass
+    bump_versions(*names)
+
+
+@receiver(post_save, sender=InterviewSchedule)
+@receiver(post_delete, sender=InterviewSchedule)
+def bump_interviews_version(sender, instance, **kwargs):
+    """The student's dashboard lists their upcoming interviews."""
+    try:
+        student_id = instance.application.student_id
+    except Application.DoesNotExist:
+        return
+    bump_versions(interviews_version_name(student_id))
+
+
+@receiver(post_save, sender=InterviewSchedule)
+@receiver(post_delete, sender=InterviewSchedule)
+def invalidate_interview_badges(sender, instance, **kwargs):
+    """An interview was scheduled or cancelled; the student's upcoming count is stale."""
+    try:
+        student_id = instance.application.student_id
+    except Application.DoesNotExist:
+        return
+    invalidate_user_badges(student_id)
+
+
+@receiver(connection_created)
+def apply_sqlite_pragmas(sender, connection, **kwargs):
+    """Tunes each new SQLite connection with the SQLITE_PRAGMAS of the database profile."""
+    pragmas = getattr(settings, 'SQLITE_PRAGMAS', None)
+    if connection.vendor != 'sqlite' or not pragmas:
+        return
+    read_only = is_read_only(connection)
+    with connection.cursor() as cursor:
+        for name, value in pragmas.items():
+            # The journal mode is a property of the file, which a read-only connection cannot change
+            if not (read_only and name == 'journal_mode'):
+                cursor.execute(f'PRAGMA {name} = {value}')
@@ -0,0 +1,181 @@
+# core/skills.py
+
+import re
+
+from django.db import connection, transaction
+from django.db.models import Count, IntegerField, OuterRef, Subquery, Value
+from django.db.models.expressions import RawSQL
+from django.db.models.functions import Coalesce
+
+from .models import Skill, StudentProfile, StudentSkill
+from .search import fts_table_exists
+
+# SQLite FTS5 table indexing each student's skills as tokens of skill ids ("s12 s40"),
+# so a search is an intersection of posting lists. Created by migration 0017 when
+# the SQLite build has FTS5; other databases search StudentSkill instead.
+FTS_TABLE = 'core_student_skill_fts'
+
+# Students per chunk when (re)building the index
+SKILL_SYNC_BATCH_SIZE = 2000
+
+SKILL_SEPARATORS = re.compile(r'[,;\n]')
+
+
+def normalize(label):
+    """The search key of a skill: lower case with single spaces."""
+    return ' '.join(label.split()).lower()[:100]
+
+
+def parse_skills(text):
+    """Returns {key: label} for the comma (or semicolon) separated skills of a profile, in order."""
+    skills = {}
+    for label in SKILL_SEPARATORS.split(text or ''):
+        label = ' '.join(label.split())[:100]
+        if label:
+            skills.setdefault(normalize(label), label)
+    return skills
+
+
+def fts_available():
+    """Whether the FTS5 skill index exists in the default database."""
+    return fts_table_exists(FTS_TABLE)
+
+
+def _fts_document(skill_ids):
+    return ' '.join(f's{skill_id}' for skill_id in sorted(skill_ids))
+
+
+def _skill_ids(labels):
+    """Returns {key: id} for the given {key: label}, creating the skills not seen before."""
+    keys = list(labels)
+    ids = dict(Skill.objects.filter(name__in=keys).values_list('name', 'pk'))
+    missing = [Skill(name=key, label=labels[key]) for key in keys if key not in ids]
+    if missing:
+        Skill.objects.bulk_create(missing, ignore_conflicts=True)
+        ids.update(Skill.objects.filter(name__in=[skill.name for skill in missing]).values_list('name', 'pk'))
+    return ids
+
+
+def _index_students(students, replace=True):
+    """Writes the StudentSkill and FTS rows of (student id, skills text) pairs. Returns the link count."""
+    parsed = {pk: parse_skills(text) for pk, text in students}
+    labels = {}
+    for skills in parsed.values():
+        for key, label in skills.items():
+            labels.setdefault(key, label)
+    ids = _skill_ids(labels)
+
+    if replace:
+        StudentSkill.objects.filter(student_id__in=list(parsed)).delete()
+    links = [StudentSkill(student_id=pk, skill_id=ids[key]) for pk, skills in parsed.items() for key in skills]
+    StudentSkill.objects.bulk_create(links, batch_size=SKILL_SYNC_BATCH_SIZE)
+
+    if fts_available():
+        with connection.cursor() as cursor:
+            if replace:
+                cursor.execute(
+                    f'DELETE FROM {FTS_TABLE} WHERE rowid IN ({", ".join(["%s"] * len(parsed))})', list(parsed)
+                )
+            cursor.executemany(
+                f'INSERT INTO {FTS_TABLE} (rowid, skills) VALUES (%s, %s)',
+                [(pk, _fts_document(ids[key] for key in skills)) for pk, skills in parsed.items() if skills],
+            )
+    return len(links)
+
+
+@transaction.atomic
+def refresh_student_skills(student_profiles):
+    """Re-indexes the skills of the given students, e.g. after a profile edit or a bulk import."""
+    students = [(student.pk, student.skills) for student in student_profiles]
+    for start in range(0, len(students), SKILL_SYNC_BATCH_SIZE):
+        _index_students(students[start:start + SKILL_SYNC_BATCH_SIZE])
+
+
+def forget_student(student_id):
+    """Drops a deleted student from the FTS index (StudentSkill rows go by cascade)."""
+    if fts_available():
+        with connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {FTS_TABLE} WHERE rowid = %s', [student_id])
+
+
+@transaction.atomic
+def rebuild_skill_index():
+    """
+    Rebuilds StudentSkill and the FTS index from every profile's skills text.
+    Returns the number of student/skill links created.
+    """
+    StudentSkill.objects.all().delete()
+    if fts_available():
+        with connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {FTS_TABLE}')
+    created = 0
+    chunk = []
+    for row in StudentProfile.objects.order_by('pk').values_list('pk', 'skills').iterator(
+        chunk_size=SKILL_SYNC_BATCH_SIZE
+    ):
+        chunk.append(row)
+        if len(chunk) == SKILL_SYNC_BATCH_SIZE:
+            created += _index_students(chunk, replace=False)
+            chunk = []
+    if chunk:
+        created += _index_students(chunk, replace=False)
+    return created
+
+
+# ==============================================================================
+# Search
+# ==============================================================================
+
+def resolve_skills(skills):
+    """
+    Returns the ids of the named skills (a list of names or a comma-separated string),
+    or None when one of them is unknown, so that no student can match all of them.
+    """
+    keys = set(parse_skills(skills if isinstance(skills, str) else ', '.join(skills)))
+    ids = dict(Skill.objects.filter(name__in=keys).values_list('name', 'pk'))
+    return list(ids.values()) if len(ids) == len(keys) else None
+
+
+def students_with_skills(skills, students=None):
+    """
+    The students (of the given queryset, all by default) having every one of the
+    skills. Served by the FTS5 index where it exists, otherwise by StudentSkill.
+    Combine with other filters as usual, e.g. `.filter(cgpa__gte=8)`.
+    """
+    students = StudentProfile.objects.all() if students is None else students
+    skill_ids = resolve_skills(skills)
+    if skill_ids is None:
+        return students.none()
+    if not skill_ids:
+        return students
+    if fts_available():
+        match = ' AND '.join(f's{skill_id}' for skill_id in skill_ids)
+        return students.filter(pk__in=RawSQL(f'SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s', [match]))
+    return students.filter(pk__in=StudentSkill.objects.filter(skill_id__in=skill_ids).order_by().values(
+        'student'
+    ).annotate(matched=Count('pk')).filter(matched=len(skill_ids)).values('student'))
+
+
+def skill_matches(skill_ids, student_ref='pk'):
+    """
+    An expression counting how many of the skills the student at `student_ref` has,
+    e.g. `student_id` when annotating applications.
+    """
+    return Coalesce(Subquery(
+        StudentSkill.objects.filter(student=OuterRef(student_ref), skill_id__in=skill_ids).order_by().values(
+            'student'
+        ).annotate(matched=Count('pk')).values('matched')
+    ), Value(0), output_field=IntegerField())
+
+
+def rank_by_skills(queryset, skills, student_ref='pk'):
+    """
+    Orders students (or, with student_ref='student_id', applications) by how many of
+    the skills they have, best first, leaving out those with none of them.
+    """
+    skill_ids = list(Skill.objects.filter(
+        name__in=parse_skills(skills if isinstance(skills, str) else ', '.join(skills))
+    ).values_list('pk', flat=True))
+    return queryset.annotate(skill_matches=skill_matches(skill_ids, student_ref)).filter(
+        skill_matches__gt=0
+    ).order_by('-skill_matches', 'pk')
@@ -0,0 +1,58 @@
+# core/stats.py
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, Q
+
+from .models import CompanyProfile, StudentProfile
+from .versions import DASHBOARD_STATS, bump_versions
+
+DASHBOARD_STATS_CACHE_KEY = 'core:admin_dashboard_stats'
+
+
+def _cache_timeout():
+    # Seconds to keep the counters in the cache; 0 disables caching
+    return getattr(settings, 'DASHBOARD_STATS_CACHE_TIMEOUT', 30)
+
+
+def compute_dashboard_stats():
+    """
+    Computes the admin dashboard counters with two conditional-aggregate queries.
+    """
+    stats = StudentProfile.objects.aggregate(
+        student_count=Count('pk'),
+        placed_count=Count('pk', filter=Q(is_placed=True)),
+    )
+    # Every job belongs to a company, so the join counts each pending job exactly once
+    stats.update(CompanyProfile.objects.aggregate(
+        company_count=Count('pk', distinct=True),
+        pending_jobs_count=Count('jobs', filter=Q(jobs__is_approved=False)),
+    ))
+    stats['unplaced_count'] = stats['student_count'] - stats['placed_count']
+    return stats
+
+
+def get_dashboard_stats(request=None):
+    """
+    Returns the admin dashboard counters, computed at most once per request and
+    served from the cache for DASHBOARD_STATS_CACHE_TIMEOUT seconds.
+    """
+    if request is not None and hasattr(request, '_dashboard_stats'):
+        return request._dashboard_stats
+
+    timeout = _cache_timeout()
+    stats = cache.get(DASHBOARD_STATS_CACHE_KEY) if timeout else None
+    if stats is None:
+        stats = compute_dashboard_stats()
+        if timeout:
+            cache.set(DASHBOARD_STATS_CACHE_KEY, stats, timeout)
+
+    if request is not None:
+        request._dashboard_stats = stats
+    return stats
+
+
+def invalidate_dashboard_stats():
+    """Drops the cached counters so the next request recomputes them (and re-renders them)."""
+    cache.delete(DASHBOARD_STATS_CACHE_KEY)
+    bump_versions(DASHBOARD_STATS)
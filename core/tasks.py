@@ -0,0 +1,153 @@
+# core/tasks.py
+
+import logging
+import tempfile
+
+from django.core.files import File
+from django.utils import timezone
+
+from .bulk_import import import_csv
+from .exports import export_data, write_csv
+from .models import AuditLog, ExportJob, ImportJob
+from .routers import analytics_reads
+
+logger = logging.getLogger(__name__)
+
+# Task kinds as used in URLs and by the run_workers dispatcher
+TASK_MODELS = {
+    'import': ImportJob,
+    'export': ExportJob,
+}
+
+
+def enqueue_import(user, upload_type, csv_file):
+    """
+    Stores the uploaded file and queues it for import by run_workers.
+    """
+    return ImportJob.objects.create(created_by=user, upload_type=upload_type, csv_file=csv_file)
+
+
+def enqueue_export(user, export_type, filters):
+    """
+    Queues a CSV report; blank filters are dropped.
+    """
+    filters = {key: value for key, value in filters.items() if value}
+    return ExportJob.objects.create(created_by=user, export_type=export_type, filters=filters)
+
+
+def claim_next_task():
+    """
+    Marks the oldest queued task (of any kind) as running and returns (kind, pk),
+    or None when the queue is empty.
+    """
+    candidates = []
+    for kind, model in TASK_MODELS.items():
+        oldest = model.objects.filter(status='queued').order_by('created_at').values_list('created_at', 'pk').first()
+        if oldest:
+            candidates.append((oldest[0], kind, oldest[1]))
+    for _, kind, pk in sorted(candidates):
+        # The status condition keeps a task from being claimed twice
+        claimed = TASK_MODELS[kind].objects.filter(pk=pk, status='queued').update(
+            status='running', started_at=timezone.now()
+        )
+        if claimed:
+            return kind, pk
+    return None
+
+
+def requeue_interrupted_tasks():
+    """
+    Puts tasks left running by a worker that was stopped back in the queue.
+    Returns the number of tasks requeued.
+    """
+    requeued = 0
+    for model in TASK_MODELS.values():
+        requeued += model.objects.filter(status='running').update(status='queued', progress=0, started_at=None)
+    return requeued
+
+
+def still_running(claimed_tasks):
+    """Returns the given (kind, pk) tasks that are still marked running, e.g. when their worker died."""
+    return {
+        (kind, pk) for kind, pk in claimed_tasks
+        if TASK_MODELS[kind].objects.filter(pk=pk, status='running').exists()
+    }
+
+
+def fail_interrupted_tasks(claimed_tasks, message):
+    """
+    Marks the given (kind, pk) tasks that are still running as failed, for tasks
+    whose worker process died. Returns the number of tasks marked.
+    """
+    failed = 0
+    for kind, pk in claimed_tasks:
+        failed += TASK_MODELS[kind].objects.filter(pk=pk, status='running').update(
+            status='failed', message=message, finished_at=timezone.now()
+        )
+    return failed
+
+
+def run_task(kind, pk):
+    """
+    Runs one claimed task to completion in the current process and returns its final status.
+    """
+    model = TASK_MODELS[kind]
+    task = model.objects.get(pk=pk)
+    try:
+        RUNNERS[kind](task)
+    except Exception as e:
+        logger.exception('%s #%s failed', kind.capitalize(), pk)
+        model.objects.filter(pk=pk).update(
+            status='failed', message=f'{type(e).__name__}: {e}', finished_at=timezone.now()
+        )
+        return 'failed'
+    return task.status
+
+
+def _progress_recorder(task):
+    def record(done, total):
+        type(task).objects.filter(pk=task.pk).update(progress=done, total=total)
+    return record
+
+
+def _finish(task, status, message, *fields):
+    task.status = status
+    task.message = message
+    task.finished_at = timezone.now()
+    # progress and total are left to the recorder, which writes them directly
+    task.save(update_fields=['status', 'message', 'finished_at', *fields])
+
+
+def _run_import(task):
+    with task.csv_file.open('rb') as csv_file:
+        report = import_csv(task.upload_type, csv_file, progress=_progress_recorder(task))
+
+    task.created_count = report.created
+    task.errors = report.errors
+    if not report.ok:
+        _finish(task, 'failed', f'Nothing was imported: {len(report.errors)} row(s) need fixing.',
+                'created_count', 'errors')
+        return
+    AuditLog.objects.create(user=task.created_by, action=f'Bulk imported {report.created} {task.upload_type}')
+    _finish(task, 'done', report.summary(), 'created_count', 'errors')
+
+
+def _run_export(task):
+    # The rows are scanned on the analytics connection; the progress updates are writes
+    # and go to the primary
+    with analytics_reads():
+        header, total, rows = export_data(task.export_type, task.filters)
+        record = _progress_recorder(task)
+        record(0, total)
+        with tempfile.TemporaryFile('w+', newline='', encoding='utf-8') as csv_file:
+            written = write_csv(csv_file, header, rows, total, progress=record)
+            csv_file.seek(0)
+            task.result_file.save(f'{task.export_type}_report_{task.pk}.csv', File(csv_file), save=False)
+    record(written, total)
+    _finish(task, 'done', f'Exported {written} {task.export_type}.', 'result_file')
+
+
+RUNNERS = {
+    'import': _run_import,
+    'export': _run_export,
+}
@@ -1,3 +1,1941 @@
-from django.test import TestCase
+import io
+import json
+import os
+import re
+import tempfile
+from datetime import date, time, timedelta
+from pathlib import Path
+from time import sleep
+from unittest import skipUnless
+from unittest.mock import patch
 
-# Create your tests here.
+from django.contrib.messages import get_messages
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import CommandError, call_command
+from django.template import TemplateDoesNotExist
+from django.db import OperationalError, connection, connections, transaction
+from django.db.backends.signals import connection_created
+from django.db.migrations.executor import MigrationExecutor
+from django.test import Client, TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from .models import (
+    User, StudentProfile, CompanyProfile, Branch, JobPosting, Application, InterviewSchedule, AnalyticsSnapshot,
+    AuditLog, StudentJobEligibility, ImportJob, ExportJob, Document, Skill, StudentSkill,
+)
+from . import urls as core_urls
+from .analytics import REFRESH_LOCK_KEY, compute_analytics, latest_analytics, refresh_snapshot
+from .apply import ALREADY_APPLIED, APPLIED, IN_PROGRESS, ApplyError, apply_for_job
+from .benchmarks import SCENARIOS
+from .bulk_import import import_csv
+from .checks import check_sqlite_version
+from .management.commands.run_workers import MAX_WORKER_CRASHES, WORKER_DIED_MESSAGE
+from .counters import recount_application_counters, set_status
+from . import perf
+from .pagecache import CSRF_PLACEHOLDER
+from .eligibility import annotate_eligibility, eligibility_q, rebuild_index, refresh_job, refresh_student, refresh_students
+from .exports import job_rows
+from .scheduling import existing_interviews
+from .routers import AnalyticsRouter, analytics_reads, primary_reads
+from .search import search_jobs
+from .skills import FTS_TABLE, fts_available, parse_skills, rank_by_skills, rebuild_skill_index, students_with_skills
+from .transitions import TransitionError, apply_transition
+from .badges import ADMIN_BADGES_CACHE_KEY
+from .stats import DASHBOARD_STATS_CACHE_KEY
+from .tasks import run_task
+
+
+# The suite gets a cache of its own: the file cache in settings is shared with the
+# web server and run_workers, whose entries the tests would otherwise read and wipe
+_test_cache = override_settings(CACHES={
+    'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'core-tests'},
+})
+
+
+def setUpModule():
+    _test_cache.enable()
+
+
+def tearDownModule():
+    _test_cache.disable()
+
+
+def create_student(username, branch='Computer Science Engineering', cgpa=8.5, backlogs=0, is_placed=False):
+    user = User.objects.create_user(username=username, password='pass', role='student')
+    return StudentProfile.objects.create(user=user, branch=branch, cgpa=cgpa, backlogs=backlogs, is_placed=is_placed)
+
+
+def create_company(username, name='Acme Corp', is_approved=True):
+    user = User.objects.create_user(username=username, password='pass', role='company')
+    return CompanyProfile.objects.create(user=user, name=name, description='A company.', is_approved=is_approved)
+
+
+def create_job(company, title='Software Engineer', is_approved=True, deadline_days=30, branches=()):
+    job = JobPosting.objects.create(
+        company=company,
+        title=title,
+        description='Build things.',
+        location='Bangalore',
+        application_deadline=date.today() + timedelta(days=deadline_days),
+        min_cgpa=7.0,
+        max_backlogs=0,
+        is_approved=is_approved,
+    )
+    if branches:
+        job.branches.set(Branch.objects.filter(code__in=branches))
+    return job
+
+
+# ==============================================================================
+# Query plan tests
+# ==============================================================================
+
+@skipUnless(connection.vendor == 'sqlite', 'EXPLAIN QUERY PLAN output is SQLite specific')
+class QueryPlanIndexTests(TestCase):
+    """
+    Runs the hot views and checks with EXPLAIN QUERY PLAN that their queries
+    are served by an index instead of a full table scan.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_user(username='tpo', password='pass', role='admin')
+        cls.company = create_company('acme_hr')
+        cls.student = create_student('asha', is_placed=True)
+        cls.job = create_job(cls.company, branches=['CSE', 'ECE'])
+        create_job(cls.company, title='Pending Role', is_approved=False)
+
+        application = Application.objects.create(job=cls.job, student=cls.student, status='Offered')
+        shortlisted = Application.objects.create(
+            job=cls.job, student=create_student('ravi'), status='Shortlisted'
+        )
+        for app in (application, shortlisted):
+            InterviewSchedule.objects.create(
+                application=app,
+                interview_date=date.today() + timedelta(days=3),
+                interview_time=time(10, 0),
+                round_name='Technical Round 1',
+                venue_or_link='https://meet.example.com/abc',
+            )
+        AuditLog.objects.create(user=cls.admin, action='Seeded test data')
+
+    def query_plans(self, user, url):
+        """Requests the url as the given user and returns (sql, plan details) for every SELECT."""
+        self.client.force_login(user)
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(url)
+            if response.streaming:
+                b''.join(response.streaming_content)
+        self.assertEqual(response.status_code, 200)
+
+        plans = []
+        with connection.cursor() as cursor:
+            for query in context.captured_queries:
+                sql = query['sql']
+                if not sql.startswith('SELECT') or 'django_session' in sql:
+                    continue
+                cursor.execute('EXPLAIN QUERY PLAN ' + sql)
+                plans.append((sql, [row[3] for row in cursor.fetchall()]))
+        return plans
+
+    def assertUsesIndex(self, user, url, index_name, tables):
+        """Asserts the index is used and none of the given tables is scanned without an index."""
+        plans = self.query_plans(user, url)
+        details = [detail for _, plan in plans for detail in plan]
+        self.assertTrue(
+            any(index_name in detail for detail in details),
+            f'{url} did not use {index_name}:\n' + '\n'.join(details),
+        )
+        for sql, plan in plans:
+            for detail in plan:
+                for table in tables:
+                    self.assertNotEqual(detail, f'SCAN {table}', f'Full scan of {table} in {url}:\n{sql}')
+
+    def test_job_listings_uses_open_jobs_index(self):
+        self.assertUsesIndex(
+            self.student.user, reverse('core:job_listings'), 'core_job_deadline_approved_idx', ['core_jobposting']
+        )
+
+    def test_posted_jobs_uses_company_index(self):
+        self.assertUsesIndex(
+            self.company.user, reverse('core:posted_jobs'), 'core_job_company_posted_idx', ['core_jobposting']
+        )
+
+    def test_company_dashboard_uses_indexes(self):
+        self.assertUsesIndex(
+            self.company.user, reverse('core:company_dashboard'), 'core_app_job_status_idx',
+            ['core_jobposting', 'core_application'],
+        )
+
+    def test_schedule_interview_uses_job_status_index(self):
+        self.assertUsesIndex(
+            self.company.user, reverse('core:schedule_interview', args=[self.job.id]), 'core_app_job_status_idx',
+            ['core_application'],
+        )
+
+    def test_job_applicants_uses_job_applied_index(self):
+        self.assertUsesIndex(
+            self.company.user, reverse('core:job_applicants', args=[self.job.id]), 'core_app_job_applied_idx',
+            ['core_application'],
+        )
+
+    def test_placement_status_uses_student_status_index(self):
+        self.assertUsesIndex(
+            self.student.user, reverse('core:placement_status'), 'core_app_student_status_idx', ['core_application']
+        )
+
+    def test_approve_jobs_uses_pending_index(self):
+        self.assertUsesIndex(self.admin, reverse('core:approve_jobs'), 'core_job_pending_idx', ['core_jobposting'])
+
+    def test_interview_management_uses_date_time_index(self):
+        self.assertUsesIndex(
+            self.admin, reverse('core:interview_management'), 'core_interview_date_time_idx',
+            ['core_interviewschedule'],
+        )
+
+    def test_audit_logs_uses_timestamp_index(self):
+        self.assertUsesIndex(self.admin, reverse('core:audit_logs'), 'core_auditlog_timestamp_idx', ['core_auditlog'])
+
+    def test_analytics_uses_applied_at_index(self):
+        self.assertUsesIndex(self.admin, reverse('core:analytics'), 'core_app_applied_at_idx', ['core_application'])
+
+
+# ==============================================================================
+# Dashboard counters
+# ==============================================================================
+
+class DashboardStatsTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_user(username='tpo', password='pass', role='admin')
+        company = create_company('acme_hr')
+        create_company('globex_hr', name='Globex')
+        create_student('asha', is_placed=True)
+        create_student('ravi')
+        create_student('meera')
+        create_job(company, is_approved=False)
+        create_job(company, is_approved=False)
+        create_job(company)
+
+    def setUp(self):
+        cache.clear()
+        self.client.force_login(self.admin)
+
+    def test_counters(self):
+        response = self.client.get(reverse('core:admin_dashboard'))
+        stats = response.context['stats']
+        self.assertEqual(stats['student_count'], 3)
+        self.assertEqual(stats['placed_count'], 1)
+        self.assertEqual(stats['unplaced_count'], 2)
+        self.assertEqual(stats['company_count'], 2)
+        self.assertEqual(stats['pending_jobs_count'], 2)
+        self.assertContains(response, 'data-placed="1" data-unplaced="2"')
+
+    def test_counters_are_computed_once_per_request(self):
+        # session, user, and the two aggregate queries shared with the pending jobs badge
+        with self.assertNumQueries(4):
+            self.client.get(reverse('core:admin_dashboard'))
+        # The second request is served from the cache
+        with self.assertNumQueries(2):
+            self.client.get(reverse('core:admin_dashboard'))
+
+    def test_the_counters_seed_the_pending_jobs_badge(self):
+        self.client.get(reverse('core:admin_dashboard'))
+        self.assertEqual(cache.get(ADMIN_BADGES_CACHE_KEY), {'pending_jobs_count': 2})
+
+    def test_a_cached_fragment_skips_the_counters(self):
+        self.client.get(reverse('core:admin_dashboard'))
+        # The counters expire on their own timeout, before the fragment showing them
+        cache.delete(DASHBOARD_STATS_CACHE_KEY)
+        with self.assertNumQueries(2):
+            response = self.client.get(reverse('core:admin_dashboard'))
+        self.assertContains(response, 'data-placed="1" data-unplaced="2"')
+
+    def test_posting_a_job_invalidates_the_cache(self):
+        self.client.get(reverse('core:admin_dashboard'))
+        create_job(CompanyProfile.objects.get(name='Globex'), is_approved=False)
+        response = self.client.get(reverse('core:admin_dashboard'))
+        self.assertEqual(response.context['pending_jobs_count'], 3)
+
+
+# ==============================================================================
+# Navigation badges
+# ==============================================================================
+
+class NavBadgeTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_user(username='tpo', password='pass', role='admin')
+        cls.company = create_company('acme_hr')
+        cls.student = create_student('asha')
+        cls.job = create_job(cls.company)
+
+    def setUp(self):
+        cache.clear()
+
+    def badges(self, user, url):
+        self.client.force_login(user)
+        return self.client.get(url).context
+
+    def test_admin_badge_is_cached_until_a_job_changes(self):
+        create_job(self.company, is_approved=False)
+        self.assertEqual(self.badges(self.admin, reverse('core:generate_reports'))['pending_jobs_count'], 1)
+        # session and user only
+        with self.assertNumQueries(2):
+            self.client.get(reverse('core:generate_reports'))
+
+        create_job(self.company, title='Second Role', is_approved=False)
+        self.assertEqual(self.badges(self.admin, reverse('core:generate_reports'))['pending_jobs_count'], 2)
+
+    def test_company_badge_counts_unreviewed_applicants(self):
+        self.assertEqual(self.badges(self.company.user, reverse('core:posted_jobs'))['new_applicants_count'], 0)
+        application = Application.objects.create(job=self.job, student=self.student)
+        self.assertEqual(self.badges(self.company.user, reverse('core:posted_jobs'))['new_applicants_count'], 1)
+
+        # Bulk actions use update(), which the view invalidates explicitly
+        self.client.post(reverse('core:job_applicants', args=[self.job.id]), {
+            'selected_applications': [application.id], 'action': 'shortlist',
+        })
+        self.assertEqual(self.badges(self.company.user, reverse('core:posted_jobs'))['new_applicants_count'], 0)
+
+    def test_student_badge_counts_upcoming_interviews(self):
+        self.assertEqual(self.badges(self.student.user, reverse('core:applied_jobs'))['upcoming_interviews_count'], 0)
+        InterviewSchedule.objects.create(
+            application=Application.objects.create(job=self.job, student=self.student, status='Interview'),
+            interview_date=date.today() + timedelta(days=2),
+            interview_time=time(11, 0),
+            round_name='HR Round',
+            venue_or_link='Room 101',
+        )
+        self.assertEqual(self.badges(self.student.user, reverse('core:applied_jobs'))['upcoming_interviews_count'], 1)
+
+
+# ==============================================================================
+# Analytics
+# ==============================================================================
+
+class AnalyticsTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_user(username='tpo', password='pass', role='admin')
+        job = create_job(create_company('acme_hr'))
+        placed = create_student('asha', cgpa=9.1, is_placed=True)
+        create_student('ravi', branch='ECE', cgpa=7.4)
+        create_student('meera', branch='')
+        Application.objects.create(job=job, student=placed, status='Offered')
+
+    def setUp(self):
+        self.client.force_login(self.admin)
+
+    def test_aggregates(self):
+        data = compute_analytics()
+        self.assertEqual(data['total_students'], 3)
+        self.assertEqual(data['placed_students'], 1)
+        self.assertEqual(data['total_jobs'], 1)
+        self.assertEqual(data['branch_labels'], ['CSE', 'ECE'])
+        self.assertEqual(data['branch_placed_data'], [1, 0])
+        self.assertEqual(data['cgpa_placed'], [0, 0, 0, 1])
+        self.assertEqual(data['interview_counts'], [0, 0, 1])
+
+    def test_view_reuses_a_fresh_snapshot(self):
+        self.client.get(reverse('core:analytics'))
+        self.client.get(reverse('core:analytics'))
+        self.assertEqual(AnalyticsSnapshot.objects.count(), 1)
+
+    def test_stale_snapshot_is_recomputed(self):
+        refresh_snapshot()
+        AnalyticsSnapshot.objects.update(created_at=timezone.now() - timedelta(days=1))
+        response = self.client.get(reverse('core:analytics'))
+        self.assertEqual(AnalyticsSnapshot.objects.count(), 2)
+        self.assertEqual(response.context['total_students'], 3)
+
+    def test_stale_snapshot_is_served_while_another_request_refreshes_it(self):
+        stale = refresh_snapshot()
+        AnalyticsSnapshot.objects.update(created_at=timezone.now() - timedelta(days=1))
+        cache.add(REFRESH_LOCK_KEY, True)
+        try:
+            self.assertEqual(latest_analytics(60), stale)
+        finally:
+            cache.delete(REFRESH_LOCK_KEY)
+        self.assertEqual(AnalyticsSnapshot.objects.count(), 1)
+        self.assertNotEqual(latest_analytics(60), stale)
+
+
+# ==============================================================================
+# CSV exports
+# ==============================================================================
+
+@override_settings(MEDIA_ROOT=tempfile.mkdtemp())
+class CsvExportTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_user(username='tpo', password='pass', role='admin')
+        company = create_company('acme_hr')
+        job = create_job(company)
+        create_job(company, title='Pending Role', is_approved=False)
+        create_job(company, title='Closed Role', deadline_days=-1)
+        for username in ('asha', 'ravi'):
+            Application.objects.create(job=job, student=create_student(username))
+
+    def setUp(self):
+        self.client.force_login(self.admin)
+
+    def export(self, url, data=None):
+        response = self.client.post(url, data or {})
+        self.assertRedirects(response, reverse('core:background_tasks'))
+        task = ExportJob.objects.latest('created_at')
+        self.assertEqual(run_task('export', task.pk), 'done')
+        response = self.client.get(reverse('core:download_export', args=[task.pk]))
+        return b''.join(response.streaming_content).decode().splitlines()
+
+    def test_job_rows_count_applicants_in_one_query(self):
+        with self.assertNumQueries(1):
+            rows = list(job_rows(JobPosting.objects.all()))
+        self.assertEqual([row[-2:] for row in rows], [('Open', 2), ('Pending', 0), ('Closed', 0)])
+
+    def test_jobs_export(self):
+        lines = self.export(reverse('core:export_jobs_csv'), {'company': 'acme'})
+        self.assertEqual(len(lines), 4)
+        self.assertTrue(lines[1].endswith(',Open,2'))
+
+    def test_students_export_applies_filters(self):
+        lines = self.export(reverse('core:export_students_csv'), {'status': 'not_placed'})
+        self.assertEqual(len(lines), 3)
+        self.assertTrue(lines[1].startswith('asha,'))
+        self.assertTrue(lines[1].endswith(',Not Placed'))
+        task = ExportJob.objects.get()
+        self.assertEqual((task.progress, task.total, task.filters), (2, 2, {'status': 'not_placed'}))
+
+
+# ==============================================================================
+# Task queue tests
+# ==============================================================================
+
+# Written by an import in crash_on_imports just before it kills its worker process
+CRASH_MARKER = Path(tempfile.gettempdir()) / 'core-tests-worker-crash'
+
+
+def crash_on_imports(kind, pk):
+    """
+    Stands in for run_task in a worker process: imports kill the process, exports
+    succeed but first wait for the crash, so that they are running when it happens.
+    """
+    if kind == 'import':
+        CRASH_MARKER.touch()
+        os._exit(1)
+    while not CRASH_MARKER.exists():
+        sleep(0.1)
+    sleep(2)
+    return 'done'
+
+
+class WorkerPoolTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_user(username='tpo', password='pass', role='admin')
+
+    def test_a_dead_worker_fails_only_the_task_that_keeps_crashing(self):
+        crashed = ImportJob.objects.create(created_by=self.admin, upload_type='students', csv_file='imports/x.csv')
+        export = ExportJob.objects.create(created_by=self.admin, export_type='jobs')
+        stdout, stderr = io.StringIO(), io.StringIO()
+        CRASH_MARKER.unlink(missing_ok=True)
+        self.addCleanup(CRASH_MARKER.unlink, missing_ok=True)
+        with patch('core.management.commands.run_workers.run_task', crash_on_imports):
+            call_command('run_workers', workers=2, once=True, poll_interval=0.1, stdout=stdout, stderr=stderr)
+
+        crashed.refresh_from_db()
+        self.assertEqual(crashed.status, 'failed')
+        self.assertEqual(crashed.message, WORKER_DIED_MESSAGE)
+        self.assertIn('retrying 2 interrupted task(s) one by one', stderr.getvalue())
+        self.assertIn(f'Import #{crashed.pk} crashed its worker ({MAX_WORKER_CRASHES}/{MAX_WORKER_CRASHES})', stderr.getvalue())
+        # The export only went down with the pool; run again on its own, it succeeds
+        self.assertIn(f'Export #{export.pk} done', stdout.getvalue())
+        self.assertNotIn(f'Export #{export.pk} crashed', stderr.getvalue())
+
+
+# ==============================================================================
+# Bulk CSV import
+# ==============================================================================
+
+@override_settings(
+    PASSWORD_HASHERS=['django.contrib.auth.hashers.MD5PasswordHasher'],
+    MEDIA_ROOT=tempfile.mkdtemp(),
+)
+class BulkImportTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_user(username='tpo', password='pass', role='admin')
+        cls.company = create_company('acme_hr')
+        cls.job = create_job(cls.company, branches=['CSE'])
+
+    def setUp(self):
+        self.client.force_login(self.admin)
+
+    def upload(self, upload_type, content):
+        """Uploads the file, then processes the queue like run_workers would and returns the task."""
+        csv_file = SimpleUploadedFile('upload.csv', content.encode(), content_type='text/csv')
+        response = self.client.post(reverse('core:bulk_upload'), {'upload_type': upload_type, 'csv_file': csv_file})
+        self.assertRedirects(response, reverse('core:background_tasks'))
+        self.assertEqual(ImportJob.objects.get().status, 'queued')
+        call_command('run_workers', workers=0, once=True, stdout=io.StringIO())
+        return ImportJob.objects.get()
+
+    def test_students_are_created_and_indexed(self):
+        task = self.upload('students', (
+            'username,password,email,first_name,last_name,branch,cgpa,backlogs\n'
+            'asha,secret1,asha@example.com,Asha,K,CSE,8.2,0\n'
+            'ravi,secret2,,Ravi,M,ECE,9.0,0\n'
+        ))
+        self.assertEqual((task.status, task.created_count, task.percent), ('done', 2, 100))
+        asha = User.objects.get(username='asha')
+        self.assertTrue(asha.check_password('secret1'))
+        self.assertEqual(asha.student_profile.cgpa, 8.2)
+        # Only the CSE student is eligible for the CSE-only job
+        self.assertEqual(
+            list(StudentJobEligibility.objects.values_list('student__user__username', flat=True)), ['asha']
+        )
+        self.assertTrue(AuditLog.objects.filter(action='Bulk imported 2 students').exists())
+
+    def test_invalid_rows_are_reported_and_nothing_is_imported(self):
+        task = self.upload('students', (
+            'username,password,email,first_name,last_name,branch,cgpa,backlogs\n'
+            'asha,secret1,asha@example.com,Asha,K,CSE,8.2,0\n'
+            'ravi,secret2,not-an-email,Ravi,M,ECE,eleven,0\n'
+            'acme_hr,secret3,,Acme,HR,CSE,7.0,0\n'
+        ))
+        self.assertEqual(task.status, 'failed')
+        self.assertEqual([line for line, _ in task.errors], [3, 3, 4])
+        self.assertFalse(User.objects.filter(username='asha').exists())
+        response = self.client.get(reverse('core:background_tasks'))
+        self.assertContains(response, 'Line 4: Username &quot;acme_hr&quot; already exists.')
+
+    def test_jobs_are_created_with_branches(self):
+        self.upload('jobs', (
+            'company_username,title,description,location,salary_range,application_deadline,'
+            'min_cgpa,max_backlogs,branches\n'
+            'acme_hr,Data Analyst,Analyse data.,Pune,6 LPA,2030-01-31,7.5,,cse;Electronics and Communication Engineering\n'
+        ))
+        job = JobPosting.objects.get(title='Data Analyst')
+        self.assertTrue(job.is_approved)
+        self.assertEqual(job.max_backlogs, 0)
+        self.assertEqual(sorted(job.branches.values_list('code', flat=True)), ['CSE', 'ECE'])
+
+    def import_jobs(self, n):
+        rows = ''.join(
+            f'acme_hr,Role {i},Work.,Pune,6 LPA,2030-01-31,{7 + i % 3},,{["", "cse", "ECE;Mechanical Engineering"][i % 3]}\n'
+            for i in range(n)
+        )
+        header = 'company_username,title,description,location,salary_range,application_deadline,min_cgpa,max_backlogs,branches\n'
+        return import_csv('jobs', io.BytesIO((header + rows).encode()))
+
+    def test_job_import_indexes_eligibility_in_batches(self):
+        create_student('asha', branch=' cse', cgpa=9.0)
+        create_student('ravi', branch='ECE', cgpa=7.2)
+        create_student('meera', branch='Mechanical Engineering', cgpa=8.1)
+        # Companies and branches, the job and branch inserts, then the index rows: the
+        # delete, the jobs and their branches and one INSERT ... SELECT (+ savepoints)
+        with self.assertNumQueries(12):
+            self.assertEqual(self.import_jobs(3).created, 3)
+        with self.assertNumQueries(12):
+            self.assertEqual(self.import_jobs(30).created, 30)
+
+        indexed = set(StudentJobEligibility.objects.values_list('student_id', 'job_id'))
+        rebuild_index()
+        self.assertEqual(set(StudentJobEligibility.objects.values_list('student_id', 'job_id')), indexed)
+        self.assertIn((StudentProfile.objects.get(user__username='asha').pk, JobPosting.objects.filter(title='Role 1').first().pk), indexed)
+
+    def test_progress_endpoint(self):
+        task = ImportJob.objects.create(upload_type='students', csv_file='imports/x.csv', progress=50, total=200)
+        response = self.client.get(reverse('core:task_progress', args=['import', task.pk]))
+        self.assertEqual(response.json()['percent'], 25)
+        self.assertFalse(response.json()['finished'])
+        self.assertEqual(self.client.get(reverse('core:task_progress', args=['nope', task.pk])).status_code, 404)
+
+
+class SeedDataTests(TestCase):
+
+    def seed(self, **options):
+        call_command(
+            'seed_data', seed=5, no_files=True, non_interactive=True, workers=1, stdout=io.StringIO(), **options
+        )
+
+    def applications(self):
+        return list(Application.objects.order_by('pk').values_list(
+            'student__user__username', 'job__company__name', 'job__title', 'status', 'applied_at'
+        ))
+
+    def test_scaled_seed_is_reproducible_and_indexed(self):
+        self.seed(scale=120)
+        self.assertEqual(StudentProfile.objects.count(), 120)
+        applications = self.applications()
+        self.assertTrue(applications)
+        self.assertTrue(all(applied_at.date() < deadline for applied_at, deadline in
+                            Application.objects.values_list('applied_at', 'job__application_deadline')))
+
+        # The rows were bulk-inserted without signals; the index must match a full rebuild
+        index = set(StudentJobEligibility.objects.values_list('student_id', 'job_id'))
+        self.assertTrue(index)
+        rebuild_index()
+        self.assertEqual(set(StudentJobEligibility.objects.values_list('student_id', 'job_id')), index)
+
+        self.seed(scale=120, clear=True)
+        self.assertEqual(self.applications(), applications)
+
+    def test_a_failed_seed_raises_command_error(self):
+        with (
+            patch('core.management.commands.seed_data.Command.seed_jobs', side_effect=RuntimeError('disk full')),
+            patch('traceback.print_exc'),
+            self.assertRaisesMessage(CommandError, 'Error during seeding: disk full'),
+        ):
+            self.seed(scale=20)
+
+    def test_existing_data_is_kept_without_clear(self):
+        self.seed(scale=5)
+        with self.assertRaises(CommandError):
+            self.seed(scale=5)
+        self.assertEqual(StudentProfile.objects.count(), 5)
+
+
+@override_settings(MEDIA_ROOT=tempfile.mkdtemp())
+class BenchTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        User.objects.create_user(username='tpo', password='pass', role='admin')
+        company = create_company('acme_hr')
+        job = create_job(company, branches=['CSE'])
+        create_job(company, title='Data Analyst')
+        Application.objects.create(job=job, student=create_student('asha'))
+
+    def setUp(self):
+        self.baseline = os.path.join(tempfile.mkdtemp(), 'baseline.json')
+
+    def bench(self, *scenarios, **options):
+        call_command('bench', *scenarios, iterations=2, warmup=0, baseline=self.baseline, stdout=io.StringIO(), **options)
+
+    def test_baseline_is_recorded_and_regressions_are_reported(self):
+        self.bench(save=True)
+        with open(self.baseline) as f:
+            baseline = json.load(f)
+        self.assertEqual(set(baseline['scenarios']), set(SCENARIOS))
+        self.assertEqual(baseline['dataset'], {'students': 1, 'jobs': 2, 'applications': 1})
+        # Every scenario ran in a rolled-back transaction
+        self.assertEqual(Application.objects.count(), 1)
+        self.assertFalse(ExportJob.objects.exists())
+
+        self.bench('apply', check=True, tolerance=100)
+        baseline['scenarios']['apply']['queries'] -= 1
+        with open(self.baseline, 'w') as f:
+            json.dump(baseline, f)
+        with self.assertRaisesMessage(CommandError, 'Regressed: apply'):
+            self.bench('apply', check=True, tolerance=100)
+
+
+class PerfMiddlewareTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_user(username='tpo', password='pass', role='admin')
+        cls.student = create_student('asha')
+
+    def setUp(self):
+        perf.reset()
+        self.addCleanup(perf.reset)
+
+    def test_requests_are_logged_and_summarised(self):
+        self.client.force_login(self.student.user)
+        with self.assertLogs('core.perf', 'INFO') as logs:
+            self.client.get(reverse('core:job_listings'))
+        line = json.loads(logs.records[0].getMessage())
+        self.assertEqual((line['view'], line['status']), ('core:job_listings', 200))
+        self.assertGreater(line['queries'], 0)
+        self.assertGreater(line['response_bytes'], 0)
+
+        self.client.force_login(self.admin)
+        response = self.client.get(reverse('core:perf'))
+        self.assertContains(response, 'core:job_listings')
+        endpoints = {row['view_name']: row for row in response.context['endpoints']}
+        self.assertEqual(endpoints['core:job_listings']['count'], 1)
+
+    def test_sampling_turned_off_records_nothing(self):
+        self.client.force_login(self.student.user)
+        with override_settings(PERF_SAMPLE_RATE=0):
+            self.client.get(reverse('core:job_listings'))
+        self.assertEqual(perf.endpoint_stats(), [])
+
+    def test_repeated_queries_share_a_fingerprint(self):
+        recorder = perf.QueryRecorder()
+        with connection.execute_wrapper(recorder):
+            for pk in (self.admin.pk, self.student.pk):
+                User.objects.get(pk=pk)
+            list(User.objects.filter(pk__in=[self.admin.pk, self.student.pk]))
+            list(User.objects.filter(pk__in=[self.admin.pk, self.student.pk, 0]))
+        self.assertEqual([duplicate['count'] for duplicate in recorder.duplicates()], [2, 2])
+
+    def test_page_is_admin_only(self):
+        self.client.force_login(self.student.user)
+        self.assertNotEqual(self.client.get(reverse('core:perf')).status_code, 200)
+
+
+# ==============================================================================
+# Application status transition tests
+# ==============================================================================
+
+class StatusTransitionTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.company = create_company('acme')
+        cls.job = create_job(cls.company)
+        cls.other_job = create_job(create_company('globex', name='Globex'), title='Analyst')
+        cls.applied = Application.objects.create(student=create_student('asha'), job=cls.job)
+        cls.offered = Application.objects.create(student=create_student('ravi'), job=cls.job, status='Offered')
+        cls.foreign = Application.objects.create(student=create_student('meera'), job=cls.other_job)
+
+    def setUp(self):
+        self.client.force_login(self.company.user)
+        self.url = reverse('core:job_applicants', args=[self.job.id])
+
+    def statuses(self):
+        return dict(Application.objects.values_list('pk', 'status'))
+
+    def test_bulk_action_is_scoped_to_the_job_and_valid_source_states(self):
+        response = self.client.post(self.url, {
+            'selected_applications': [self.applied.pk, self.offered.pk, self.foreign.pk], 'action': 'reject',
+        })
+        self.assertEqual(self.statuses(), {
+            self.applied.pk: 'Rejected', self.offered.pk: 'Offered', self.foreign.pk: 'Applied',
+        })
+        self.assertEqual([str(message) for message in get_messages(response.wsgi_request)], [
+            '1 candidate(s) have been rejected.',
+            '2 selected candidate(s) could not be moved from their current stage.',
+        ])
+        self.assertEqual(
+            list(AuditLog.objects.values_list('user', 'action')),
+            [(self.company.user.pk, f'Rejected asha for Software Engineer (application {self.applied.pk})')],
+        )
+
+    def test_transition_returns_the_moved_ids(self):
+        self.assertEqual(apply_transition(self.job, [str(self.applied.pk), 'x'], 'shortlist'), [self.applied.pk])
+        # Already shortlisted: nothing moves, nothing is logged
+        self.assertEqual(apply_transition(self.job, [self.applied.pk], 'shortlist'), [])
+        self.assertEqual(AuditLog.objects.count(), 1)
+        with self.assertRaises(TransitionError):
+            apply_transition(self.job, [self.applied.pk], 'offer')
+
+    def test_query_count_does_not_grow_with_the_selection(self):
+        students = [create_student(f'cand{i}') for i in range(20)]
+        apps = Application.objects.bulk_create([Application(student=student, job=self.job) for student in students])
+        # One update per source status, the job and company counter updates, the names
+        # for the audit log and its insert (+ savepoint)
+        with CaptureQueriesContext(connection) as queries:
+            apply_transition(self.job, [app.pk for app in apps], 'shortlist', self.company.user)
+        self.assertEqual(len(queries), 8)
+        # The transaction opens with a write, never a read it would have to upgrade
+        self.assertTrue(queries.captured_queries[1]['sql'].startswith('UPDATE'))
+        self.assertEqual(Application.objects.filter(job=self.job, status='Shortlisted').count(), 20)
+
+    def test_single_actions_cannot_touch_another_companys_applicants(self):
+        url = reverse('core:shortlist_candidate', args=[self.other_job.id, self.foreign.pk])
+        self.assertEqual(self.client.post(url, {'action': 'shortlist'}).status_code, 404)
+        url = reverse('core:shortlist_candidate', args=[self.job.id, self.foreign.pk])
+        self.client.post(url, {'action': 'shortlist'})
+        self.assertEqual(self.statuses()[self.foreign.pk], 'Applied')
+
+        url = reverse('core:shortlist_candidate', args=[self.job.id, self.applied.pk])
+        self.client.post(url, {'action': 'shortlist'})
+        self.assertEqual(self.statuses()[self.applied.pk], 'Shortlisted')
+
+    def test_links_and_prefetches_cannot_change_a_status(self):
+        url = reverse('core:shortlist_candidate', args=[self.job.id, self.applied.pk])
+        self.assertRedirects(self.client.get(url, {'action': 'reject'}), self.url, fetch_redirect_response=False)
+        self.client.get(self.url, {'action': 'reject', 'app_id': self.applied.pk})
+        self.assertEqual(self.statuses()[self.applied.pk], 'Applied')
+
+
+# ==============================================================================
+# Skill search tests
+# ==============================================================================
+
+class SkillSearchTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.students = {}
+        for username, cgpa, skills in (
+            ('asha', 9.1, 'Python, Django, SQL'),
+            ('ravi', 7.5, 'python,  django'),
+            ('meera', 8.4, 'Python; Machine   Learning'),
+            ('kiran', 8.8, 'Java, SQL'),
+        ):
+            student = create_student(username, cgpa=cgpa)
+            student.skills = skills
+            student.save()
+            cls.students[username] = student
+
+    def names(self, students):
+        return sorted(student.user.username for student in students.select_related('user'))
+
+    def test_profiles_are_normalised_into_skills(self):
+        self.assertEqual(parse_skills(' Python ;machine   learning,, PYTHON'), {
+            'python': 'Python', 'machine learning': 'machine learning',
+        })
+        self.assertEqual(Skill.objects.get(name='machine learning').label, 'Machine Learning')
+        self.assertEqual(StudentSkill.objects.filter(skill__name='python').count(), 3)
+
+    def test_all_skills_must_match_and_other_filters_combine(self):
+        self.assertEqual(self.names(students_with_skills('python, DJANGO')), ['asha', 'ravi'])
+        self.assertEqual(self.names(students_with_skills(['Python', 'Django']).filter(cgpa__gte=8)), ['asha'])
+        self.assertEqual(self.names(students_with_skills('Python, Rust')), [])
+
+    def test_search_without_fts_gives_the_same_answers(self):
+        with patch('core.skills.fts_available', return_value=False):
+            self.assertEqual(self.names(students_with_skills('python, django')), ['asha', 'ravi'])
+            self.assertEqual(self.names(students_with_skills('sql')), ['asha', 'kiran'])
+
+    @skipUnless(connection.vendor == 'sqlite', 'FTS5 is SQLite specific')
+    def test_search_uses_the_fts_index(self):
+        self.assertTrue(fts_available())
+        self.assertIn(FTS_TABLE, students_with_skills('python, django').explain())
+
+    def test_profile_edits_and_deletes_keep_the_index_current(self):
+        ravi = self.students['ravi']
+        ravi.skills = 'Go'
+        ravi.save()
+        self.assertEqual(self.names(students_with_skills('django')), ['asha'])
+        self.assertEqual(self.names(students_with_skills('go')), ['ravi'])
+        self.students['asha'].delete()
+        self.assertEqual(self.names(students_with_skills('django')), [])
+
+        StudentSkill.objects.all().delete()
+        self.assertEqual(rebuild_skill_index(), 5)
+        self.assertEqual(self.names(students_with_skills('sql')), ['kiran'])
+
+    def test_rank_by_skills_puts_the_best_matches_first(self):
+        ranked = rank_by_skills(StudentProfile.objects.all(), 'Python, Django, SQL')
+        self.assertEqual(
+            [(student.user.username, student.skill_matches) for student in ranked.select_related('user')],
+            [('asha', 3), ('ravi', 2), ('meera', 1), ('kiran', 1)],
+        )
+
+
+# ==============================================================================
+# Job search tests
+# ==============================================================================
+
+@skipUnless(connection.vendor == 'sqlite', 'The job search index uses SQLite FTS5')
+class JobSearchTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.student = create_student('asha', cgpa=8.0)
+        cls.acme = create_company('acme', name='Acme Corp')
+        cls.globex = create_company('globex', name='Globex')
+        cls.python_dev = create_job(cls.acme, title='Python Developer')
+        cls.analyst = create_job(cls.globex, title='Data Analyst')
+        cls.analyst.description = 'Reporting with Python and SQL.'
+        cls.analyst.location = 'Mumbai'
+        cls.analyst.save()
+        cls.hardware = create_job(cls.acme, title='Hardware Engineer')
+        cls.hardware.min_cgpa = 9.0
+        cls.hardware.save()
+
+    def titles(self, query, jobs=None):
+        return [job.title for job in search_jobs(JobPosting.objects.all() if jobs is None else jobs, query)]
+
+    def test_prefix_search_ranks_title_matches_first(self):
+        self.assertEqual(self.titles('pyth'), ['Python Developer', 'Data Analyst'])
+        self.assertEqual(self.titles('python mumbai'), ['Data Analyst'])
+        self.assertEqual(self.titles('GLOBEX'), ['Data Analyst'])
+        # Queries are reduced to words, so FTS5 syntax in the input cannot cause an error
+        self.assertEqual(self.titles('"python"* -('), ['Python Developer', 'Data Analyst'])
+
+    def test_triggers_keep_the_index_current(self):
+        job = create_job(self.globex, title='Rust Engineer')
+        self.assertEqual(self.titles('rust'), ['Rust Engineer'])
+        job.title = 'Go Engineer'
+        job.save()
+        self.assertEqual(self.titles('rust'), [])
+        CompanyProfile.objects.filter(pk=self.globex.pk).update(name='Initech')
+        self.assertEqual(sorted(self.titles('initech')), ['Data Analyst', 'Go Engineer'])
+        job.delete()
+        self.assertEqual(self.titles('go'), [])
+
+    def test_listing_search_is_limited_to_eligible_jobs(self):
+        self.client.force_login(self.student.user)
+        response = self.client.get(reverse('core:job_listings'), {'q': 'engineer'})
+        self.assertEqual([job.title for job in response.context['eligible_jobs']], [])
+        response = self.client.get(reverse('core:job_listings'), {'q': 'python'})
+        self.assertEqual([job.title for job in response.context['eligible_jobs']], ['Python Developer', 'Data Analyst'])
+
+    def test_substring_fallback_without_fts(self):
+        with patch('core.search.fts_table_exists', return_value=False):
+            self.assertEqual(sorted(self.titles('pyth')), ['Data Analyst', 'Python Developer'])
+            self.assertEqual(self.titles('python mumbai'), ['Data Analyst'])
+
+
+# ==============================================================================
+# Applicant list tests
+# ==============================================================================
+
+class ApplicantListTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.company = create_company('acme')
+        cls.job = create_job(cls.company)
+        students = [
+            create_student(f'cand{i:02}', cgpa=6 + i / 10, branch='ECE' if i % 2 else 'Computer Science Engineering')
+            for i in range(25)
+        ]
+        for student, skills in ((students[3], 'Python, Django, SQL'), (students[7], 'python, React')):
+            student.skills = skills
+            student.save()
+        # Every application shares one timestamp, so pages are told apart by id alone
+        with transaction.atomic():
+            cls.apps = [Application.objects.create(student=student, job=cls.job) for student in students]
+        Application.objects.filter(job=cls.job).update(applied_at=timezone.now())
+        Application.objects.filter(pk=cls.apps[0].pk).update(status='Shortlisted')
+
+    def setUp(self):
+        self.client.force_login(self.company.user)
+        self.url = reverse('core:job_applicants', args=[self.job.id])
+
+    def ids(self, response):
+        return [app.pk for app in response.context['applications']]
+
+    def test_keyset_pages_cover_every_applicant_once(self):
+        seen, pages, params = [], 0, {}
+        while True:
+            with patch('core.applicants.APPLICANTS_PAGE_SIZE', 10):
+                response = self.client.get(self.url, params)
+            seen += self.ids(response)
+            pages += 1
+            if not response.context['next_cursor']:
+                break
+            params = {'after': response.context['next_cursor']}
+        self.assertEqual(pages, 3)
+        self.assertEqual(seen, sorted((app.pk for app in self.apps), reverse=True))
+
+        with patch('core.applicants.APPLICANTS_PAGE_SIZE', 10):
+            response = self.client.get(self.url, {'before': response.context['prev_cursor']})
+        self.assertEqual(self.ids(response), seen[10:20])
+
+    def test_filters_are_applied_in_the_database(self):
+        response = self.client.get(self.url, {'min_cgpa': '7', 'max_cgpa': '7.5', 'branch': Branch.objects.get(code='ECE').pk})
+        self.assertEqual(set(self.ids(response)), {self.apps[11].pk, self.apps[13].pk, self.apps[15].pk})
+        self.assertEqual(response.context['applicant_count'], 3)
+
+        self.assertEqual(self.ids(self.client.get(self.url, {'skills': 'PYTHON'})), [self.apps[7].pk, self.apps[3].pk])
+        self.assertEqual(self.ids(self.client.get(self.url, {'skills': 'python, sql'})), [self.apps[3].pk])
+        self.assertEqual(self.ids(self.client.get(self.url, {'status': 'Shortlisted'})), [self.apps[0].pk])
+
+    def test_branch_filter_ignores_surrounding_spaces(self):
+        padded = create_student('padded', branch=' ECE ')
+        application = Application.objects.create(student=padded, job=self.job)
+        response = self.client.get(self.url, {'branch': Branch.objects.get(code='ECE').pk})
+        self.assertIn(application.pk, self.ids(response))
+
+    def test_ranking_by_skills_puts_the_best_matches_first(self):
+        params = {'rank_skills': 'Python, Django, SQL'}
+        response = self.client.get(self.url, params)
+        self.assertEqual(self.ids(response), [self.apps[3].pk, self.apps[7].pk])
+        self.assertEqual([app.skill_matches for app in response.context['applications']], [3, 1])
+        self.assertEqual(response.context['applicant_count'], 2)
+
+        with patch('core.applicants.APPLICANTS_PAGE_SIZE', 1):
+            first = self.client.get(self.url, params)
+            second = self.client.get(self.url, {**params, 'after': first.context['next_cursor']})
+            back = self.client.get(self.url, {**params, 'before': second.context['prev_cursor']})
+        self.assertEqual(self.ids(second), [self.apps[7].pk])
+        self.assertIsNone(second.context['next_cursor'])
+        self.assertEqual(self.ids(back), [self.apps[3].pk])
+
+        self.assertEqual(self.ids(self.client.get(self.url, {'rank_skills': 'Rust'})), [])
+
+    def test_actions_keep_the_filters(self):
+        url = reverse('core:shortlist_candidate', args=[self.job.id, self.apps[1].pk])
+        response = self.client.post(f'{url}?status=Applied', {'action': 'shortlist'})
+        self.assertRedirects(response, f'{self.url}?status=Applied', fetch_redirect_response=False)
+        self.assertEqual(Application.objects.get(pk=self.apps[1].pk).status, 'Shortlisted')
+
+        response = self.client.post(f'{self.url}?status=Applied', {
+            'action': 'reject', 'selected_applications': [self.apps[2].pk],
+        })
+        self.assertRedirects(response, f'{self.url}?status=Applied', fetch_redirect_response=False)
+        self.assertEqual(Application.objects.get(pk=self.apps[2].pk).status, 'Rejected')
+
+    def test_page_renders_one_offer_form(self):
+        response = self.client.get(self.url)
+        self.assertContains(response, 'id="offer-form"', count=1)
+        self.assertContains(response, reverse('core:offer_candidate', args=[self.job.id, self.apps[0].pk]))
+
+
+# ==============================================================================
+# Eligibility index tests
+# ==============================================================================
+
+def baseline_is_eligible(student, job):
+    """The per-job check job_listings ran in Python before eligibility moved to the database."""
+    if student.cgpa is None or student.cgpa < job.min_cgpa:
+        return False
+    if student.backlogs > job.max_backlogs:
+        return False
+    # allowed_branches listed codes or full names; the Branch rows now hold both
+    allowed = [branch.code for branch in job.branches.all()] + [branch.name for branch in job.branches.all()]
+    return not allowed or student.branch in allowed
+
+
+class EligibilityIndexTests(TestCase):
+
+    def test_database_eligibility_matches_the_baseline_check(self):
+        company = create_company('acme')
+        jobs = [
+            create_job(company, title='Open to all'),
+            create_job(company, title='CSE only', branches=['CSE']),
+            create_job(company, title='CSE and ECE', branches=['CSE', 'ECE']),
+        ]
+        JobPosting.objects.filter(pk=jobs[2].pk).update(min_cgpa=8.0, max_backlogs=1)
+        students = [
+            create_student('no_cgpa', cgpa=None),
+            create_student('at_min', branch='CSE', cgpa=7.0),
+            create_student('below_min', branch='CSE', cgpa=6.99),
+            create_student('at_max_backlogs', branch='ECE', cgpa=8.0, backlogs=1),
+            create_student('over_max_backlogs', branch='ECE', cgpa=9.0, backlogs=2),
+            create_student('full_name', branch='Electronics and Communication Engineering', cgpa=8.5),
+            create_student('other_branch', branch='Mechanical Engineering', cgpa=9.5),
+            create_student('no_branch', branch='', cgpa=9.5),
+        ]
+        rebuild_index()
+
+        for student in students:
+            expected = {job.pk for job in JobPosting.objects.prefetch_related('branches') if baseline_is_eligible(student, job)}
+            with self.subTest(student=student.user.username):
+                self.assertEqual(set(JobPosting.objects.filter(eligibility_q(student)).values_list('pk', flat=True)), expected)
+                annotated = annotate_eligibility(JobPosting.objects.all(), student)
+                self.assertEqual({job.pk for job in annotated if job.is_eligible}, expected)
+        # Every case above is eligible somewhere or nowhere; make sure both kinds occur
+        self.assertTrue(any(baseline_is_eligible(s, j) for s in students for j in jobs))
+        self.assertFalse(baseline_is_eligible(students[0], jobs[0]))
+
+    def test_every_refresh_path_matches_branches_alike(self):
+        job = create_job(create_company('acme'), branches=['CSE'])
+        students = [
+            create_student('padded', branch=' CSE '),
+            create_student('named', branch='Computer Science Engineering'),
+            create_student('other', branch='ECE'),
+        ]
+        expected = {students[0].pk, students[1].pk}
+
+        def indexed():
+            return set(StudentJobEligibility.objects.filter(job=job).values_list('student_id', flat=True))
+
+        for student in students:
+            refresh_student(student)
+        self.assertEqual(indexed(), expected)
+        refresh_job(job)
+        self.assertEqual(indexed(), expected)
+        refresh_students([student.pk for student in students])
+        self.assertEqual(indexed(), expected)
+        rebuild_index()
+        self.assertEqual(indexed(), expected)
+
+    def test_branches_match_regardless_of_case(self):
+        # 0008 linked a job listing "cse" to the CSE branch; a student entered as "cse" still matches it
+        job = create_job(create_company('acme'), branches=['CSE'])
+        students = [
+            create_student('lower', branch='cse'),
+            create_student('mixed', branch=' Computer science engineering'),
+            create_student('other', branch='ece'),
+        ]
+        expected = {students[0].pk, students[1].pk}
+        self.assertEqual(set(StudentJobEligibility.objects.filter(job=job).values_list('student_id', flat=True)), expected)
+        refresh_job(job)
+        self.assertEqual(set(StudentJobEligibility.objects.filter(job=job).values_list('student_id', flat=True)), expected)
+        for student in students:
+            self.assertEqual(JobPosting.objects.filter(eligibility_q(student)).exists(), student.pk in expected)
+
+    def test_incremental_refreshes_match_a_full_rebuild(self):
+        company = create_company('acme')
+        cse_only = create_job(company, branches=['CSE'])
+        open_to_all = create_job(company, title='Analyst')
+        closed = create_job(company, title='Closed Role', deadline_days=-1)
+        students = [
+            create_student('asha', branch='CSE', cgpa=8.0),
+            create_student('ravi', branch='ECE', cgpa=6.5),
+            create_student('meera', branch='Mechanical Engineering ', cgpa=7.0, backlogs=1),
+        ]
+
+        def index():
+            return set(StudentJobEligibility.objects.values_list('student_id', 'job_id'))
+
+        def assertMatchesRebuild():
+            incremental = index()
+            rebuild_index()
+            self.assertEqual(incremental, index())
+
+        def save(obj, **fields):
+            for name, value in fields.items():
+                setattr(obj, name, value)
+            obj.save()
+
+        # Every change below goes through the signals that refresh the index
+        changes = [
+            lambda: save(students[1], cgpa=7.5),
+            lambda: save(students[1], branch='CSE'),
+            lambda: save(students[2], backlogs=0),
+            lambda: save(cse_only, min_cgpa=7.8),
+            lambda: save(open_to_all, max_backlogs=1),
+            lambda: cse_only.branches.add(Branch.objects.get(code='ME')),
+            lambda: cse_only.branches.remove(Branch.objects.get(code='CSE')),
+            lambda: open_to_all.branches.set(Branch.objects.filter(code='ECE')),
+            lambda: open_to_all.branches.clear(),
+            lambda: save(closed, application_deadline=date.today()),
+        ]
+        assertMatchesRebuild()
+        for i, change in enumerate(changes):
+            with self.subTest(change=i):
+                change()
+                assertMatchesRebuild()
+
+
+# ==============================================================================
+
+class InterviewSchedulingTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.company = create_company('acme')
+        cls.job = create_job(cls.company)
+        cls.students = [create_student(f'cand{i}') for i in range(5)]
+        cls.applications = [
+            Application.objects.create(student=student, job=cls.job, status='Shortlisted') for student in cls.students
+        ]
+        other_job = create_job(create_company('globex', name='Globex'), title='Analyst')
+        other = Application.objects.create(student=cls.students[0], job=other_job, status='Interview')
+        cls.interview_date = date.today() + timedelta(days=7)
+        InterviewSchedule.objects.create(
+            application=other, interview_date=cls.interview_date, interview_time=time(10, 30), round_name='HR',
+        )
+
+    def setUp(self):
+        self.client.force_login(self.company.user)
+        self.url = reverse('core:schedule_interview', args=[self.job.id])
+
+    def post(self, **extra):
+        data = {
+            'interview_date': self.interview_date.isoformat(), 'interview_time': '14:00', 'round_name': 'Technical',
+            'mode': 'Online', 'venue_or_link': 'https://meet.example.com/acme',
+            'additional_instructions': 'Keep your resume handy.', 'candidates_per_slot': 1,
+        }
+        data.update(extra)
+        return self.client.post(self.url, data)
+
+    def test_slots_give_consecutive_times_and_keep_every_detail(self):
+        response = self.post(slot_minutes=30, candidates_per_slot=2)
+        self.assertRedirects(response, reverse('core:company_dashboard'))
+        interviews = InterviewSchedule.objects.filter(application__job=self.job).order_by('interview_time')
+        self.assertEqual(
+            [interview.interview_time for interview in interviews],
+            [time(14, 0), time(14, 0), time(14, 30), time(14, 30), time(15, 0)],
+        )
+        self.assertEqual({(i.mode, i.additional_instructions) for i in interviews}, {('Online', 'Keep your resume handy.')})
+        self.assertEqual(Application.objects.filter(job=self.job, status='Interview').count(), 5)
+
+    def test_slots_follow_the_application_order(self):
+        # Applied in the reverse order of their ids
+        for minutes, application in enumerate(reversed(self.applications)):
+            Application.objects.filter(pk=application.pk).update(applied_at=timezone.now() + timedelta(minutes=minutes))
+        self.post(slot_minutes=30)
+        times = dict(InterviewSchedule.objects.filter(application__job=self.job).values_list('application', 'interview_time'))
+        self.assertEqual(
+            [times[application.pk] for application in reversed(self.applications)],
+            [time(14, 0), time(14, 30), time(15, 0), time(15, 30), time(16, 0)],
+        )
+
+    def test_clashing_candidate_blocks_the_batch_unless_skipped(self):
+        response = self.post(interview_time='11:00')
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, 'Analyst at Globex, 10:30')
+        self.assertFalse(InterviewSchedule.objects.filter(application__job=self.job).exists())
+
+        self.post(interview_time='11:00', skip_clashes='on')
+        scheduled = set(InterviewSchedule.objects.filter(application__job=self.job).values_list('application', flat=True))
+        self.assertEqual(scheduled, {app.pk for app in self.applications[1:]})
+        self.assertEqual(Application.objects.get(pk=self.applications[0].pk).status, 'Shortlisted')
+
+    def test_slots_past_midnight_are_refused(self):
+        response = self.post(interview_time='22:00', slot_minutes=60)
+        self.assertFormError(response.context['form'], 'slot_minutes', [
+            '5 slots of 60 minutes run past midnight. Use shorter slots, more candidates per slot or an earlier start.'
+        ])
+        self.assertFalse(InterviewSchedule.objects.filter(application__job=self.job).exists())
+
+    def test_batch_is_saved_with_a_constant_number_of_queries(self):
+        with CaptureQueriesContext(connection) as ctx:
+            self.post(slot_minutes=15)
+        with_five = len(ctx)
+        InterviewSchedule.objects.filter(application__job=self.job).delete()
+        Application.objects.filter(job=self.job).update(status='Shortlisted')
+        for i in range(5, 15):
+            Application.objects.create(student=create_student(f'cand{i}'), job=self.job, status='Shortlisted')
+        with CaptureQueriesContext(connection) as ctx:
+            self.post(slot_minutes=15)
+        self.assertEqual(len(ctx), with_five)
+        self.assertEqual(InterviewSchedule.objects.filter(application__job=self.job).count(), 15)
+
+    @skipUnless(connection.vendor == 'sqlite', 'EXPLAIN QUERY PLAN output is SQLite specific')
+    def test_clash_lookup_uses_date_time_index(self):
+        plan = existing_interviews(self.interview_date, time(9, 0), time(12, 0)).explain()
+        self.assertIn('core_interview_date_time_idx', plan)
+
+
+# ==============================================================================
+# Apply tests
+# ==============================================================================
+
+class ApplyTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.company = create_company('acme')
+        cls.job = create_job(cls.company)
+        cls.student = create_student('asha')
+
+    def setUp(self):
+        cache.clear()
+
+    def test_a_second_application_is_reported_not_raised(self):
+        self.assertEqual(apply_for_job(self.student, self.job.pk), APPLIED)
+        self.assertEqual(apply_for_job(self.student, self.job.pk), ALREADY_APPLIED)
+        self.assertEqual(Application.objects.filter(job=self.job).count(), 1)
+        self.job.refresh_from_db()
+        self.assertEqual((self.job.applicant_count, self.job.applied_count), (1, 1))
+
+    def test_a_repeat_is_reported_before_the_job_rules(self):
+        closing = create_job(self.company, title='Closing Role')
+        self.assertEqual(apply_for_job(self.student, closing.pk), APPLIED)
+        JobPosting.objects.filter(pk=closing.pk).update(application_deadline=date.today() - timedelta(days=1))
+        self.assertEqual(apply_for_job(self.student, closing.pk), ALREADY_APPLIED)
+        # Within the deadline, applying at the same instant is still a repeat
+        self.assertEqual(apply_for_job(self.student, self.job.pk), APPLIED)
+        with patch('django.utils.timezone.now', return_value=Application.objects.get(job=self.job).applied_at):
+            self.assertEqual(apply_for_job(self.student, self.job.pk), ALREADY_APPLIED)
+        self.assertEqual(Application.objects.filter(student=self.student).count(), 2)
+        closing.refresh_from_db()
+        self.assertEqual(closing.applicant_count, 1)
+
+    def test_a_repeated_idempotency_key_replays_the_outcome_without_queries(self):
+        self.assertEqual(apply_for_job(self.student, self.job.pk, 'click-1'), APPLIED)
+        with self.assertNumQueries(0):
+            self.assertEqual(apply_for_job(self.student, self.job.pk, 'click-1'), APPLIED)
+        self.assertEqual(apply_for_job(self.student, self.job.pk, 'click-2'), ALREADY_APPLIED)
+
+    def test_a_key_still_in_flight_is_not_reported_as_applied(self):
+        closed = create_job(self.company, deadline_days=-1)
+        # The first request of a double click has taken the key and is still running
+        cache.add(f'core:apply:{self.student.pk}:{closed.pk}:click-1', 'in_flight')
+        with self.assertNumQueries(0):
+            self.assertEqual(apply_for_job(self.student, closed.pk, 'click-1'), IN_PROGRESS)
+
+        self.client.force_login(self.student.user)
+        response = self.client.post(reverse('core:apply_for_job', args=[closed.pk]), {'idempotency_key': 'click-1'})
+        self.assertEqual(
+            [str(message) for message in get_messages(response.wsgi_request)],
+            ['Your application is still being processed. Refresh this page in a moment to see its outcome.'],
+        )
+
+    def test_closed_unapproved_and_ineligible_jobs_are_refused(self):
+        jobs = {
+            'The application deadline for this job has passed.': create_job(self.company, deadline_days=-1),
+            'This job is not open for applications.': create_job(self.company, is_approved=False),
+            'You are not eligible to apply for this job.': create_job(self.company, branches=['ECE']),
+        }
+        for message, job in jobs.items():
+            with self.subTest(message=message), self.assertRaisesMessage(ApplyError, message):
+                apply_for_job(self.student, job.pk, f'key-{job.pk}')
+        with self.assertRaises(JobPosting.DoesNotExist):
+            apply_for_job(self.student, 0)
+        self.assertFalse(Application.objects.exists())
+        # A refused request does not keep its key, so a later retry is checked again
+        with self.assertRaises(ApplyError):
+            apply_for_job(self.student, jobs['You are not eligible to apply for this job.'].pk, 'key-retry')
+
+    def test_double_submitted_form_applies_once(self):
+        self.client.force_login(self.student.user)
+        key = self.client.get(reverse('core:job_detail', args=[self.job.pk])).context['idempotency_key']
+        url = reverse('core:apply_for_job', args=[self.job.pk])
+        self.client.post(url, {'idempotency_key': key})
+        response = self.client.post(url, {'idempotency_key': key})
+        self.assertEqual(
+            [str(message) for message in get_messages(response.wsgi_request)],
+            ['You have successfully applied for the job!'] * 2,
+        )
+        self.assertEqual(Application.objects.filter(job=self.job, student=self.student).count(), 1)
+        self.assertEqual(self.client.post(reverse('core:apply_for_job', args=[0])).status_code, 404)
+
+
+# ==============================================================================
+# Application counter tests
+# ==============================================================================
+
+class ApplicationCounterTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.company = create_company('acme')
+        cls.job = create_job(cls.company)
+        cls.other_job = create_job(cls.company, title='Analyst')
+        cls.students = [create_student(f'cand{i}') for i in range(3)]
+
+    def counts(self, obj):
+        obj.refresh_from_db()
+        return {field: getattr(obj, field) for field in obj.COUNTER_FIELDS if getattr(obj, field)}
+
+    def assertCountersExact(self):
+        self.assertEqual(recount_application_counters(), (0, 0))
+
+    def test_signals_count_new_changed_and_deleted_applications(self):
+        first = Application.objects.create(student=self.students[0], job=self.job)
+        Application.objects.create(student=self.students[1], job=self.job)
+        Application.objects.create(student=self.students[0], job=self.other_job, status='Shortlisted')
+        self.assertEqual(self.counts(self.job), {'applicant_count': 2, 'applied_count': 2})
+
+        first = Application.objects.get(pk=first.pk)
+        first.status = 'Offered'
+        first.save()
+        first.save()
+        self.assertEqual(self.counts(self.job), {'applicant_count': 2, 'applied_count': 1, 'offered_count': 1})
+        self.assertEqual(self.counts(self.company), {
+            'applicant_count': 3, 'applied_count': 1, 'shortlisted_count': 1, 'offered_count': 1,
+        })
+
+        first.delete()
+        self.other_job.delete()
+        self.assertEqual(self.counts(self.company), {'applicant_count': 1, 'applied_count': 1})
+        self.assertCountersExact()
+
+    def test_saving_a_stale_job_or_profile_keeps_the_counters(self):
+        job = JobPosting.objects.get(pk=self.job.pk)
+        company = CompanyProfile.objects.get(pk=self.company.pk)
+        Application.objects.create(student=self.students[0], job=self.job)
+        job.title = 'Backend Engineer'
+        job.save()
+        company.name = 'Acme Labs'
+        company.save()
+        self.assertEqual(self.counts(job), {'applicant_count': 1, 'applied_count': 1})
+        self.assertEqual(self.counts(company), {'applicant_count': 1, 'applied_count': 1})
+
+    def test_bulk_status_changes_move_the_counters(self):
+        apps = [Application.objects.create(student=student, job=self.job) for student in self.students]
+        Application.objects.create(student=self.students[0], job=self.other_job, status='Interview')
+        apply_transition(self.job, [app.pk for app in apps[:2]], 'shortlist')
+        self.assertEqual(set_status(Application.objects.filter(student=self.students[0]), 'Rejected'), 2)
+        self.assertEqual(self.counts(self.job), {
+            'applicant_count': 3, 'applied_count': 1, 'shortlisted_count': 1, 'rejected_count': 1,
+        })
+        self.assertEqual(self.counts(self.other_job), {'applicant_count': 1, 'rejected_count': 1})
+        self.assertCountersExact()
+
+    def test_bulk_status_changes_open_with_a_write(self):
+        for student in self.students:
+            Application.objects.create(student=student, job=self.job)
+        with CaptureQueriesContext(connection) as queries:
+            set_status(Application.objects.filter(job=self.job), 'Interview')
+        # After the savepoint, never a read that SQLite would have to upgrade to a write lock
+        self.assertTrue(queries.captured_queries[1]['sql'].startswith('UPDATE'))
+        self.assertEqual(self.counts(self.job), {'applicant_count': 3, 'interview_count': 3})
+
+        with patch('core.transitions.MOVE_BATCH_SIZE', 2):
+            moved = apply_transition(self.job, Application.objects.values_list('pk', flat=True), 'reject')
+        self.assertEqual(len(moved), 3)
+        self.assertCountersExact()
+
+    def test_recount_repairs_bulk_created_applications(self):
+        Application.objects.bulk_create([Application(student=student, job=self.job) for student in self.students])
+        self.assertEqual(self.counts(self.job), {})
+        out = io.StringIO()
+        call_command('recount', stdout=out)
+        self.assertIn('Repaired the application counters of 1 jobs and 1 companies', out.getvalue())
+        self.assertEqual(self.counts(self.company), {'applicant_count': 3, 'applied_count': 3})
+        self.assertCountersExact()
+
+    def test_company_pages_read_the_counters(self):
+        for student in self.students:
+            Application.objects.create(student=student, job=self.job, status='Shortlisted')
+        self.client.force_login(self.company.user)
+        response = self.client.get(reverse('core:company_dashboard'))
+        self.assertEqual((response.context['total_applications'], response.context['shortlisted_candidates']), (3, 3))
+        self.assertEqual(json.loads(response.context['applications_chart']()['job_app_counts_json']), [3, 0])
+        response = self.client.get(reverse('core:posted_jobs'))
+        self.assertEqual([job.applicant_count for job in response.context['jobs_page_obj']], [0, 3])
+
+
+# ==============================================================================
+# Data migration tests
+# ==============================================================================
+
+class BranchMigrationTests(TransactionTestCase):
+    before = [('core', '0007_branch_jobpostingbranch_jobposting_branches')]
+    after = [('core', '0008_populate_jobposting_branches')]
+
+    def migrate(self, targets):
+        executor = MigrationExecutor(connection)
+        executor.loader.build_graph()
+        executor.migrate(targets)
+        return executor.loader.project_state(targets).apps
+
+    def restore_schema(self):
+        self.migrate(MigrationExecutor(connection).loader.graph.leaf_nodes())
+
+    def setUp(self):
+        self.addCleanup(self.restore_schema)
+        apps = self.migrate(self.before)
+        User = apps.get_model('core', 'User')
+        CompanyProfile = apps.get_model('core', 'CompanyProfile')
+        self.JobPosting = apps.get_model('core', 'JobPosting')
+        company = CompanyProfile.objects.create(user=User.objects.create(username='acme'), name='Acme')
+        self.jobs = {}
+        for key, allowed in [
+            ('duplicates', ' cse ,Computer Science Engineering,, CSE'),
+            ('mixed_case', 'me,eCe,civil'),
+            ('colliding', 'Aerospace Engineering,Aerospace Engineering Honours,cse'),
+            ('all_branches', ''),
+        ]:
+            self.jobs[key] = self.JobPosting.objects.create(
+                company=company, title=key, description='d', location='x',
+                application_deadline=date.today(), allowed_branches=allowed,
+            ).pk
+
+    def test_allowed_branches_become_branch_links_and_back(self):
+        apps = self.migrate(self.after)
+        JobPosting = apps.get_model('core', 'JobPosting')
+        JobPostingBranch = apps.get_model('core', 'JobPostingBranch')
+
+        def codes(key):
+            links = JobPostingBranch.objects.filter(job_id=self.jobs[key]).order_by('pk')
+            return list(links.values_list('branch__code', flat=True))
+
+        # Codes and full names, in any case and spacing, resolve to the default branches once
+        self.assertEqual(codes('duplicates'), ['CSE'])
+        self.assertEqual(codes('mixed_case'), ['ME', 'ECE', 'Civil'])
+        # Unknown tokens get a branch each, with distinct codes where they share their first 20 characters
+        self.assertEqual(codes('colliding'), ['Aerospace Engineerin', 'Aerospace Engineer-2', 'CSE'])
+        self.assertEqual(
+            JobPosting.objects.get(pk=self.jobs['colliding']).branches.order_by('code').first().name,
+            'Aerospace Engineering Honours',
+        )
+        self.assertEqual(codes('all_branches'), [])
+
+        # Unapplying keeps the original order, with each branch given once by its code
+        apps = self.migrate(self.before)
+        JobPosting = apps.get_model('core', 'JobPosting')
+        self.assertEqual(
+            {job.title: job.allowed_branches for job in JobPosting.objects.all()},
+            {
+                'duplicates': 'CSE',
+                'mixed_case': 'ME,ECE,Civil',
+                'colliding': 'Aerospace Engineerin,Aerospace Engineer-2,CSE',
+                'all_branches': '',
+            },
+        )
+
+
+class EligibilityMigrationTests(TransactionTestCase):
+    before = [('core', '0010_studentjobeligibility')]
+    after = [('core', '0011_populate_studentjobeligibility')]
+
+    def migrate(self, targets):
+        executor = MigrationExecutor(connection)
+        executor.loader.build_graph()
+        executor.migrate(targets)
+        return executor.loader.project_state(targets).apps
+
+    def restore_schema(self):
+        self.migrate(MigrationExecutor(connection).loader.graph.leaf_nodes())
+
+    def test_migrated_rows_match_a_rebuild(self):
+        self.addCleanup(self.restore_schema)
+        apps = self.migrate(self.before)
+        User = apps.get_model('core', 'User')
+        Student = apps.get_model('core', 'StudentProfile')
+        Company = apps.get_model('core', 'CompanyProfile')
+        cse, _ = apps.get_model('core', 'Branch').objects.get_or_create(
+            code='CSE', defaults={'name': 'Computer Science Engineering'}
+        )
+        company = Company.objects.create(user=User.objects.create(username='acme'), name='Acme')
+        job = apps.get_model('core', 'JobPosting').objects.create(
+            company=company, title='Developer', description='d', location='x',
+            application_deadline=date.today() + timedelta(days=7), is_approved=True,
+        )
+        job.branches.add(cse)
+        for username, branch in (('lower', ' cse'), ('named', 'Computer science engineering '), ('other', 'ECE')):
+            Student.objects.create(user=User.objects.create(username=username), branch=branch, cgpa=8.0)
+
+        self.migrate(self.after)
+        migrated = set(StudentJobEligibility.objects.values_list('student__user__username', 'job_id'))
+        self.assertEqual(migrated, {('lower', job.pk), ('named', job.pk)})
+
+        self.restore_schema()
+        rebuild_index()
+        self.assertEqual(set(StudentJobEligibility.objects.values_list('student__user__username', 'job_id')), migrated)
+
+
+@skipUnless(connection.vendor == 'sqlite', 'The job search index uses SQLite FTS5')
+class JobSearchMigrationTests(TransactionTestCase):
+    before = [('core', '0019_application_counters')]
+    after = [('core', '0020_job_search_index')]
+
+    def migrate(self, targets):
+        executor = MigrationExecutor(connection)
+        executor.loader.build_graph()
+        executor.migrate(targets)
+        return executor.loader.project_state(targets).apps
+
+    def restore_schema(self):
+        self.migrate(MigrationExecutor(connection).loader.graph.leaf_nodes())
+
+    def fts_objects(self):
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT name FROM sqlite_master WHERE name LIKE 'core_job_fts%' AND type IN ('table', 'trigger')")
+            return {row[0] for row in cursor.fetchall()}
+
+    def test_index_and_triggers_are_created_and_removed_with_the_migration(self):
+        self.addCleanup(self.restore_schema)
+        apps = self.migrate(self.before)
+        self.assertEqual(self.fts_objects(), set())
+        User = apps.get_model('core', 'User')
+        Company = apps.get_model('core', 'CompanyProfile')
+        company = Company.objects.create(user=User.objects.create(username='acme'), name='Acme')
+        apps.get_model('core', 'JobPosting').objects.create(
+            company=company, title='Python Developer', description='d', location='Pune',
+            application_deadline=date.today(),
+        )
+
+        self.migrate(self.after)
+        self.assertIn('core_job_fts_insert', self.fts_objects())
+        # Existing jobs are indexed, and the triggers index new ones
+        self.assertEqual([job.title for job in search_jobs(JobPosting.objects.all(), 'pyth')], ['Python Developer'])
+        create_job(CompanyProfile.objects.get(name='Acme'), title='Python Analyst')
+        self.assertEqual(
+            sorted(job.title for job in search_jobs(JobPosting.objects.all(), 'python')),
+            ['Python Analyst', 'Python Developer'],
+        )
+
+
+# ==============================================================================
+# Database profile tests
+# ==============================================================================
+
+class SqlitePragmaTests(TestCase):
+
+    def cache_size(self):
+        with connection.cursor() as cursor:
+            cursor.execute('PRAGMA cache_size')
+            return cursor.fetchone()[0]
+
+    @skipUnless(connection.vendor == 'sqlite', 'SQLite PRAGMAs')
+    def test_new_connections_get_the_profile_pragmas(self):
+        default = self.cache_size()
+        self.addCleanup(lambda: connection.cursor().execute(f'PRAGMA cache_size = {default}'))
+        with override_settings(SQLITE_PRAGMAS={'cache_size': -4321}):
+            connection_created.send(sender=type(connection), connection=connection)
+        self.assertEqual(self.cache_size(), -4321)
+        # Without PRAGMAs (the development profile) connections are left alone
+        with override_settings(SQLITE_PRAGMAS={}):
+            connection_created.send(sender=type(connection), connection=connection)
+        self.assertEqual(self.cache_size(), -4321)
+
+    @skipUnless(connection.vendor == 'sqlite', 'SQLite library version')
+    def test_sqlite_without_returning_fails_the_system_check(self):
+        self.assertEqual(check_sqlite_version(), [])
+        with patch.object(connection.Database, 'sqlite_version_info', (3, 31, 1)):
+            self.assertEqual([error.id for error in check_sqlite_version()], ['core.E001'])
+
+
+# ==============================================================================
+# Analytics connection tests
+# ==============================================================================
+
+class AnalyticsRoutingTests(TestCase):
+
+    def test_reads_stay_on_the_primary_it_mirrors(self):
+        # Under test the alias mirrors the primary, so views see the test transaction
+        with analytics_reads():
+            self.assertEqual(AuditLog.objects.all().db, 'default')
+        router = AnalyticsRouter()
+        self.assertEqual(router.db_for_write(AuditLog), 'default')
+        self.assertIs(router.allow_migrate('analytics', 'core'), False)
+
+
+@skipUnless(connection.vendor == 'sqlite', 'SQLite replica')
+class AnalyticsReplicaTests(TransactionTestCase):
+    # Committed data, since the replica is a copy of the database file
+    databases = {'default', 'analytics'}
+
+    def test_replica_serves_reads_and_refuses_writes(self):
+        self.admin = User.objects.create_user(username='tpo', password='pass', role='admin')
+        AuditLog.objects.create(user=self.admin, action='Before the copy')
+        replica_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(replica_dir.cleanup)
+        replica_path = os.path.join(replica_dir.name, 'replica.sqlite3')
+        connection.ensure_connection()
+        with open(replica_path, 'wb') as replica:
+            replica.write(connection.connection.serialize())
+
+        # close() is ignored while the alias names the in-memory test database, so rename it first
+        analytics = connections['analytics']
+        name = analytics.settings_dict['NAME']
+        self.addCleanup(analytics.settings_dict.__setitem__, 'NAME', name)
+        analytics.settings_dict['NAME'] = f'{Path(replica_path).as_uri()}?mode=ro'
+        analytics.close()
+        self.addCleanup(analytics.close)
+        AuditLog.objects.create(user=self.admin, action='After the copy')
+
+        self.client.login(username='tpo', password='pass')
+        response = self.client.get(reverse('core:audit_logs'))
+        self.assertEqual(
+            [log.action for log in response.context['logs_page_obj']], ['Before the copy']
+        )
+        with analytics_reads():
+            log = AuditLog.objects.get()
+            self.assertEqual(log._state.db, 'analytics')
+            # Objects read from the replica are saved to the primary, and badges are counted there
+            log.action = 'Edited'
+            log.save()
+            with primary_reads():
+                self.assertEqual(AuditLog.objects.all().db, 'default')
+        self.assertTrue(AuditLog.objects.filter(action='Edited').exists())
+        with self.assertRaisesMessage(OperationalError, 'readonly'):
+            AuditLog.objects.using('analytics').create(user=self.admin, action='Lost')
+
+        # The journal mode belongs to the file and is not set through a read-only connection
+        analytics.close()
+        with override_settings(SQLITE_PRAGMAS={'journal_mode': 'WAL', 'busy_timeout': 1234}):
+            with analytics.cursor() as cursor:
+                cursor.execute('PRAGMA busy_timeout')
+                self.assertEqual(cursor.fetchone()[0], 1234)
+
+
+# ==============================================================================
+# Page cache tests
+# ==============================================================================
+
+class PageCacheTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.company = create_company('acme')
+        cls.job = create_job(cls.company)
+        cls.student = create_student('cand')
+
+    def setUp(self):
+        cache.clear()
+
+    def test_public_pages_are_rendered_once_with_a_token_per_visitor(self):
+        first = Client(enforce_csrf_checks=True)
+        self.assertTemplateUsed(first.get(reverse('core:login')), 'registration/login.html')
+        visitor = Client(enforce_csrf_checks=True)
+        response = visitor.get(reverse('core:login'))
+        self.assertEqual(response.templates, [])
+        self.assertNotContains(response, CSRF_PLACEHOLDER)
+        self.assertIn('Cookie', response['Vary'])
+
+        # The cached form posts with the visitor's own token
+        token = re.search(r'name="csrfmiddlewaretoken" value="([^"]+)"', response.content.decode())[1]
+        response = visitor.post(reverse('core:login'), {
+            'username': 'cand', 'password': 'pass', 'csrfmiddlewaretoken': token,
+        })
+        self.assertRedirects(response, reverse('core:home'), fetch_redirect_response=False)
+
+        # Signed in, the same URL is no longer the cached page
+        response = visitor.get(reverse('core:home'))
+        self.assertRedirects(response, reverse('core:student_dashboard'), fetch_redirect_response=False)
+
+    def test_public_pages_answer_304_and_show_pending_messages(self):
+        response = self.client.get(reverse('core:about'))
+        response = self.client.get(reverse('core:about'), HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(response.status_code, 304)
+
+        self.client.login(username='cand', password='pass')
+        self.client.get(reverse('core:logout'))
+        self.assertContains(self.client.get(reverse('core:login')), 'successfully logged out')
+
+    def test_job_listings_answer_304_until_the_data_changes(self):
+        self.client.force_login(self.student.user)
+        url = reverse('core:job_listings')
+        etag = self.client.get(url)['ETag']
+        with self.assertNumQueries(2):  # session and user
+            self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+        apply_for_job(self.student, self.job.pk)
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        etag = response['ETag']
+
+        self.job.title = 'Data Engineer'
+        self.job.save()
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertContains(response, 'Data Engineer')
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=response['ETag']).status_code, 304)
+
+
+class DashboardFragmentTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.company = create_company('acme')
+        cls.job = create_job(cls.company)
+        cls.student = create_student('cand')
+
+    def setUp(self):
+        cache.clear()
+
+    def test_company_dashboard_fragment_changes_with_applications(self):
+        self.client.force_login(self.company.user)
+        url = reverse('core:company_dashboard')
+        self.assertContains(self.client.get(url), '<td class="fw-bold">Software Engineer</td>')
+
+        # A write no signal sees leaves the cached fragment in place
+        JobPosting.objects.filter(pk=self.job.pk).update(title='Data Engineer')
+        self.assertNotContains(self.client.get(url), '<td class="fw-bold">Data Engineer</td>')
+
+        apply_for_job(self.student, self.job.pk)
+        self.assertContains(self.client.get(url), '<td class="fw-bold">Data Engineer</td>')
+
+        shortlisted = '>1</div><i class="fas fa-user-check'
+        self.assertNotContains(self.client.get(url), shortlisted)
+        apply_transition(self.job, [Application.objects.get(student=self.student).pk], 'shortlist')
+        self.assertContains(self.client.get(url), shortlisted)
+
+    def test_warm_dashboards_skip_the_fragment_queries(self):
+        for user, name in ((self.student.user, 'student_dashboard'), (self.company.user, 'company_dashboard')):
+            self.client.force_login(user)
+            url = reverse(f'core:{name}')
+            with CaptureQueriesContext(connection) as cold:
+                self.client.get(url)
+            # Session, user and profile only: the counts, lists and chart are in the fragments
+            with self.assertNumQueries(3):
+                self.client.get(url)
+            self.assertGreater(len(cold), 3)
+
+    def test_student_dashboard_fragment_changes_with_interviews(self):
+        application = Application.objects.create(student=self.student, job=self.job, status='Interview')
+        self.client.force_login(self.student.user)
+        url = reverse('core:student_dashboard')
+        self.assertContains(self.client.get(url), 'No upcoming interviews')
+
+        InterviewSchedule.objects.create(
+            application=application, interview_date=date.today() + timedelta(days=3),
+            interview_time=time(11, 0), round_name='Technical',
+        )
+        response = self.client.get(url)
+        self.assertNotContains(response, 'No upcoming interviews')
+        self.assertContains(response, 'Acme Corp - Software Engineer')
+
+
+# ==============================================================================
+# Query budgets
+# ==============================================================================
+
+# url name -> (role, HTTP method, maximum number of queries). Budgets count every
+# query of the request, including the session and user lookups, with an empty cache.
+# A new route must be added here; raise a budget only for a constant number of queries.
+QUERY_BUDGETS = {
+    'home': (None, 'get', 0),
+    'about': (None, 'get', 0),
+    'register_student': (None, 'get', 0),
+    'register_company': (None, 'get', 0),
+    'login': (None, 'get', 0),
+    'logout': ('student', 'get', 4),
+
+    'student_dashboard': ('student', 'get', 7),
+    'student_profile': ('student', 'get', 4),
+    'upload_resume': ('student', 'get', 4),
+    'job_listings': ('student', 'get', 7),
+    'job_detail': ('student', 'get', 8),
+    'apply_for_job': ('student', 'post', 9),
+    'applied_jobs': ('student', 'get', 5),
+    'interview_schedule': ('student', 'get', 5),
+    'placement_status': ('student', 'get', 4),
+
+    'company_dashboard': ('company', 'get', 7),
+    'company_profile': ('company', 'get', 4),
+    'post_job': ('company', 'get', 4),
+    'posted_jobs': ('company', 'get', 6),
+    'edit_job': ('company', 'get', 7),
+    'job_applicants': ('company', 'get', 7),
+    'shortlist_candidate': ('company', 'post', 4),
+    'schedule_interview': ('company', 'get', 6),
+    'company_interview_schedules': ('company', 'get', 5),
+    # Rejecting the student's other applications: one UPDATE ... RETURNING per old status
+    'offer_candidate': ('company', 'post', 24),
+
+    'admin_dashboard': ('admin', 'get', 4),
+    'analytics': ('admin', 'get', 14),
+    'manage_students': ('admin', 'get', 5),
+    'manage_companies': ('admin', 'get', 5),
+    'approve_jobs': ('admin', 'get', 5),
+    'approve_single_job': ('admin', 'post', 10),
+    'reject_single_job': ('admin', 'post', 7),
+    'manage_jobs': ('admin', 'get', 5),
+    'interview_management': ('admin', 'get', 5),
+    'generate_reports': ('admin', 'get', 3),
+    'export_students_csv': ('admin', 'post', 3),
+    'export_jobs_csv': ('admin', 'post', 3),
+    'download_export': ('admin', 'get', 3),
+    'bulk_upload': ('admin', 'get', 3),
+    'background_tasks': ('admin', 'get', 5),
+    'task_progress': ('admin', 'get', 3),
+    'audit_logs': ('admin', 'get', 5),
+    'perf': ('admin', 'get', 3),
+
+    'notifications': ('student', 'get', 3),
+    'chat': ('student', 'get', 2),
+    'document_upload': ('admin', 'get', 2),
+    'delete_document': ('admin', 'post', 2),
+    'view_resume': ('company', 'get', 3),
+}
+
+# Placeholder pages whose templates have not been written yet; their budget covers
+# the queries run before rendering fails
+MISSING_TEMPLATE_ROUTES = {'chat', 'document_upload'}
+
+
+@override_settings(MEDIA_ROOT=tempfile.mkdtemp())
+class QueryBudgetTests(TestCase):
+    """
+    Requests every named route in core/urls.py as the role that uses it, once
+    with a small and once with a larger dataset. A view must stay within its
+    budget at both sizes, and its query count must not grow with the data.
+    """
+
+    # The small size stays below every page size and list cap ([:5]) so that a
+    # per-row query shows up as a difference between the two runs
+    SMALL, LARGE = 1, 6
+
+    def seed(self, n):
+        """
+        Creates n of everything that the logged-in student, company and admin
+        see in lists, and returns the users and objects the routes refer to.
+        """
+        admin = User.objects.create_user(username='tpo', password='pass', role='admin')
+        company = create_company('acme_hr')
+        student = create_student('asha', branch='CSE')
+        # Two extra students so that every application status below occurs at any size
+        others = [create_student(f'student{i}', branch='ECE') for i in range(n + 2)]
+
+        jobs = [create_job(company, title=f'Role {i}', branches=['CSE', 'ECE']) for i in range(n)]
+        other_jobs = []
+        for i in range(n):
+            create_job(company, title=f'Pending Role {i}', is_approved=False)
+            other_jobs.append(create_job(create_company(f'company{i}', name=f'Company {i}'), title=f'Other Role {i}'))
+
+        applications = []
+        statuses = ['Applied', 'Shortlisted', 'Interview']
+        for job in jobs:
+            applications.append(Application.objects.create(job=job, student=student, status='Interview'))
+            for i, applicant in enumerate(others):
+                applications.append(Application.objects.create(job=job, student=applicant, status=statuses[i % 3]))
+        for application in applications:
+            if application.status == 'Interview':
+                InterviewSchedule.objects.create(
+                    application=application,
+                    interview_date=date.today() + timedelta(days=3),
+                    interview_time=time(10, 0),
+                    round_name='Technical Round 1',
+                    venue_or_link='https://meet.example.com/abc',
+                )
+
+        documents = [Document.objects.create(title=f'Guideline {i}', file='documents/guide.pdf') for i in range(n)]
+        imports = [ImportJob.objects.create(created_by=admin, upload_type='students', csv_file='imports/s.csv')
+                   for _ in range(n)]
+        exports = []
+        for _ in range(n):
+            export = ExportJob.objects.create(created_by=admin, export_type='jobs', status='done')
+            export.result_file.save('jobs.csv', ContentFile(b'Job Title\n'))
+            exports.append(export)
+        for i in range(n):
+            AuditLog.objects.create(user=admin, action=f'Action {i}')
+
+        job = jobs[0]
+        application = Application.objects.filter(job=job).exclude(student=student).first()
+        # An open application elsewhere, so that an offer rejects other applications at any size
+        Application.objects.create(job=other_jobs[0], student=application.student)
+        return {
+            'users': {'admin': admin, 'company': company.user, 'student': student.user},
+            'kwargs': {
+                'job_id': job.pk,
+                'application_id': application.pk,
+                'student_id': student.pk,
+                'doc_id': documents[0].pk,
+                'kind': 'import',
+                'task_id': imports[0].pk,
+            },
+            'overrides': {
+                'download_export': {'task_id': exports[0].pk},
+                # The student may only apply to a job they have not applied to yet
+                'apply_for_job': {'job_id': create_job(company, title='Fresh Role').pk},
+                'approve_single_job': {'job_id': JobPosting.objects.filter(is_approved=False).first().pk},
+                'reject_single_job': {'job_id': JobPosting.objects.filter(is_approved=False).last().pk},
+            },
+        }
+
+    def count_queries(self, name, role, method, data):
+        """Requests the route inside a rolled-back transaction and returns its query count."""
+        pattern = next(p for p in core_urls.urlpatterns if getattr(p, 'name', None) == name)
+        kwargs = {key: data['kwargs'][key] for key in pattern.pattern.converters}
+        kwargs.update(data['overrides'].get(name, {}))
+
+        client = Client()
+        if role:
+            client.force_login(data['users'][role])
+        cache.clear()
+        with transaction.atomic():
+            with CaptureQueriesContext(connection) as context:
+                try:
+                    response = getattr(client, method)(reverse(f'core:{name}', kwargs=kwargs))
+                except TemplateDoesNotExist:
+                    if name not in MISSING_TEMPLATE_ROUTES:
+                        raise
+                    response = None
+                if response is not None and response.streaming:
+                    b''.join(response.streaming_content)
+            transaction.set_rollback(True)
+        if response is not None:
+            self.assertLess(response.status_code, 400, f'{name} returned {response.status_code}')
+        return len(context.captured_queries)
+
+    def measure(self, n):
+        with transaction.atomic():
+            data = self.seed(n)
+            counts = {
+                name: self.count_queries(name, role, method, data)
+                for name, (role, method, _) in QUERY_BUDGETS.items()
+            }
+            transaction.set_rollback(True)
+        return counts
+
+    def test_every_route_has_a_budget(self):
+        names = {p.name for p in core_urls.urlpatterns if getattr(p, 'name', None)}
+        self.assertEqual(names - set(QUERY_BUDGETS), set(), 'Add the new route(s) to QUERY_BUDGETS')
+
+    def test_query_counts_are_within_budget_and_independent_of_data_size(self):
+        small, large = self.measure(self.SMALL), self.measure(self.LARGE)
+        for name, (_, _, budget) in QUERY_BUDGETS.items():
+            with self.subTest(route=name):
+                self.assertLessEqual(small[name], budget, f'{name} ran {small[name]} queries')
+                self.assertEqual(
+                    small[name], large[name],
+                    f'{name} ran {small[name]} queries with {self.SMALL} rows and {large[name]} with {self.LARGE}',
+                )
@@ -0,0 +1,91 @@
+# core/transitions.py
+
+from collections import Counter
+
+from django.db import transaction
+
+from .badges import invalidate_user_badges
+from .counters import count_applications, move_applications
+from .models import Application, AuditLog
+from .versions import applications_version_name, bump_versions
+
+# Company action -> (new status, the statuses it may be applied to). An offer is final;
+# a rejected candidate may be reconsidered and shortlisted again.
+TRANSITIONS = {
+    'shortlist': ('Shortlisted', ('Applied', 'Rejected')),
+    'reject': ('Rejected', ('Applied', 'Shortlisted', 'Interview')),
+}
+
+# Rows per INSERT statement for the audit entries
+AUDIT_BATCH_SIZE = 500
+
+# Selected ids per UPDATE statement, well below SQLite's limit on bound parameters
+MOVE_BATCH_SIZE = 500
+
+
+class TransitionError(ValueError):
+    """The requested action is not a known status transition."""
+
+
+def _clean_ids(app_ids):
+    # Ids come straight from the query string or a form; anything non-numeric is ignored
+    return {int(app_id) for app_id in app_ids if str(app_id).isdigit()}
+
+
+def _move(job, ids, source, status):
+    """
+    Moves the job's applications among `ids` that are in the `source` status to `status`
+    and returns the ids of the rows it changed, with one UPDATE ... RETURNING per
+    MOVE_BATCH_SIZE ids.
+    """
+    moved = []
+    for start in range(0, len(ids), MOVE_BATCH_SIZE):
+        batch = Application.objects.filter(job=job, pk__in=ids[start:start + MOVE_BATCH_SIZE])
+        moved.extend(pk for pk, _ in move_applications(batch, source, status))
+    return moved
+
+
+@transaction.atomic
+def apply_transition(job, app_ids, action, user=None):
+    """
+    Moves the given applications of the job to the status of the action with one
+    conditional UPDATE ... RETURNING per source status (see move_applications). Only
+    applications of this job that are in one of the action's source statuses change.
+    The counters and audit entries follow the rows the updates actually changed. The
+    first statement is a write, so a transaction opened here never has to upgrade a
+    read lock to a write lock, which SQLite refuses at once while another writer is active.
+    Writes one audit entry per moved application and returns their ids.
+    """
+    if action not in TRANSITIONS:
+        raise TransitionError(f'Unknown action: {action!r}.')
+    status, sources = TRANSITIONS[action]
+    ids = sorted(_clean_ids(app_ids))
+    if not ids:
+        return []
+
+    moved = {source: _move(job, ids, source, status) for source in sources if source != status}
+    removed = Counter({source: len(pks) for source, pks in moved.items() if pks})
+    if not removed:
+        return []
+    count_applications(job.pk, added={status: sum(removed.values())}, removed=removed)
+
+    moved_ids = sorted(pk for pks in moved.values() for pk in pks)
+    rows = [
+        row
+        for start in range(0, len(moved_ids), MOVE_BATCH_SIZE)
+        for row in Application.objects.filter(pk__in=moved_ids[start:start + MOVE_BATCH_SIZE]).order_by(
+            'pk'
+        ).values_list('pk', 'student__user__first_name', 'student__user__last_name', 'student__user__username')
+    ]
+
+    AuditLog.objects.bulk_create([
+        AuditLog(
+            user=user,
+            action=f'{status} {f"{first} {last}".strip() or username} for {job.title} (application {pk})'[:255],
+        )
+        for pk, first, last, username in rows
+    ], batch_size=AUDIT_BATCH_SIZE)
+    # The raw updates bypass the signals that keep the company's applicant badge and dashboard current
+    invalidate_user_badges(job.company_id)
+    bump_versions(applications_version_name(job.company_id))
+    return moved_ids
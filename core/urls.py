@@ -69,8 +69,12 @@ path('tpo/interviews/', views.interview_management_view, name='interview_managem
 path('tpo/reports/', views.generate_reports_view, name='generate_reports'),
 path('tpo/reports/export-students-csv/', views.export_students_csv_view, name='export_students_csv'),
 path('tpo/reports/export-jobs-csv/', views.export_jobs_csv_view, name='export_jobs_csv'),
+path('tpo/reports/download/<int:task_id>/', views.download_export_view, name='download_export'),
 path('tpo/upload/', views.bulk_upload_view, name='bulk_upload'),
+path('tpo/tasks/', views.background_tasks_view, name='background_tasks'),
+path('tpo/tasks/<str:kind>/<int:task_id>/progress/', views.task_progress_view, name='task_progress'),
 path('tpo/logs/', views.audit_logs_view, name='audit_logs'),
+path('tpo/perf/', views.perf_view, name='perf'),
 path('tpo/jobs/approve/', views.approve_jobs_view, name='approve_jobs'),
 path('tpo/jobs/approve/<int:job_id>/', views.approve_single_job_view, name='approve_single_job'),
 path('tpo/jobs/reject/<int:job_id>/', views.reject_single_job_view, name='reject_single_job'),
@@ -0,0 +1,62 @@
+# core/versions.py
+
+import time
+
+from django.core.cache import cache
+from django.db import transaction
+
+# Data versions live in the cache and are bumped by core/signals.py (and by the writers
+# that bypass signals) whenever the data they stand for changes. A version is the time
+# of the change in nanoseconds rather than a counter, so a version evicted from the
+# cache comes back with a new value and never repeats one a client was given.
+
+# Every job posting, as listed to students (title, criteria, approval, company name)
+JOBS = 'jobs'
+
+# The admin dashboard counters, bumped with every invalidation of their cache (core/stats.py)
+DASHBOARD_STATS = 'dashboard_stats'
+
+
+def student_version_name(student_id):
+    """The version of what a student's pages show about them: applications and eligibility."""
+    return f'student:{student_id}'
+
+
+def interviews_version_name(student_id):
+    """The version of a student's interviews."""
+    return f'student:{student_id}:interviews'
+
+
+def applications_version_name(company_id):
+    """The version of the applications to a company's jobs, statuses included."""
+    return f'company:{company_id}:applications'
+
+
+def _cache_key(name):
+    return f'core:version:{name}'
+
+
+def get_versions(*names):
+    """Returns the current versions of the named data, in order, with one cache read."""
+    keys = [_cache_key(name) for name in names]
+    found = cache.get_many(keys)
+    for key in keys:
+        if key not in found:
+            cache.add(key, time.time_ns(), None)
+            found[key] = cache.get(key)
+    return tuple(found[key] for key in keys)
+
+
+def _bump(names):
+    now = time.time_ns()
+    cache.set_many({_cache_key(name): now for name in names}, None)
+
+
+def bump_versions(*names):
+    """
+    Marks the named data as changed, at once and again when the current transaction
+    commits: a request reading the version in between still sees the old data.
+    """
+    _bump(names)
+    if transaction.get_connection().in_atomic_block:
+        transaction.on_commit(lambda: _bump(names))
@@ -5,22 +5,43 @@ from django.http import HttpResponse # Useful for simple placeholder responses
 from django.contrib.auth import authenticate, login, logout
 from django.contrib import messages
 from django.contrib.auth.decorators import login_required
-from .decorators import student_required, company_required, admin_required
-from .forms import BulkUploadForm, StudentRegistrationForm, CompanyRegistrationForm, UserUpdateForm, StudentProfileForm, CompanyProfileForm, JobPostingForm, ResumeUploadForm, InterviewScheduleForm
+from .decorators import student_required, company_required, admin_required, reads_from_analytics
+from .forms import ApplicantFilterForm, BulkUploadForm, StudentRegistrationForm, CompanyRegistrationForm, UserUpdateForm, StudentProfileForm, CompanyProfileForm, JobPostingForm, ResumeUploadForm, InterviewScheduleForm
 from django.contrib.auth.forms import AuthenticationForm
-from .models import User, StudentProfile, CompanyProfile, JobPosting, Application, InterviewSchedule, Document, AuditLog
+from .models import User, StudentProfile, CompanyProfile, JobPosting, Application, InterviewSchedule, Document, AuditLog, ImportJob, ExportJob
+from .analytics import latest_analytics
+from .badges import get_nav_badges, has_cached_badges, invalidate_user_badges
+from .counters import set_status
+from . import perf
+from .eligibility import annotate_eligibility, is_eligible, open_jobs
+from .applicants import BEST_MATCH_FIRST, NEWEST_FIRST, applicant_page, filter_applicants, rank_applicants
+from .pagecache import conditional_page, fragment_context, job_listings_version, render_public, user_page_version
+from .versions import (
+    DASHBOARD_STATS, JOBS, applications_version_name, interviews_version_name, student_version_name,
+)
+from .apply import ALREADY_APPLIED, IN_PROGRESS, ApplyError, apply_for_job
+from .search import search_jobs
+from .transitions import TransitionError, apply_transition
+from .scheduling import (
+    DEFAULT_INTERVIEW_MINUTES, SlotOverflow, describe_clashes, find_clashes, plan_interviews, schedule_interviews,
+)
+from .stats import get_dashboard_stats
+from .tasks import TASK_MODELS, enqueue_export, enqueue_import
 from django.http import HttpResponse
 from django.core.paginator import Paginator
 from django.db.models import Q, Exists, OuterRef
 from django.shortcuts import render, redirect, get_object_or_404
-import csv
-import io
+import json
+import uuid
 from django.db import transaction
 from django.db.models import Count
-from django.http import JsonResponse
+from django.http import FileResponse, Http404, JsonResponse
 from datetime import date
 from django.utils import timezone
+from django.utils.functional import SimpleLazyObject
 from django.views.decorators.http import require_POST
+from django.conf import settings
+from django.urls import reverse
 # ==============================================================================
 # 1. Generic & Authentication Views
 # ==============================================================================
@@ -42,11 +63,11 @@ def home(request):
     
     # This line is now OUTSIDE the 'if' block.
     # It will only be reached if the user is NOT authenticated.
-    return render(request, 'home.html')
+    return render_public(request, 'home.html')
 
 def about(request):
     """Renders the about page."""
-    return render(request, 'about.html')
+    return render_public(request, 'about.html')
 
 # --- Auth Views ---
 def student_register_view(request):
@@ -57,7 +78,7 @@ def student_register_view(request):
             messages.success(request, 'Student account created! You can now log in.')
             return redirect('core:login')
     else:
-        form = StudentRegistrationForm()
+        return render_public(request, 'registration/register_student.html', {'form': StudentRegistrationForm()})
     return render(request, 'registration/register_student.html', {'form': form})
 
 def company_register_view(request):
@@ -68,7 +89,7 @@ def company_register_view(request):
             messages.success(request, 'Company account created! You can now log in.')
             return redirect('core:login')
     else:
-        form = CompanyRegistrationForm()
+        return render_public(request, 'registration/register_company.html', {'form': CompanyRegistrationForm()})
     return render(request, 'registration/register_company.html', {'form': form})
 
 # core/views.py
@@ -91,7 +112,7 @@ def login_view(request):
     
     # This block now only runs for the initial visit (GET request)
     else:
-        form = AuthenticationForm()
+        return render_public(request, 'registration/login.html', {'form': AuthenticationForm()})
 
     # Pass the form (either blank or with errors) to the template
     return render(request, 'registration/login.html', {'form': form})
@@ -114,18 +135,17 @@ def student_dashboard(request):
     """
     student_profile = request.user.student_profile
     
-    # Get stats
-    applied_jobs_count = Application.objects.filter(student=student_profile).count()
-    upcoming_interviews_count = InterviewSchedule.objects.filter(
-        application__student=student_profile, 
-        interview_date__gte=timezone.now().date()
-    ).count()
+    # Get stats. The counts are passed uncalled: the template runs them only when the
+    # cached fragment has to be rendered again.
+    applied_jobs_count = Application.objects.filter(student=student_profile).count
+    # The same count as the navigation badge, which is cached (see core/badges.py)
+    upcoming_interviews_count = get_nav_badges(request)['upcoming_interviews_count']
 
     # Get recent upcoming interviews
     upcoming_interviews = InterviewSchedule.objects.filter(
         application__student=student_profile,
         interview_date__gte=timezone.now().date()
-    ).order_by('interview_date', 'interview_time')[:3]
+    ).select_related('application__job__company').order_by('interview_date', 'interview_time')[:3]
 
     # Calculate profile completion
     total_fields = 6 # Total number of fields we're checking for completion
@@ -145,6 +165,10 @@ def student_dashboard(request):
         'upcoming_interviews': upcoming_interviews,
         'profile_completion_percentage': profile_completion_percentage,
         'placement_status': "Placed" if student_profile.is_placed else "Not Placed",
+        # The cards and lists are rendered again only when one of these versions changes
+        **fragment_context(request, [
+            JOBS, student_version_name(student_profile.pk), interviews_version_name(student_profile.pk),
+        ], timezone.now().date()),
     }
     return render(request, 'student/student_dashboard.html', context)
 
@@ -211,64 +235,37 @@ def upload_resume_view(request):
 
 @login_required
 @student_required
+@conditional_page(job_listings_version)
 def job_listings_view(request):
     """
     Displays all active, approved jobs for which the student is eligible.
     """
     student_profile = request.user.student_profile
-    
-    jobs = JobPosting.objects.filter(is_approved=True, application_deadline__gte=timezone.now().date())
 
     has_applied_subquery = Application.objects.filter(job=OuterRef('pk'), student=student_profile)
-    jobs = jobs.annotate(has_applied=Exists(has_applied_subquery))
+    jobs = annotate_eligibility(open_jobs(), student_profile).annotate(
+        has_applied=Exists(has_applied_subquery)
+    ).select_related('company').order_by('application_deadline', 'id')
 
-    eligible_jobs = []
-    ineligible_jobs = []
+    # Eligibility is read from the StudentJobEligibility index; the search filters only narrow the eligible list
+    eligible_jobs = jobs.filter(is_eligible=True)
+    ineligible_jobs = jobs.filter(is_eligible=False)
 
-    # ==============================================================================
-    # START: REVISED ELIGIBILITY CHECK LOGIC
-    # ==============================================================================
-    for job in jobs:
-        is_eligible = True # Assume eligible by default
-        
-        # Check CGPA requirement
-        # This is the corrected block. It checks if the student's CGPA is None.
-        if job.min_cgpa is not None:
-            if student_profile.cgpa is None or student_profile.cgpa < job.min_cgpa:
-                is_eligible = False
-        
-        # Check backlogs requirement
-        if is_eligible and job.max_backlogs is not None:
-            if student_profile.backlogs > job.max_backlogs:
-                is_eligible = False
-        
-        # Check branch requirement
-        if is_eligible and job.allowed_branches:
-            # Assumes branches are comma-separated with no extra spaces
-            allowed_branches_list = [branch.strip() for branch in job.allowed_branches.split(',')]
-            if student_profile.branch not in allowed_branches_list:
-                is_eligible = False
-        
-        job.is_eligible = is_eligible
-        if is_eligible:
-            eligible_jobs.append(job)
-        else:
-            ineligible_jobs.append(job)
-    # ==============================================================================
-    # END: REVISED ELIGIBILITY CHECK LOGIC
-    # ==============================================================================
-    
-    # ... (rest of the view for filtering and context) ...
     company_query = request.GET.get('company_name')
     title_query = request.GET.get('title')
     if company_query:
-        eligible_jobs = [job for job in eligible_jobs if company_query.lower() in job.company.name.lower()]
+        eligible_jobs = eligible_jobs.filter(company__name__icontains=company_query)
     if title_query:
-        eligible_jobs = [job for job in eligible_jobs if title_query.lower() in job.title.lower()]
+        eligible_jobs = eligible_jobs.filter(title__icontains=title_query)
+    # Full-text search over title, description, location and company, best matches first
+    eligible_jobs = search_jobs(eligible_jobs, request.GET.get('q'))
+
+    eligible_page_obj = Paginator(eligible_jobs, 20).get_page(request.GET.get('page'))
+    ineligible_page_obj = Paginator(ineligible_jobs, 20).get_page(request.GET.get('ineligible_page'))
 
     context = {
-        'eligible_jobs': eligible_jobs,
-        'ineligible_jobs': ineligible_jobs
+        'eligible_jobs': eligible_page_obj,
+        'ineligible_jobs': ineligible_page_obj,
     }
     return render(request, 'student/job_listings.html', context)
 
@@ -279,19 +276,12 @@ def job_detail_view(request, job_id):
     """
     Shows detailed information for a single job and the student's application status for it.
     """
-    job = get_object_or_404(JobPosting, id=job_id, is_approved=True)
+    job = get_object_or_404(JobPosting.objects.select_related('company').prefetch_related('branches'), id=job_id, is_approved=True)
     student_profile = request.user.student_profile
     
     application_status = "NOT_ELIGIBLE" # Default status
     
-    # Check eligibility
-    is_eligible = (
-        student_profile.cgpa >= job.min_cgpa and
-        student_profile.backlogs <= job.max_backlogs and
-        student_profile.branch in job.allowed_branches.split(',')
-    )
-    
-    if is_eligible:
+    if is_eligible(student_profile, job):
         application_status = "ELIGIBLE"
 
     # Check if student has already applied
@@ -300,7 +290,9 @@ def job_detail_view(request, job_id):
     
     context = {
         'job': job,
-        'application_status': application_status
+        'application_status': application_status,
+        # Sent back with the apply form, so a double click or a resubmitted POST applies once
+        'idempotency_key': uuid.uuid4().hex,
     }
     return render(request, 'student/job_detail.html', context)
 
@@ -312,28 +304,22 @@ def apply_for_job_view(request, job_id):
     """
     Handles the backend process of applying for a job.
     """
-    job = get_object_or_404(JobPosting, id=job_id)
-    student_profile = request.user.student_profile
-    
-    # Backend validation for eligibility
-    is_eligible = (
-        student_profile.cgpa >= job.min_cgpa and
-        student_profile.backlogs <= job.max_backlogs and
-        student_profile.branch in job.allowed_branches.split(',')
-    )
-    
-    # Check for duplicate applications
-    already_applied = Application.objects.filter(job=job, student=student_profile).exists()
-    
-    if not is_eligible:
-        messages.error(request, 'You are not eligible to apply for this job.')
-    elif already_applied:
-        messages.warning(request, 'You have already applied for this job.')
+    # Eligibility, deadline and duplicate checks run in the same transaction as the insert
+    try:
+        outcome = apply_for_job(request.user.student_profile, job_id, request.POST.get('idempotency_key'))
+    except JobPosting.DoesNotExist:
+        raise Http404('No job posting matches the given query.')
+    except ApplyError as e:
+        messages.error(request, str(e))
     else:
-        Application.objects.create(job=job, student=student_profile, status='Applied')
-        messages.success(request, 'You have successfully applied for the job!')
-        
-    return redirect('core:job_detail', job_id=job.id)
+        if outcome == ALREADY_APPLIED:
+            messages.warning(request, 'You have already applied for this job.')
+        elif outcome == IN_PROGRESS:
+            messages.info(request, 'Your application is still being processed. Refresh this page in a moment to see its outcome.')
+        else:
+            messages.success(request, 'You have successfully applied for the job!')
+
+    return redirect('core:job_detail', job_id=job_id)
 
 
 @login_required
@@ -416,29 +402,37 @@ def company_dashboard(request):
     """
     company_profile = request.user.company_profile
     
-    # Get stats for dashboard cards
-    total_jobs_posted = JobPosting.objects.filter(company=company_profile, is_approved=True).count()
-    total_applications = Application.objects.filter(job__company=company_profile).count()
-    shortlisted_candidates = Application.objects.filter(job__company=company_profile, status='Shortlisted').count()
+    # Get stats for dashboard cards. Queries are passed uncalled (or as lazy querysets):
+    # the template runs them only when the cached fragments have to be rendered again.
+    total_jobs_posted = JobPosting.objects.filter(company=company_profile, is_approved=True).count
+    # Application totals are counters kept on the profile (see core/counters.py)
+    total_applications = company_profile.applicant_count
+    shortlisted_candidates = company_profile.shortlisted_count
 
     # Get recent jobs
     recent_jobs = JobPosting.objects.filter(company=company_profile).order_by('-posted_at')[:5]
 
-    # Data for the "Applications per Job" chart
-    jobs_with_app_counts = JobPosting.objects.filter(company=company_profile, is_approved=True).annotate(
-        application_count=Count('applications')
-    ).order_by('-application_count')
+    def applications_chart():
+        # Data for the "Applications per Job" chart
+        jobs_with_app_counts = JobPosting.objects.filter(company=company_profile, is_approved=True).order_by(
+            '-applicant_count'
+        ).values_list('title', 'applicant_count')
+
+        job_titles = [title for title, count in jobs_with_app_counts]
+        job_app_counts = [count for title, count in jobs_with_app_counts]
+        return {
+            'job_titles_json': JsonResponse(job_titles, safe=False).content.decode(),
+            'job_app_counts_json': JsonResponse(job_app_counts, safe=False).content.decode(),
+        }
 
-    job_titles = [job.title for job in jobs_with_app_counts]
-    job_app_counts = [job.application_count for job in jobs_with_app_counts]
-    
     context = {
         'total_jobs_posted': total_jobs_posted,
         'total_applications': total_applications,
         'shortlisted_candidates': shortlisted_candidates,
         'recent_jobs': recent_jobs,
-        'job_titles_json': JsonResponse(job_titles, safe=False).content.decode(),
-        'job_app_counts_json': JsonResponse(job_app_counts, safe=False).content.decode(),
+        'applications_chart': applications_chart,
+        # The cards, recent jobs and chart are rendered again only when one of these versions changes
+        **fragment_context(request, [JOBS, applications_version_name(company_profile.pk)]),
     }
     return render(request, 'company/company_dashboard.html', context)
 
@@ -470,6 +464,7 @@ def post_job_view(request):
             job = form.save(commit=False)
             job.company = request.user.company_profile
             job.save()
+            form.save_m2m()
             messages.success(request, 'Job posted! It is now pending admin approval.')
             return redirect('core:posted_jobs')
     else:
@@ -485,7 +480,7 @@ def posted_jobs_view(request):
     Displays a list of all jobs the company has posted.
     """
     company_profile = request.user.company_profile
-    jobs = JobPosting.objects.filter(company=company_profile).prefetch_related('applications').order_by('-posted_at')
+    jobs = JobPosting.objects.filter(company=company_profile).order_by('-posted_at')
     
     paginator = Paginator(jobs, 10) # Show 10 jobs per page
     page_number = request.GET.get('page')
@@ -523,98 +518,128 @@ def edit_job_view(request, job_id):
 @company_required
 def job_applicants_view(request, job_id):
     """
-    Displays applicants for a specific job and handles bulk status changes.
+    Displays a filtered, keyset-paginated page of a job's applicants and handles
+    bulk status changes (POST only).
     """
     job = get_object_or_404(JobPosting, id=job_id, company=request.user.company_profile)
-    
-    # Handle individual action buttons (GET requests)
-    if request.method == 'GET':
-        action = request.GET.get('action')
-        app_id = request.GET.get('app_id')
-        
-        if action and app_id:
-            try:
-                application = Application.objects.get(id=app_id, job=job)
-                if action == 'shortlist':
-                    application.status = 'Shortlisted'
-                    application.save()
-                    messages.success(request, f'{application.student.user.get_full_name()} has been shortlisted.')
-                elif action == 'reject':
-                    application.status = 'Rejected'
-                    application.save()
-                    messages.warning(request, f'{application.student.user.get_full_name()} has been rejected.')
-                return redirect('core:job_applicants', job_id=job.id)
-            except Application.DoesNotExist:
-                messages.error(request, 'Application not found.')
-    
-    # Handle bulk actions (POST requests)
+    # The filters and page the list is showing, kept across actions and page links
+    page_query = request.GET.copy()
+    list_query = page_query.urlencode()
+    list_url = f"{reverse('core:job_applicants', args=[job.id])}?{list_query}"
+
+    # Bulk actions; the buttons of single applicants post to shortlist_candidate_view
     if request.method == 'POST':
-        app_ids = request.POST.getlist('selected_applications')
-        action = request.POST.get('action')
-        
-        if app_ids and action:
-            selected_applications = Application.objects.filter(id__in=app_ids)
-            if action == 'shortlist':
-                updated_count = selected_applications.update(status='Shortlisted')
-                messages.success(request, f'{updated_count} candidate(s) have been shortlisted.')
-            elif action == 'reject':
-                updated_count = selected_applications.update(status='Rejected')
-                messages.warning(request, f'{updated_count} candidate(s) have been rejected.')
-            return redirect('core:job_applicants', job_id=job.id)
-
-    applications = Application.objects.filter(job=job).select_related('student__user').order_by('-applied_at')
+        _move_applicants(request, job, request.POST.getlist('selected_applications'), request.POST.get('action'))
+        return redirect(list_url)
+
+    filter_form = ApplicantFilterForm(request.GET)
+    filter_form.is_valid()  # Invalid filters are shown as errors and ignored; the rest still apply
+    matching = filter_applicants(job, filter_form.cleaned_data)
+    # Ranked by skills, the best matches come first and applicants with none are left out
+    ranked = bool((filter_form.cleaned_data.get('rank_skills') or '').strip())
+    if ranked:
+        matching = rank_applicants(matching, filter_form.cleaned_data['rank_skills'])
+    applications, prev_cursor, next_cursor = applicant_page(
+        matching, after=request.GET.get('after'), before=request.GET.get('before'),
+        keys=BEST_MATCH_FIRST if ranked else NEWEST_FIRST,
+    )
+    for key in ('after', 'before'):
+        page_query.pop(key, None)
+
     context = {
         'job': job,
-        'applications': applications
+        'applications': applications,
+        # Unfiltered, the job's counter already holds the total
+        'applicant_count': matching.count() if any(
+            value not in (None, '') for value in filter_form.cleaned_data.values()
+        ) else job.applicant_count,
+        'filter_form': filter_form,
+        'ranked': ranked,
+        'filter_query': page_query.urlencode(),
+        'list_query': list_query,
+        'prev_cursor': prev_cursor,
+        'next_cursor': next_cursor,
     }
     return render(request, 'company/job_applicants.html', context)
 
 
+def _move_applicants(request, job, app_ids, action):
+    """Applies a shortlist or reject action through the state machine and reports the outcome."""
+    if not (action and any(app_ids)):
+        return
+    try:
+        moved = apply_transition(job, app_ids, action, request.user)
+    except TransitionError as e:
+        messages.error(request, str(e))
+        return
+    if action == 'reject':
+        messages.warning(request, f'{len(moved)} candidate(s) have been rejected.')
+    else:
+        messages.success(request, f'{len(moved)} candidate(s) have been shortlisted.')
+    unchanged = len(set(app_ids)) - len(moved)
+    if unchanged > 0:
+        messages.info(request, f'{unchanged} selected candidate(s) could not be moved from their current stage.')
+
+
 @login_required
 @company_required
 def shortlist_candidate_view(request, job_id, application_id):
-    # This can be handled by the main job_applicants_view now,
-    # but we'll keep it as a simple redirect for any old links.
-    # The main logic is now handled in bulk in job_applicants_view.
-    if request.GET.get('action') == 'shortlist':
-        Application.objects.filter(id=application_id).update(status='Shortlisted')
-        messages.success(request, 'Candidate shortlisted.')
-    elif request.GET.get('action') == 'reject':
-        Application.objects.filter(id=application_id).update(status='Rejected')
-        messages.warning(request, 'Candidate rejected.')
-    return redirect('core:job_applicants', job_id=job_id)
+    """
+    Shortlists or rejects one applicant (POST only, so a link or prefetch cannot
+    change a status), then returns to the applicant list with its filters. Old
+    per-candidate links (GET) just open the list.
+    """
+    job = get_object_or_404(JobPosting, id=job_id, company=request.user.company_profile)
+    list_url = reverse('core:job_applicants', args=[job.id])
+    if request.method != 'POST':
+        return redirect(list_url)
+    _move_applicants(request, job, [str(application_id)], request.POST.get('action'))
+    return redirect(f'{list_url}?{request.GET.urlencode()}')
 
 
 @login_required
 @company_required
 def schedule_interview_view(request, job_id):
     """
-    Handles scheduling interviews for all shortlisted candidates for a job.
+    Handles scheduling interviews for all shortlisted candidates for a job, optionally
+    in consecutive time slots, refusing (or skipping) candidates with clashing interviews.
     """
     job = get_object_or_404(JobPosting, id=job_id, company=request.user.company_profile)
-    shortlisted_applications = Application.objects.filter(job=job, status='Shortlisted')
+    shortlisted_applications = list(
+        # Slots are assigned in this order, so it must be the same for the preview and the commit
+        Application.objects.filter(job=job, status='Shortlisted').select_related('student__user').order_by(
+            'applied_at', 'pk'
+        )
+    )
 
     if request.method == 'POST':
         form = InterviewScheduleForm(request.POST)
         if form.is_valid():
+            data = form.cleaned_data
+            slot_minutes = data['slot_minutes']
             try:
-                # Use a transaction to ensure all or nothing is saved
-                with transaction.atomic():
-                    for app in shortlisted_applications:
-                        InterviewSchedule.objects.create(
-                            application=app,
-                            interview_date=form.cleaned_data['interview_date'],
-                            interview_time=form.cleaned_data['interview_time'],
-                            round_name=form.cleaned_data['round_name'],
-                            venue_or_link=form.cleaned_data['venue_or_link']
+                interviews = plan_interviews(
+                    shortlisted_applications, data, slot_minutes, data['candidates_per_slot'] or 1
+                )
+            except SlotOverflow as e:
+                form.add_error('slot_minutes', f'{e} Use shorter slots, more candidates per slot or an earlier start.')
+            else:
+                clashes = find_clashes(interviews, slot_minutes or DEFAULT_INTERVIEW_MINUTES)
+                if clashes and not data['skip_clashes']:
+                    form.add_error(None, describe_clashes(shortlisted_applications, clashes))
+                else:
+                    try:
+                        scheduled = schedule_interviews(
+                            [interview for interview in interviews if interview.application_id not in clashes]
                         )
-                    
-                    # Update status for all shortlisted candidates at once
-                    updated_count = shortlisted_applications.update(status='Interview')
-                messages.success(request, f'Successfully scheduled interviews for {updated_count} candidates.')
-                return redirect('core:company_dashboard')
-            except Exception as e:
-                messages.error(request, f"An error occurred: {e}")
+                        messages.success(request, f'Successfully scheduled interviews for {scheduled} candidates.')
+                        if clashes:
+                            messages.warning(
+                                request, f'{len(clashes)} candidate(s) with clashing interviews are still shortlisted.'
+                            )
+                        return redirect('core:company_dashboard')
+                    except Exception as e:
+                        messages.error(request, f"An error occurred: {e}")
 
     else:
         form = InterviewScheduleForm()
@@ -622,9 +647,12 @@ def schedule_interview_view(request, job_id):
     context = {
         'job': job,
         'shortlisted_applications': shortlisted_applications,
+        'shortlisted_count': len(shortlisted_applications),
         'form': form
     }
-    return render(request, 'company/schedule_interview.html', context) # You would need to create this template
+    return render(request, 'company/schedule_interview.html', context)
+
+
 @login_required
 @company_required
 def company_interview_schedules_view(request):
@@ -669,7 +697,8 @@ def offer_candidate_view(request, job_id, application_id):
         
         # Set the student's main profile status to placed
         student_profile.is_placed = True
-        student_profile.save()
+        # Only the flag changed, so the eligibility and skill indexes need no refresh
+        student_profile.save(update_fields=['is_placed'])
         
         # Update the application status to 'Offered'
         application.status = 'Offered'
@@ -677,13 +706,16 @@ def offer_candidate_view(request, job_id, application_id):
         
         # Update all other applications for this student to 'Rejected' or keep them as is
         # (Optional: You can reject other pending applications automatically)
-        Application.objects.filter(
+        other_applications = Application.objects.filter(
             student=student_profile
         ).exclude(
             id=application_id
         ).exclude(
             status__in=['Offered', 'Rejected']
-        ).update(status='Rejected')
+        )
+        # A bulk update bypasses the signals, so clear the applicant badges of the companies involved
+        invalidate_user_badges(*other_applications.values_list('job__company_id', flat=True).distinct())
+        set_status(other_applications, 'Rejected')
         
         # Create audit log entry
         AuditLog.objects.create(
@@ -708,23 +740,20 @@ def offer_candidate_view(request, job_id, application_id):
 @login_required
 @admin_required
 def admin_dashboard(request):
-    # This view is already implemented correctly
-    student_count = StudentProfile.objects.count()
-    placed_count = StudentProfile.objects.filter(is_placed=True).count()
-    unplaced_count = student_count - placed_count
-    company_count = CompanyProfile.objects.count()
-    pending_jobs_count = JobPosting.objects.filter(is_approved=False).count()
+    # All counters come from one shared (and briefly cached) aggregate; see core/stats.py.
+    # It is only computed when the cached fragment showing it has to be rendered again,
+    # or when the pending jobs badge has to be counted anyway and can reuse it.
+    if not has_cached_badges(request.user):
+        get_dashboard_stats(request)
     context = {
-        'student_count': student_count,
-        'placed_count': placed_count,
-        'unplaced_count': unplaced_count,
-        'company_count': company_count,
-        'pending_jobs_count': pending_jobs_count,
+        'stats': SimpleLazyObject(lambda: get_dashboard_stats(request)),
+        **fragment_context(request, [DASHBOARD_STATS]),
     }
     return render(request, 'admin/admin_dashboard.html', context)
 
 @login_required
 @admin_required
+@reads_from_analytics
 def manage_students_view(request):
     # This view is already implemented correctly
     students_list = StudentProfile.objects.all().select_related('user').order_by('user__first_name')
@@ -738,9 +767,10 @@ def manage_students_view(request):
 
 @login_required
 @admin_required
+@reads_from_analytics
 def manage_companies_view(request):
     # This view is already implemented correctly
-    companies_list = CompanyProfile.objects.all().select_related('user').order_by('name')
+    companies_list = CompanyProfile.objects.all().select_related('user').annotate(job_count=Count('jobs')).order_by('name')
     # ... (filtering and pagination logic) ...
     paginator = Paginator(companies_list, 15)
     page_number = request.GET.get('page')
@@ -753,7 +783,7 @@ def manage_companies_view(request):
 @admin_required
 def approve_jobs_view(request):
     # This view is already implemented correctly
-    pending_jobs = JobPosting.objects.filter(is_approved=False).select_related('company').order_by('-posted_at')
+    pending_jobs = JobPosting.objects.filter(is_approved=False).select_related('company').prefetch_related('branches').order_by('-posted_at')
     context = {'pending_jobs': pending_jobs}
     return render(request, 'admin/approve_jobs.html', context)
 
@@ -786,11 +816,12 @@ def reject_single_job_view(request, job_id):
 
 @login_required
 @admin_required
+@reads_from_analytics
 def manage_jobs_view(request):
     """
     Displays a master list of all jobs with filters and pagination.
     """
-    jobs_list = JobPosting.objects.all().select_related('company').prefetch_related('applications').order_by('-posted_at')
+    jobs_list = JobPosting.objects.all().select_related('company').order_by('-posted_at')
 
     # Filtering
     title_query = request.GET.get('title')
@@ -839,6 +870,7 @@ def interview_management_view(request):
 
 @login_required
 @admin_required
+@conditional_page(user_page_version)
 def generate_reports_view(request):
     """
     Renders the page with options to download reports.
@@ -848,137 +880,98 @@ def generate_reports_view(request):
 
 @login_required
 @admin_required
+@require_POST
 def export_students_csv_view(request):
     """
-    Handles the logic for exporting student data to a CSV file.
+    Queues a CSV export of student data, using the branch/status filters from the form.
     """
-    response = HttpResponse(content_type='text/csv')
-    response['Content-Disposition'] = 'attachment; filename="students_report.csv"'
-
-    writer = csv.writer(response)
-    writer.writerow(['Username', 'First Name', 'Last Name', 'Email', 'Branch', 'CGPA', 'Backlogs', 'Placed Status'])
-
-    # Apply filters from GET request if they exist
-    students = StudentProfile.objects.all().select_related('user')
-    branch_query = request.GET.get('branch')
-    status_query = request.GET.get('status')
-    if branch_query:
-        students = students.filter(branch__icontains=branch_query)
-    if status_query:
-        is_placed = True if status_query == 'placed' else False
-        students = students.filter(is_placed=is_placed)
-
-    for student in students:
-        writer.writerow([
-            student.user.username,
-            student.user.first_name,
-            student.user.last_name,
-            student.user.email,
-            student.branch,
-            student.cgpa,
-            student.backlogs,
-            'Placed' if student.is_placed else 'Not Placed'
-        ])
-    
-    return response
+    enqueue_export(request.user, 'students', {
+        'branch': request.POST.get('branch', '').strip(),
+        'status': request.POST.get('status', ''),
+    })
+    messages.info(request, 'The student report has been queued. It will be ready to download below shortly.')
+    return redirect('core:background_tasks')
+
+
 @login_required
 @admin_required
+@require_POST
 def export_jobs_csv_view(request):
     """
-    Handles the logic for exporting job posting data to a CSV file.
+    Queues a CSV export of job posting data, optionally filtered by company.
     """
-    response = HttpResponse(content_type='text/csv')
-    response['Content-Disposition'] = 'attachment; filename="jobs_report.csv"'
-
-    writer = csv.writer(response)
-    # Define the CSV headers
-    writer.writerow([
-        'Job Title', 
-        'Company', 
-        'Location', 
-        'Salary Range', 
-        'Deadline',
-        'Status',
-        'Applicant Count'
-    ])
-
-    # Get all jobs and their related company/application info efficiently
-    jobs = JobPosting.objects.all().select_related('company').prefetch_related('applications')
-    
-    # You can add filtering logic here later based on request.GET parameters if needed
-
-    for job in jobs:
-        status = 'Pending'
-        if job.is_approved:
-            # Check if the date is in the past
-            if date.today() > job.application_deadline:
-                 status = 'Closed'
-            else:
-                 status = 'Open'
-
-        writer.writerow([
-            job.title,
-            job.company.name,
-            job.location,
-            job.salary_range,
-            job.application_deadline,
-            status,
-            job.applications.count()
-        ])
-    
-    return response
+    enqueue_export(request.user, 'jobs', {'company': request.POST.get('company', '').strip()})
+    messages.info(request, 'The jobs report has been queued. It will be ready to download below shortly.')
+    return redirect('core:background_tasks')
 
 
 @login_required
 @admin_required
 def bulk_upload_view(request):
     """
-    Handles the logic for bulk uploading data from a CSV file.
+    Queues a bulk upload of students, companies or jobs from a CSV file. The
+    run_workers command validates the whole file and imports it only if every row is valid.
     """
     if request.method == 'POST':
         form = BulkUploadForm(request.POST, request.FILES)
         if form.is_valid():
-            csv_file = form.cleaned_data['csv_file']
             upload_type = form.cleaned_data['upload_type']
-            
-            # Use io.TextIOWrapper to decode the file in memory
-            decoded_file = csv_file.read().decode('utf-8')
-            io_string = io.StringIO(decoded_file)
-            reader = csv.reader(io_string)
-            next(reader) # Skip the header row
-
-            try:
-                with transaction.atomic(): # Ensures that if one row fails, all are rolled back
-                    if upload_type == 'students':
-                        for row in reader:
-                            username, password, email, first_name, last_name, branch, cgpa, backlogs = row
-                            user = User.objects.create_user(
-                                username=username,
-                                password=password,
-                                email=email,
-                                first_name=first_name,
-                                last_name=last_name,
-                                role='student'
-                            )
-                            StudentProfile.objects.create(
-                                user=user,
-                                branch=branch,
-                                cgpa=float(cgpa),
-                                backlogs=int(backlogs)
-                            )
-                messages.success(request, f"Successfully uploaded {upload_type} data.")
-            except Exception as e:
-                messages.error(request, f"An error occurred during upload: {e}")
-
-            return redirect('core:admin_dashboard')
+            enqueue_import(request.user, upload_type, form.cleaned_data['csv_file'])
+            messages.info(request, f'The {upload_type} file has been queued for import. Progress is shown below.')
+            return redirect('core:background_tasks')
     else:
         form = BulkUploadForm()
-        
+
     return render(request, 'admin/bulk_upload.html', {'form': form})
 
 
 @login_required
 @admin_required
+def background_tasks_view(request):
+    """
+    Lists recent bulk imports and report exports with their progress.
+    """
+    context = {
+        'import_jobs': ImportJob.objects.select_related('created_by')[:20],
+        'export_jobs': ExportJob.objects.select_related('created_by')[:20],
+    }
+    return render(request, 'admin/background_tasks.html', context)
+
+
+@login_required
+@admin_required
+def task_progress_view(request, kind, task_id):
+    """
+    Returns the progress of one import or export task as JSON, for polling.
+    """
+    model = TASK_MODELS.get(kind)
+    if model is None:
+        raise Http404
+    task = get_object_or_404(model, pk=task_id)
+    return JsonResponse({
+        'status': task.status,
+        'status_display': task.get_status_display(),
+        'progress': task.progress,
+        'total': task.total,
+        'percent': task.percent,
+        'message': task.message,
+        'finished': task.is_finished,
+    })
+
+
+@login_required
+@admin_required
+def download_export_view(request, task_id):
+    """
+    Sends the CSV file produced by a finished export task.
+    """
+    task = get_object_or_404(ExportJob, pk=task_id, status='done')
+    return FileResponse(task.result_file.open('rb'), as_attachment=True, filename=f'{task.export_type}_report.csv')
+
+
+@login_required
+@admin_required
+@reads_from_analytics
 def audit_logs_view(request):
     """
     Displays a paginated list of all audit log entries.
@@ -995,37 +988,18 @@ def audit_logs_view(request):
 
 @login_required
 @admin_required
-def analytics_view(request):
+def perf_view(request):
     """
-    Gathers data and passes it to the analytics page for chart rendering.
+    Shows per-endpoint latency percentiles, database time and query counts for the
+    requests this server process measured recently (see core/middleware.py).
     """
-    # Example 1: Placement stats by branch
-    branch_stats = StudentProfile.objects.values('branch').annotate(
-        total=Count('user'),
-        placed=Count('user', filter=Q(is_placed=True))
-    ).order_by('-total')
-
-    # Example 2: Company engagement by jobs posted
-    company_stats = CompanyProfile.objects.annotate(
-        job_count=Count('jobs')
-    ).order_by('-job_count')[:10] # Top 10 companies
-
-    # Format data for Chart.js
-    branch_labels = [stat['branch'] for stat in branch_stats]
-    branch_total_data = [stat['total'] for stat in branch_stats]
-    branch_placed_data = [stat['placed'] for stat in branch_stats]
-
-    company_labels = [stat.name for stat in company_stats]
-    company_job_counts = [stat.job_count for stat in company_stats]
-
     context = {
-        'branch_labels': JsonResponse(branch_labels, safe=False).content.decode(),
-        'branch_total_data': JsonResponse(branch_total_data, safe=False).content.decode(),
-        'branch_placed_data': JsonResponse(branch_placed_data, safe=False).content.decode(),
-        'company_labels': JsonResponse(company_labels, safe=False).content.decode(),
-        'company_job_counts': JsonResponse(company_job_counts, safe=False).content.decode(),
+        'endpoints': perf.endpoint_stats(),
+        'sample_rate': settings.PERF_SAMPLE_RATE,
+        'ring_size': settings.PERF_RING_SIZE,
     }
-    return render(request, 'admin/analytics.html', context)
+    return render(request, 'admin/perf.html', context)
+
 
 # ==============================================================================
 # 5. Utility & Shared Views
@@ -1069,150 +1043,33 @@ def view_resume_view(request, student_id):
 
 @login_required
 @admin_required
-@admin_required
 def analytics_view(request):
     """
     Advanced Analytics Dashboard for Admin/TPO
-    Shows placement statistics, company engagement, and trends
+    Shows placement statistics, company engagement, and trends.
+    The figures come from the latest AnalyticsSnapshot (see core/analytics.py), computed
+    on the read-only analytics connection.
     """
-    from django.db.models import Count, Q
-    import json
-    
-    # 1. Placement Rate by Branch
-    branches = ['Computer Science Engineering', 'Electronics and Communication Engineering', 
-                'Mechanical Engineering', 'Electrical and Electronics Engineering', 
-                'Civil Engineering', 'Chemical Engineering']
-    
-    branch_labels = []
-    branch_total_data = []
-    branch_placed_data = []
-    
-    for branch in branches:
-        total = StudentProfile.objects.filter(branch=branch).count()
-        placed = StudentProfile.objects.filter(branch=branch, is_placed=True).count()
-        
-        if total > 0:  # Only include branches with students
-            # Use abbreviated names for better chart display
-            branch_short = {
-                'Computer Science Engineering': 'CSE',
-                'Electronics and Communication Engineering': 'ECE',
-                'Mechanical Engineering': 'ME',
-                'Electrical and Electronics Engineering': 'EEE',
-                'Civil Engineering': 'Civil',
-                'Chemical Engineering': 'Chemical'
-            }.get(branch, branch)
-            
-            branch_labels.append(branch_short)
-            branch_total_data.append(total)
-            branch_placed_data.append(placed)
-    
-    # 2. Top Companies by Jobs Posted
-    top_companies = (
-        CompanyProfile.objects
-        .annotate(job_count=Count('jobs'))
-        .filter(job_count__gt=0)
-        .order_by('-job_count')[:10]
-    )
-    
-    company_labels = [company.name for company in top_companies]
-    company_job_counts = [company.job_count for company in top_companies]
-    
-    # 3. Application Status Distribution
-    application_statuses = Application.objects.values('status').annotate(count=Count('id'))
-    status_labels = [item['status'] for item in application_statuses]
-    status_counts = [item['count'] for item in application_statuses]
-    
-    # 4. Monthly Placement Trends (last 6 months)
-    from datetime import datetime, timedelta
-    from django.db.models.functions import TruncMonth
-    
-    six_months_ago = datetime.now() - timedelta(days=180)
-    
-    monthly_applications = (
-        Application.objects
-        .filter(applied_at__gte=six_months_ago)
-        .annotate(month=TruncMonth('applied_at'))
-        .values('month')
-        .annotate(count=Count('id'))
-        .order_by('month')
-    )
-    
-    trend_labels = [item['month'].strftime('%B %Y') for item in monthly_applications]
-    trend_counts = [item['count'] for item in monthly_applications]
-    
-    # 5. CGPA Distribution of Placed vs Non-Placed Students
-    cgpa_ranges = [
-        (6.0, 6.99, '6.0-6.9'),
-        (7.0, 7.99, '7.0-7.9'),
-        (8.0, 8.99, '8.0-8.9'),
-        (9.0, 10.0, '9.0-10.0')
+    snapshot = latest_analytics(settings.ANALYTICS_SNAPSHOT_MAX_AGE)
+    data = snapshot.data
+
+    # Chart series are passed as JSON for safe template rendering
+    chart_keys = [
+        'branch_labels', 'branch_total_data', 'branch_placed_data',
+        'company_labels', 'company_job_counts',
+        'status_labels', 'status_counts',
+        'trend_labels', 'trend_counts',
+        'cgpa_labels', 'cgpa_placed', 'cgpa_not_placed',
+        'interview_statuses', 'interview_counts',
     ]
-    
-    cgpa_labels = [label for _, _, label in cgpa_ranges]
-    cgpa_placed = []
-    cgpa_not_placed = []
-    
-    for min_cgpa, max_cgpa, _ in cgpa_ranges:
-        placed = StudentProfile.objects.filter(
-            cgpa__gte=min_cgpa,
-            cgpa__lte=max_cgpa,
-            is_placed=True
-        ).count()
-        
-        not_placed = StudentProfile.objects.filter(
-            cgpa__gte=min_cgpa,
-            cgpa__lte=max_cgpa,
-            is_placed=False
-        ).count()
-        
-        cgpa_placed.append(placed)
-        cgpa_not_placed.append(not_placed)
-    
-    # 6. Interview Conversion Rates
-    interview_statuses = ['Shortlisted', 'Interview', 'Offered']
-    interview_counts = []
-    
-    for status in interview_statuses:
-        count = Application.objects.filter(status=status).count()
-        interview_counts.append(count)
-    
-    # Convert to JSON for safe template rendering
-    context = {
-        'branch_labels': json.dumps(branch_labels),
-        'branch_total_data': json.dumps(branch_total_data),
-        'branch_placed_data': json.dumps(branch_placed_data),
-        
-        'company_labels': json.dumps(company_labels),
-        'company_job_counts': json.dumps(company_job_counts),
-        
-        'status_labels': json.dumps(status_labels),
-        'status_counts': json.dumps(status_counts),
-        
-        'trend_labels': json.dumps(trend_labels),
-        'trend_counts': json.dumps(trend_counts),
-        
-        'cgpa_labels': json.dumps(cgpa_labels),
-        'cgpa_placed': json.dumps(cgpa_placed),
-        'cgpa_not_placed': json.dumps(cgpa_not_placed),
-        
-        'interview_statuses': json.dumps(interview_statuses),
-        'interview_counts': json.dumps(interview_counts),
-        
-        # Summary statistics
-        'total_students': StudentProfile.objects.count(),
-        'placed_students': StudentProfile.objects.filter(is_placed=True).count(),
-        'total_companies': CompanyProfile.objects.filter(is_approved=True).count(),
-        'total_jobs': JobPosting.objects.filter(is_approved=True).count(),
-        'total_applications': Application.objects.count(),
-        'total_interviews': InterviewSchedule.objects.count(),
-    }
-    
-    # Calculate placement percentage
-    if context['total_students'] > 0:
-        context['placement_percentage'] = round(
-            (context['placed_students'] / context['total_students']) * 100, 2
-        )
-    else:
-        context['placement_percentage'] = 0
-    
-    return render(request, 'admin/analytics.html', context)
\ No newline at end of file
+    context = {key: json.dumps(data[key]) for key in chart_keys}
+
+    # Summary statistics
+    summary_keys = [
+        'total_students', 'placed_students', 'total_companies', 'total_jobs',
+        'total_applications', 'total_interviews', 'placement_percentage',
+    ]
+    context.update({key: data[key] for key in summary_keys})
+    context['snapshot_taken_at'] = snapshot.created_at
+
+    return render(request, 'admin/analytics.html', context)
@@ -13,6 +13,8 @@ https://docs.djangoproject.com/en/5.2/ref/settings/
 from pathlib import Path
 import os 
 
+from django.core.exceptions import ImproperlyConfigured
+
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
@@ -51,6 +53,8 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    # First, so that its timings and query counts cover the whole request
+    'core.middleware.PerfMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -91,6 +95,63 @@ DATABASES = {
     }
 }
 
+# "development" keeps Django's SQLite defaults. "production" tunes SQLite for concurrent
+# writers (applications, status changes, audit logs) and reuses connections across requests.
+DATABASE_PROFILE = os.environ.get('DATABASE_PROFILE', 'development')
+
+if DATABASE_PROFILE == 'production':
+    DATABASES['default'].update({
+        # Keep a connection for 10 minutes, checking it still works before reusing it
+        'CONN_MAX_AGE': 600,
+        'CONN_HEALTH_CHECKS': True,
+        'OPTIONS': {
+            # Take the write lock at BEGIN. A transaction that reads and then writes cannot
+            # wait for a concurrent writer and fails at once with "database is locked";
+            # one that starts as a writer waits up to busy_timeout instead.
+            'transaction_mode': 'IMMEDIATE',
+        },
+    })
+    # Applied to every new SQLite connection (see core/signals.py)
+    SQLITE_PRAGMAS = {
+        # Readers no longer block the writer or the other way round; persists in the file
+        'journal_mode': 'WAL',
+        # With WAL, sync at checkpoints only: a power cut may lose the last commits, never corrupt
+        'synchronous': 'NORMAL',
+        # Milliseconds to wait for another connection's lock before giving up
+        'busy_timeout': 5000,
+        # Read the database through a 256 MiB memory map instead of read() calls
+        'mmap_size': 256 * 1024 * 1024,
+        # Page cache per connection, in KiB when negative (64 MiB)
+        'cache_size': -64 * 1024,
+        # Temporary tables and indices of large sorts stay in memory
+        'temp_store': 'MEMORY',
+    }
+elif DATABASE_PROFILE != 'development':
+    raise ImproperlyConfigured(f'DATABASE_PROFILE must be "development" or "production", not {DATABASE_PROFILE!r}.')
+
+# The long scans of analytics, audit logs, exports and the admin lists read from the
+# "analytics" alias (see core/routers.py). It opens ANALYTICS_DATABASE_PATH, a replica
+# such as a copy of db.sqlite3, when set; otherwise in production the primary file itself,
+# whose WAL journal lets a reader run alongside the writers. Either is opened read-only.
+# In development without a replica it is the primary, and those reads stay there.
+ANALYTICS_DATABASE_PATH = os.environ.get('ANALYTICS_DATABASE_PATH')
+
+if ANALYTICS_DATABASE_PATH or DATABASE_PROFILE == 'production':
+    analytics_file = (BASE_DIR / (ANALYTICS_DATABASE_PATH or DATABASES['default']['NAME'])).resolve()
+    DATABASES['analytics'] = {
+        'ENGINE': 'django.db.backends.sqlite3',
+        # SQLite refuses every write made through a mode=ro URI
+        'NAME': f'{analytics_file.as_uri()}?mode=ro',
+        'CONN_MAX_AGE': DATABASES['default'].get('CONN_MAX_AGE', 0),
+        'CONN_HEALTH_CHECKS': DATABASES['default'].get('CONN_HEALTH_CHECKS', False),
+        # Tests read the test database through the primary connection
+        'TEST': {'MIRROR': 'default'},
+    }
+else:
+    DATABASES['analytics'] = {**DATABASES['default'], 'TEST': {'MIRROR': 'default'}}
+
+DATABASE_ROUTERS = ['core.routers.AnalyticsRouter']
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
@@ -145,5 +206,74 @@ MEDIA_URL = '/media/'
 # The absolute path to the folder where user uploads will be stored
 MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
 
+# Cache shared by the web server and `run_workers`. A file-based cache (rather than
+# local memory) lets a signal fired in one process invalidate entries for all of them.
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': os.path.join(BASE_DIR, '.django_cache'),
+        'OPTIONS': {
+            # One navigation badge entry per active student/company user
+            'MAX_ENTRIES': 50000,
+        },
+    }
+}
+
+# Seconds the admin dashboard counters are cached (0 disables the cache)
+DASHBOARD_STATS_CACHE_TIMEOUT = 30
+
+# Seconds the per-user navigation badge counts are cached. Signals invalidate them on
+# every change; the timeout only bounds date-based counts such as upcoming interviews.
+NAV_BADGES_CACHE_TIMEOUT = 300
+
+# Seconds the pages every anonymous visitor sees alike (home, about, login and register
+# forms) are served from the cache after one render (0 disables it)
+PUBLIC_PAGE_CACHE_TIMEOUT = 300
+
+# Seconds a rendered dashboard fragment is kept. Data version bumps (core/versions.py)
+# replace it as soon as its data changes; the timeout only bounds changes no signal sees.
+DASHBOARD_FRAGMENT_CACHE_TIMEOUT = 60 * 60
+
+# Seconds an apply request's idempotency key is remembered, so that a double click or a
+# retried POST within that time gets the first request's outcome instead of a second try
+APPLY_IDEMPOTENCY_TIMEOUT = 60 * 60
+
+# Seconds before the analytics page recomputes its snapshot (refresh_analytics keeps it warm)
+ANALYTICS_SNAPSHOT_MAX_AGE = 15 * 60
+
+# Bulk CSV imports: password hashing processes (None = one per CPU) and an optional
+# cheaper hasher algorithm for imported accounts. It must also be listed in
+# PASSWORD_HASHERS; Django re-hashes with the default hasher at the first login.
+BULK_IMPORT_HASH_WORKERS = None
+BULK_IMPORT_PASSWORD_HASHER = None
+
+# Request instrumentation (core.middleware.PerfMiddleware): the share of requests
+# measured (0 turns it off) and the recent requests per endpoint kept for /tpo/perf/
+PERF_SAMPLE_RATE = 1.0 if DEBUG else 0.05
+PERF_RING_SIZE = 500
+
+# One JSON line per measured request on the `core.perf` logger. It is printed while
+# DEBUG is on; in production, route `core.perf` to your log collector instead.
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'filters': {
+        'require_debug_true': {'()': 'django.utils.log.RequireDebugTrue'},
+    },
+    'formatters': {
+        'message': {'format': '{message}', 'style': '{'},
+    },
+    'handlers': {
+        'perf_console': {
+            'class': 'logging.StreamHandler',
+            'filters': ['require_debug_true'],
+            'formatter': 'message',
+        },
+    },
+    'loggers': {
+        'core.perf': {'handlers': ['perf_console'], 'level': 'INFO', 'propagate': False},
+    },
+}
+
 CRISPY_ALLOWED_TEMPLATE_PACKS = "bootstrap5"
 CRISPY_TEMPLATE_PACK = "bootstrap5"
\ No newline at end of file